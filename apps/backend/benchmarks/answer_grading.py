@@ -0,0 +1,121 @@
+"""
+Microbenchmark for answer grading with precomputed answer keys
+
+Grades the same stream of answers three ways: the previous per-call
+lower-casing over every option, a bare ``AnswerKey.grade`` set lookup, and
+``QuizManagementService.check_answer`` against a stored session. The key
+must agree with the previous rule on every answer that rule accepted.
+
+Usage (from apps/backend):
+    python -m benchmarks.answer_grading --questions 50 --answers 200000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from src.quiz.dto import AnswerRequest, QuestionAnswer
+from src.quiz.grading import AnswerKey
+from src.quiz.services import QuizManagementService
+from src.quiz.sessions import MemorySessionStore
+
+
+def _previous_rule(question: QuestionAnswer, user_answer: str) -> bool:
+    """Grading as check_answer did it before answer keys"""
+    correct_answer = question.answer
+    user_answer = user_answer.strip()
+    is_correct = user_answer.lower() == correct_answer.lower()
+    if not is_correct and question.options:
+        for option in question.options:
+            if (
+                user_answer.lower() == option.lower()
+                and option.lower() == correct_answer.lower()
+            ):
+                is_correct = True
+                break
+    return is_correct
+
+
+def _quiz(size: int):
+    return [
+        QuestionAnswer(
+            id=str(i + 1),
+            question=f"Which statement about topic {i + 1} is accurate?",
+            answer=f"Statement {i + 1} about the second mechanism",
+            options=[
+                f"Statement {i + 1} about the first mechanism",
+                f"Statement {i + 1} about the second mechanism",
+                f"Statement {i + 1} about the third mechanism",
+                f"Statement {i + 1} about the fourth mechanism",
+            ],
+        )
+        for i in range(size)
+    ]
+
+
+def _timed(label: str, count: int, grade) -> float:
+    started = time.perf_counter()
+    grade()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28}{count / elapsed:>12,.0f} answers/s")
+    return elapsed
+
+
+def run(num_questions: int, num_answers: int) -> bool:
+    questions = _quiz(num_questions)
+    rng = random.Random(0)
+    answers = []
+    for _ in range(num_answers):
+        question = rng.choice(questions)
+        answer = rng.choice(question.options)
+        answers.append((question, rng.choice([answer, answer.upper(), f" {answer} "])))
+
+    keys = {q.id: AnswerKey.from_question(q) for q in questions}
+    service = QuizManagementService(session_store=MemorySessionStore())
+    asyncio.run(service.store_questions(questions, "bench", "Benchmark Quiz"))
+    requests = [
+        AnswerRequest(question_id=q.id, user_answer=answer) for q, answer in answers
+    ]
+
+    previous = _timed(
+        "previous rule:",
+        num_answers,
+        lambda: [_previous_rule(q, answer) for q, answer in answers],
+    )
+    lookup = _timed(
+        "AnswerKey.grade:",
+        num_answers,
+        lambda: [keys[q.id].grade(answer) for q, answer in answers],
+    )
+
+    async def check_all() -> None:
+        for request in requests:
+            await service.check_answer(request, "bench")
+
+    _timed("check_answer (session):", num_answers, lambda: asyncio.run(check_all()))
+    print(f"key lookup speedup:         {previous / lookup:.1f}x")
+
+    disagreements = sum(
+        _previous_rule(q, answer) and not keys[q.id].grade(answer)
+        for q, answer in answers
+    )
+    print(f"answers the key rejected:   {disagreements}")
+
+    passed = disagreements == 0
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--answers", type=int, default=200_000)
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.questions, args.answers) else 1)
+
+
+if __name__ == "__main__":
+    main()
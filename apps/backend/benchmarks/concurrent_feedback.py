@@ -0,0 +1,76 @@
+"""
+Concurrency check for streaming feedback against a local fake OpenAI endpoint
+
+Opens N wrong-answer feedback streams on ``/quiz/check-answer-stream`` at
+once. With the shared async client the streams interleave, so N streams take
+about as long as one instead of N times as long.
+
+Usage (from apps/backend):
+    python -m benchmarks.concurrent_feedback --streams 20 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Tuple
+
+import httpx
+
+from benchmarks.fake_openai import FakeOpenAIServer, fake_questions
+
+
+async def _stream(client: httpx.AsyncClient, payload: dict) -> Tuple[float, int]:
+    """Elapsed seconds and number of SSE events received"""
+    started = time.perf_counter()
+    body = b""
+    async with client.stream("POST", "/quiz/check-answer-stream", json=payload) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+    return time.perf_counter() - started, body.count(b"\n\n")
+
+
+async def run(streams: int, latency: float) -> bool:
+    from main import app
+
+    questions = [dict(q, id=str(i + 1)) for i, q in enumerate(fake_questions())]
+    payload = {"question_id": "1", "user_answer": "Answer 1B", "questions": questions}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver", timeout=60
+    ) as client:
+        single, events = await _stream(client, payload)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_stream(client, payload) for _ in range(streams)))
+        parallel = time.perf_counter() - started
+
+    print(f"single stream:          {single:.2f}s ({events} events)")
+    print(f"{streams} parallel streams:   {parallel:.2f}s")
+
+    passed = parallel < single * 2
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--streams", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(latency=args.latency) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+        # Every stream must reach the LLM, not replay a cached explanation
+        os.environ["EXPLANATION_CACHE_ENABLED"] = "false"
+        passed = asyncio.run(run(args.streams, args.latency))
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Concurrency check for quiz generation against a local fake OpenAI endpoint
+
+Uploads N PDFs in parallel to ``/quiz/upload-pdf`` while the fake LLM
+answers every completion after a fixed delay. With a non-blocking LLM client
+the N uploads finish in roughly the time of one, and ``/health`` stays
+responsive while they are in flight.
+
+Usage (from apps/backend):
+    python -m benchmarks.concurrent_generation --uploads 10 --latency 1.0
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.pdfs import make_pdf
+
+
+async def _upload(client: httpx.AsyncClient, pdf: bytes, session_id: str) -> float:
+    started = time.perf_counter()
+    response = await client.post(
+        "/quiz/upload-pdf",
+        files={"file": ("handout.pdf", pdf, "application/pdf")},
+        headers={"X-Session-ID": session_id},
+    )
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def _health_while_busy(client: httpx.AsyncClient, delay: float) -> float:
+    await asyncio.sleep(delay)
+    started = time.perf_counter()
+    response = await client.get("/health")
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def run(uploads: int, latency: float) -> bool:
+    from main import app
+
+    pdf = make_pdf(num_pages=2)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver", timeout=60
+    ) as client:
+        single = await _upload(client, pdf, "warmup")
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            _health_while_busy(client, latency / 2),
+            # Distinct documents: identical uploads would share one generation
+            *(
+                _upload(client, make_pdf(num_pages=2, seed=i), f"session-{i}")
+                for i in range(uploads)
+            ),
+        )
+        parallel = time.perf_counter() - started
+
+    health_latency = results[0]
+    print(f"single upload:          {single:.2f}s")
+    print(f"{uploads} parallel uploads:   {parallel:.2f}s")
+    print(f"/health while busy:     {health_latency * 1000:.1f}ms")
+
+    # Parallel uploads must overlap: allow generous headroom for PDF parsing
+    passed = parallel < single * 2 and health_latency < latency / 2
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uploads", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(latency=args.latency) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+        # Every upload is the same document; measure generation, not cache hits
+        os.environ["QUIZ_CACHE_ENABLED"] = "false"
+        passed = asyncio.run(run(args.uploads, args.latency))
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Local fake OpenAI-compatible endpoint for offline benchmarks
+
+Serves ``POST /v1/chat/completions`` with a fixed latency so benchmarks can
+measure how the API behaves under concurrent LLM calls without touching the
+network or spending tokens. An optional concurrency quota answers requests
+beyond it with 429, like a provider rate limit, and an optional invalid rate
+makes some generated questions name an answer that is not among their
+options, as the real model sometimes does.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from src.llm.fake import FEEDBACK_TEXT, fake_questions
+
+
+class _ConcurrencyQuota:
+    """ASGI wrapper rejecting requests beyond ``limit`` in flight with a 429"""
+
+    def __init__(self, app, limit: int, counters: dict):
+        self.app = app
+        self.limit = limit
+        self.counters = counters
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if self.counters["in_flight"] >= self.limit:
+            self.counters["rejected"] += 1
+            response = JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": "0.1"},
+            )
+            return await response(scope, receive, send)
+        # Counted until the body, streamed or not, has been sent
+        self.counters["in_flight"] += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.counters["in_flight"] -= 1
+
+
+def create_fake_openai_app(
+    latency: float = 1.0,
+    token_delay: float = 0.01,
+    max_concurrent: Optional[int] = None,
+    invalid_rate: float = 0.0,
+) -> FastAPI:
+    """Build the fake OpenAI app with a fixed completion latency"""
+    app = FastAPI()
+    app.state.counters = {"requests": 0, "in_flight": 0, "rejected": 0, "completion_tokens": 0}
+    rng = random.Random(0)
+
+    def _quiz(num_questions: int, topic: str) -> list:
+        questions = fake_questions(num_questions, topic)
+        for question in questions:
+            if rng.random() < invalid_rate:
+                question["answer"] = "None of the listed answers"
+        return questions
+    if max_concurrent:
+        app.add_middleware(_ConcurrencyQuota, limit=max_concurrent, counters=app.state.counters)
+
+    def _envelope(extra: dict) -> dict:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "created": int(time.time()),
+            "model": "gpt-3.5-turbo",
+            **extra,
+        }
+
+    def _usage_chunk(body: dict, content: str) -> str:
+        """Final stream chunk with the call's usage, if the client asked for it"""
+        if not (body.get("stream_options") or {}).get("include_usage"):
+            return ""
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        completion_tokens = len(content) // 4
+        chunk = _envelope(
+            {
+                "object": "chat.completion.chunk",
+                "choices": [],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+        )
+        return f"data: {json.dumps(chunk)}\n\n"
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.counters["requests"] += 1
+        # Answer with as many questions as asked for, distinct per prompt
+        prompt = body["messages"][-1]["content"]
+        match = re.search(r"exactly (\d+)", prompt)
+        num_questions = int(match.group(1)) if match else 10
+        topic = f"Topic {hashlib.sha1(prompt.encode()).hexdigest()[:6]}"
+
+        if body.get("stream") and match:
+
+            async def quiz_stream():
+                # Emit the JSON array in token-sized pieces, like the real model
+                content = json.dumps(_quiz(num_questions, topic), indent=2)
+                await asyncio.sleep(latency)
+                for start in range(0, len(content), 4):
+                    await asyncio.sleep(token_delay)
+                    chunk = _envelope(
+                        {
+                            "object": "chat.completion.chunk",
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "delta": {"content": content[start : start + 4]},
+                                    "finish_reason": None,
+                                }
+                            ],
+                        }
+                    )
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                yield _usage_chunk(body, content)
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(quiz_stream(), media_type="text/event-stream")
+
+        if body.get("stream"):
+
+            async def token_stream():
+                await asyncio.sleep(latency)
+                for word in FEEDBACK_TEXT.split(" "):
+                    await asyncio.sleep(token_delay)
+                    chunk = _envelope(
+                        {
+                            "object": "chat.completion.chunk",
+                            "choices": [
+                                {"index": 0, "delta": {"content": word + " "}, "finish_reason": None}
+                            ],
+                        }
+                    )
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                yield _usage_chunk(body, FEEDBACK_TEXT)
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(token_stream(), media_type="text/event-stream")
+
+        await asyncio.sleep(latency)
+        content = json.dumps(_quiz(num_questions, topic))
+        # About four characters per token, like the real tokenizer
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        completion_tokens = len(content) // 4
+        app.state.counters["completion_tokens"] += completion_tokens
+        return JSONResponse(
+            _envelope(
+                {
+                    "object": "chat.completion",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": content,
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                }
+            )
+        )
+
+    return app
+
+
+class BackgroundServer:
+    """Runs an ASGI app with uvicorn in a background thread"""
+
+    def __init__(self, app):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        config = uvicorn.Config(
+            app, host="127.0.0.1", port=self.port, log_level="warning"
+        )
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+class FakeOpenAIServer(BackgroundServer):
+    """Runs the fake OpenAI app with uvicorn in a background thread"""
+
+    def __init__(
+        self,
+        latency: float = 1.0,
+        token_delay: float = 0.01,
+        max_concurrent: Optional[int] = None,
+        invalid_rate: float = 0.0,
+    ):
+        self.app = create_fake_openai_app(latency, token_delay, max_concurrent, invalid_rate)
+        super().__init__(self.app)
+
+    @property
+    def requests(self) -> int:
+        """Chat completion requests served"""
+        return self.app.state.counters["requests"]
+
+    @property
+    def completion_tokens(self) -> int:
+        """Completion tokens reported by non-streaming responses"""
+        return self.app.state.counters["completion_tokens"]
+
+    @property
+    def rejected(self) -> int:
+        """Requests refused with 429 by the concurrency quota"""
+        return self.app.state.counters["rejected"]
+
+    @property
+    def base_url(self) -> str:
+        return f"{super().base_url}/v1"
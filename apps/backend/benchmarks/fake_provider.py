@@ -0,0 +1,119 @@
+"""
+Offline end-to-end check with the built-in fake LLM provider
+
+Runs the API with ``LLM_PROVIDER=fake`` and no API key, and points
+``OPENAI_BASE_URL`` at a closed port, so any call that escaped to the network
+would fail. Uploads the same PDF twice (the quizzes must be identical), then
+N distinct PDFs in parallel while the fake fails a share of calls with 500s
+and 429s that the gateway retries, and finally streams wrong-answer feedback.
+
+Usage (from apps/backend):
+    python -m benchmarks.fake_provider --uploads 20 --error-rate 0.1 --rate-limit-rate 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from benchmarks.pdfs import make_pdf
+
+
+async def _upload(client: httpx.AsyncClient, pdf: bytes, session_id: str) -> dict:
+    response = await client.post(
+        "/quiz/upload-pdf",
+        files={"file": ("handout.pdf", pdf, "application/pdf")},
+        headers={"X-Session-ID": session_id},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def run(uploads: int) -> bool:
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver", timeout=120
+    ) as client:
+        pdf = make_pdf(num_pages=2)
+        first = await _upload(client, pdf, "repeat-1")
+        second = await _upload(client, pdf, "repeat-2")
+        deterministic = first["questions"] == second["questions"]
+
+        started = time.perf_counter()
+        quizzes = await asyncio.gather(
+            *(
+                _upload(client, make_pdf(num_pages=2, seed=i), f"session-{i}")
+                for i in range(uploads)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+        question = first["questions"][0]
+        wrong = next(o for o in question["options"] if o != question["answer"])
+        feedback = b""
+        async with client.stream(
+            "POST",
+            "/quiz/check-answer-stream",
+            json={"question_id": question["id"], "user_answer": wrong},
+            headers={"X-Session-ID": "repeat-1"},
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                feedback += chunk
+
+        stats = (await client.get("/llm/stats")).json()
+
+    complete = sum(len(quiz["questions"]) == 10 for quiz in quizzes)
+    frames = feedback.count(b"\n\n")
+    print(f"repeat upload identical: {deterministic}")
+    print(
+        f"{uploads} parallel uploads:    {complete}/{uploads} complete in {elapsed:.2f}s"
+    )
+    print(f"feedback SSE frames:     {frames}")
+    print(
+        f"llm calls:               {stats['calls']} ({stats['retries']} retries, "
+        f"{stats['failures']} failed), {stats['prompt_tokens']} prompt + "
+        f"{stats['completion_tokens']} completion tokens"
+    )
+
+    passed = deterministic and complete == uploads and b"event: done" in feedback
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--tokens-per-second", type=float, default=400)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ.pop("OPENAI_API_KEY", None)
+    # Nothing listens here: a call reaching the network would fail
+    os.environ["OPENAI_BASE_URL"] = "http://127.0.0.1:9/v1"
+    os.environ["LLM_FAKE_LATENCY_SECONDS"] = str(args.latency)
+    os.environ["LLM_FAKE_TOKENS_PER_SECOND"] = str(args.tokens_per_second)
+    os.environ["LLM_FAKE_ERROR_RATE"] = str(args.error_rate)
+    os.environ["LLM_FAKE_RATE_LIMIT_RATE"] = str(args.rate_limit_rate)
+    os.environ["LLM_BACKOFF_BASE_SECONDS"] = "0.05"
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = "0"
+    os.environ["LLM_TOKENS_PER_MINUTE"] = "0"
+    # Every upload must reach the provider, not a cached quiz
+    os.environ["QUIZ_CACHE_ENABLED"] = "false"
+    os.environ["EXPLANATION_PREWARM_ENABLED"] = "false"
+    os.environ["LOG_LEVEL"] = "WARNING"
+
+    passed = asyncio.run(run(args.uploads))
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
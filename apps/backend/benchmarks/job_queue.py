@@ -0,0 +1,152 @@
+"""
+Check background quiz generation jobs against a slow fake LLM
+
+Submits more background uploads than the queue holds: accepted uploads must
+return 202 without waiting for the LLM, the overflow must be refused with a
+503, and no more than ``--concurrency`` generations may run at once. One job
+is followed over its SSE endpoint, the rest are polled, and every finished
+quiz must be in its session. PDF extraction runs inside the job, so a
+corrupt upload is still accepted and must fail through the job status.
+
+Usage (from apps/backend):
+    python -m benchmarks.job_queue --latency 1.0 --concurrency 4 --depth 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+
+from benchmarks.fake_openai import BackgroundServer, FakeOpenAIServer
+from benchmarks.pdfs import make_pdf
+
+
+async def _submit(client: httpx.AsyncClient, pdf: bytes, session_id: str):
+    started = time.perf_counter()
+    response = await client.post(
+        "/quiz/upload-pdf",
+        params={"background": "true"},
+        files={"file": ("handout.pdf", pdf, "application/pdf")},
+        headers={"X-Session-ID": session_id},
+    )
+    return response, time.perf_counter() - started
+
+
+async def _poll(client: httpx.AsyncClient, job_id: str) -> dict:
+    while True:
+        response = await client.get(f"/quiz/jobs/{job_id}")
+        response.raise_for_status()
+        status = response.json()
+        if status["status"] in ("succeeded", "failed"):
+            return status
+        await asyncio.sleep(0.1)
+
+
+async def _follow(client: httpx.AsyncClient, job_id: str) -> list:
+    states = []
+    async with client.stream("GET", f"/quiz/jobs/{job_id}/events") as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith("data: {"):
+                states.append(json.loads(line[len("data: ") :])["status"])
+    return states
+
+
+async def run(base_url: str, submissions: int, concurrency: int) -> bool:
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        # Submit one at a time so the overflow is deterministic
+        submitted = []
+        for i in range(submissions):
+            # Distinct documents: identical uploads would share one generation
+            pdf = make_pdf(num_pages=2, seed=i)
+            session_id = f"job-session-{i}"
+            submitted.append((session_id, *await _submit(client, pdf, session_id)))
+        accepted = [
+            (s, r.json()["job_id"], t) for s, r, t in submitted if r.status_code == 202
+        ]
+        refused = [r for _, r, _ in submitted if r.status_code == 503]
+
+        followed = asyncio.create_task(_follow(client, accepted[-1][1]))
+        started = time.perf_counter()
+        statuses = await asyncio.gather(
+            *(_poll(client, job_id) for _, job_id, _ in accepted)
+        )
+        drained = time.perf_counter() - started
+        states = await followed
+
+        # Extraction happens in the job: the 202 comes back before parsing
+        corrupt, _ = await _submit(client, b"not really a pdf", "job-session-corrupt")
+        corrupt_status = (
+            await _poll(client, corrupt.json()["job_id"])
+            if corrupt.status_code == 202
+            else {"status": corrupt.status_code, "detail": None}
+        )
+
+        stored = 0
+        for session_id, _, _ in accepted:
+            response = await client.post(
+                "/quiz/check-answer",
+                json={"question_id": "1", "user_answer": "x"},
+                headers={"X-Session-ID": session_id},
+            )
+            stored += response.status_code == 200
+
+    # Most jobs running at once, measured at each job's start
+    intervals = sorted((s["started_at"], s["finished_at"]) for s in statuses)
+    peak = max(sum(1 for s, f in intervals if s <= start < f) for start, _ in intervals)
+    slowest_submit = max(t for _, _, t in accepted)
+
+    print(f"accepted / refused:     {len(accepted)} / {len(refused)}")
+    print(f"slowest 202 response:   {slowest_submit * 1000:.0f}ms")
+    print(f"queue drained in:       {drained:.2f}s")
+    print(f"peak running jobs:      {peak}")
+    print(f"followed job states:    {' -> '.join(states)}")
+    print(f"quizzes in sessions:    {stored}/{len(accepted)}")
+    print(
+        f"corrupt upload job:     {corrupt_status['status']} ({corrupt_status['detail']})"
+    )
+
+    passed = (
+        all(s["status"] == "succeeded" and s["result"]["questions"] for s in statuses)
+        and len(refused) == submissions - len(accepted) > 0
+        and peak <= concurrency
+        and states[-1] == "succeeded"
+        and stored == len(accepted)
+        and corrupt_status["status"] == "failed"
+        and bool(corrupt_status["detail"])
+    )
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--submissions", type=int, default=16)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(latency=args.latency) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+        os.environ["QUIZ_CACHE_ENABLED"] = "false"
+        os.environ["EXPLANATION_PREWARM_ENABLED"] = "false"
+        os.environ["QUIZ_JOB_CONCURRENCY"] = str(args.concurrency)
+        os.environ["QUIZ_JOB_QUEUE_DEPTH"] = str(args.depth)
+        from main import app
+
+        with BackgroundServer(app) as backend:
+            passed = asyncio.run(
+                run(backend.base_url, args.submissions, args.concurrency)
+            )
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
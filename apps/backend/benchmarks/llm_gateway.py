@@ -0,0 +1,96 @@
+"""
+Burst of LLM calls against a fake provider with a concurrency quota
+
+The fake answers 429 once more than ``--quota`` calls are in flight. The
+same burst is sent three ways: with no cap and no retries (calls fail),
+with the in-flight cap set to the quota (no 429s at all), and with no cap
+but retries (every call eventually succeeds after backing off).
+
+Usage (from apps/backend):
+    python -m benchmarks.llm_gateway --calls 40 --quota 8 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from benchmarks.fake_openai import FakeOpenAIServer
+
+
+async def _burst(gateway, calls: int, server: FakeOpenAIServer, label: str) -> int:
+    rejected_before = server.rejected
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            gateway.chat(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "user", "content": f"Create exactly 1 question ({i})"}
+                ],
+                max_tokens=100,
+            )
+            for i in range(calls)
+        ),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - started
+    failed = sum(isinstance(result, Exception) for result in results)
+    stats = gateway.stats()
+    print(
+        f"{label:<22}{calls - failed:>3}/{calls} ok  {server.rejected - rejected_before:>3} x 429  "
+        f"{stats.retries:>3} retries  wait p95 {stats.wait_ms_p95:>6.0f}ms  {elapsed:.2f}s"
+    )
+    return failed
+
+
+async def run(calls: int, quota: int, server: FakeOpenAIServer) -> bool:
+    from src.llm.gateway import LLMGateway
+
+    unlimited = dict(requests_per_minute=0, tokens_per_minute=0)
+    no_cap = await _burst(
+        LLMGateway(max_in_flight=calls, max_retries=0, **unlimited),
+        calls,
+        server,
+        "no cap, no retries:",
+    )
+    rejected_before = server.rejected
+    capped = await _burst(
+        LLMGateway(max_in_flight=quota, max_retries=0, **unlimited),
+        calls,
+        server,
+        "in-flight cap:",
+    )
+    capped_rejections = server.rejected - rejected_before
+    retried = await _burst(
+        LLMGateway(
+            max_in_flight=calls, max_retries=8, backoff_base_seconds=0.2, **unlimited
+        ),
+        calls,
+        server,
+        "no cap, with retries:",
+    )
+
+    passed = no_cap > 0 and capped == 0 and capped_rejections == 0 and retried == 0
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--quota", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(latency=args.latency, max_concurrent=args.quota) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+        passed = asyncio.run(run(args.calls, args.quota, server))
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+Offline end-to-end load test with latency percentiles and JSON results
+
+Serves the API on a local socket with the fake LLM provider and runs
+``--users`` concurrent virtual users. Each iteration uploads a freshly
+generated PDF (sizes cycle through ``--pdf-pages``), checks a few answers,
+streams feedback for a wrong answer and edits a question. Reports throughput
+and p50/p95/p99 latency per endpoint, plus time to first byte for streams,
+and saves everything as JSON (by default under benchmarks/results/, named
+after the current commit) so runs can be compared across commits with
+``--compare``.
+
+Usage (from apps/backend):
+    python -m benchmarks.load_test --users 20 --iterations 5 --pdf-pages 2,10,40
+    python -m benchmarks.load_test --compare benchmarks/results/load-abc1234.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.fake_openai import BackgroundServer
+from benchmarks.pdfs import make_pdf
+
+UPLOAD = "POST /quiz/upload-pdf"
+CHECK = "POST /quiz/check-answer"
+STREAM = "POST /quiz/check-answer-stream"
+UPDATE = "PUT /quiz/questions/{id}"
+ENDPOINTS = (UPLOAD, CHECK, STREAM, UPDATE)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+class Recorder:
+    """Latencies, time to first byte and failures per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.ttfb: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(
+        self,
+        endpoint: str,
+        started: float,
+        status: Optional[int],
+        first_byte: Optional[float] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        if status is None or status >= 400:
+            error = str(status or "connection")
+        if error is not None:
+            self.errors[endpoint][error] += 1
+            return
+        self.latencies[endpoint].append(time.perf_counter() - started)
+        if first_byte is not None:
+            self.ttfb[endpoint].append(first_byte - started)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _summary_ms(values: List[float]) -> Optional[dict]:
+    if not values:
+        return None
+    return {
+        "p50": round(_percentile(values, 0.50) * 1000, 1),
+        "p95": round(_percentile(values, 0.95) * 1000, 1),
+        "p99": round(_percentile(values, 0.99) * 1000, 1),
+        "max": round(max(values) * 1000, 1),
+        "mean": round(sum(values) / len(values) * 1000, 1),
+    }
+
+
+async def _upload(client: httpx.AsyncClient, rec: Recorder, pdf: bytes, session: str):
+    started = time.perf_counter()
+    try:
+        response = await client.post(
+            "/quiz/upload-pdf",
+            files={"file": ("handout.pdf", pdf, "application/pdf")},
+            headers={"X-Session-ID": session},
+        )
+    except httpx.HTTPError:
+        rec.record(UPLOAD, started, None)
+        return None
+    rec.record(UPLOAD, started, response.status_code)
+    return response.json()["questions"] if response.status_code == 200 else None
+
+
+async def _check(client, rec: Recorder, session: str, question: dict, answer: str):
+    started = time.perf_counter()
+    try:
+        response = await client.post(
+            "/quiz/check-answer",
+            json={"question_id": question["id"], "user_answer": answer},
+            headers={"X-Session-ID": session},
+        )
+        rec.record(CHECK, started, response.status_code)
+    except httpx.HTTPError:
+        rec.record(CHECK, started, None)
+
+
+def _sse_event_types(body: str) -> List[str]:
+    """``event:`` field of each complete Server-Sent Event, "message" if unset"""
+    types = []
+    for block in body.replace("\r\n", "\n").split("\n\n")[:-1]:
+        lines = [
+            line for line in block.split("\n") if line and not line.startswith(":")
+        ]
+        if not lines:
+            continue  # heartbeat comment
+        event = "message"
+        for line in lines:
+            field, _, value = line.partition(":")
+            if field == "event":
+                event = value.strip()
+        types.append(event)
+    return types
+
+
+async def _stream(client, rec: Recorder, session: str, question: dict, answer: str):
+    started = time.perf_counter()
+    first_byte = None
+    body = b""
+    try:
+        async with client.stream(
+            "POST",
+            "/quiz/check-answer-stream",
+            json={"question_id": question["id"], "user_answer": answer},
+            headers={"X-Session-ID": session},
+        ) as response:
+            async for chunk in response.aiter_raw():
+                if first_byte is None:
+                    first_byte = time.perf_counter()
+                body += chunk
+    except httpx.HTTPError:
+        rec.record(STREAM, started, None)
+        return
+
+    # Failures after the 200 arrive as events, not as a status code
+    error = None
+    if response.status_code < 400:
+        events = _sse_event_types(body.decode("utf-8", errors="replace"))
+        if "error" in events:
+            error = "sse error"
+        elif "done" not in events:
+            error = "sse incomplete"
+    rec.record(STREAM, started, response.status_code, first_byte, error)
+
+
+async def _update(client, rec: Recorder, session: str, question: dict):
+    started = time.perf_counter()
+    try:
+        response = await client.put(
+            f"/quiz/questions/{question['id']}",
+            json={**question, "question": question["question"] + " (edited)"},
+            headers={"X-Session-ID": session},
+        )
+        rec.record(UPDATE, started, response.status_code)
+    except httpx.HTTPError:
+        rec.record(UPDATE, started, None)
+
+
+async def _user(
+    client: httpx.AsyncClient, rec: Recorder, user: int, args: argparse.Namespace
+) -> None:
+    """One virtual user: upload, answer, stream feedback, edit - repeatedly"""
+    for iteration in range(args.iterations):
+        session = f"load-{user}-{iteration}"
+        seed = user * args.iterations + iteration
+        pages = args.pdf_pages[seed % len(args.pdf_pages)]
+        # A fresh document per upload: identical ones would share one generation
+        questions = await _upload(
+            client, rec, make_pdf(num_pages=pages, seed=seed), session
+        )
+        if not questions:
+            continue
+
+        for position in range(args.answers):
+            question = questions[position % len(questions)]
+            wrong = [o for o in question["options"] if o != question["answer"]]
+            # Alternate correct and wrong answers, like a real quiz taker
+            answer = question["answer"] if position % 2 == 0 or not wrong else wrong[0]
+            await _check(client, rec, session, question, answer)
+
+        question = questions[iteration % len(questions)]
+        wrong = [o for o in question["options"] if o != question["answer"]]
+        if wrong:
+            await _stream(client, rec, session, question, wrong[-1])
+        await _update(client, rec, session, question)
+
+
+async def run(base_url: str, args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.users * 2)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        rec = Recorder()
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_user(client, rec, user, args) for user in range(args.users))
+        )
+        elapsed = time.perf_counter() - started
+        llm_stats = (await client.get("/llm/stats")).json()
+
+    endpoints = {}
+    for endpoint in ENDPOINTS:
+        latencies = rec.latencies[endpoint]
+        errors = dict(rec.errors[endpoint])
+        endpoints[endpoint] = {
+            "requests": len(latencies) + sum(errors.values()),
+            "errors": errors,
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "latency_ms": _summary_ms(latencies),
+            "ttfb_ms": _summary_ms(rec.ttfb[endpoint]),
+        }
+    return {
+        "duration_seconds": round(elapsed, 2),
+        "endpoints": endpoints,
+        "llm": llm_stats,
+    }
+
+
+def _git_revision() -> dict:
+    def git(*command: str) -> str:
+        return subprocess.run(
+            ["git", *command], capture_output=True, text=True, check=False
+        ).stdout.strip()
+
+    return {
+        "commit": git("rev-parse", "HEAD") or None,
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def _print_report(results: dict) -> None:
+    print(
+        f"{'endpoint':<32}{'ok':>6}{'err':>5}{'req/s':>8}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}{'ttfb p50':>10}{'ttfb p95':>10}"
+    )
+    for endpoint, stats in results["endpoints"].items():
+        latency = stats["latency_ms"] or {}
+        ttfb = stats["ttfb_ms"] or {}
+        errors = sum(stats["errors"].values())
+        print(
+            f"{endpoint:<32}{stats['requests'] - errors:>6}{errors:>5}"
+            f"{stats['throughput_rps']:>8.1f}"
+            f"{latency.get('p50', 0):>9.0f}{latency.get('p95', 0):>9.0f}"
+            f"{latency.get('p99', 0):>9.0f}"
+            + (f"{ttfb['p50']:>10.0f}{ttfb['p95']:>10.0f}" if ttfb else "")
+        )
+    print(f"(milliseconds; total {results['duration_seconds']:.1f}s)")
+
+
+def _print_comparison(results: dict, baseline: dict) -> None:
+    """Percentile changes against a previous run"""
+    commit = (baseline.get("git") or {}).get("commit") or "baseline"
+    print(f"\nagainst {commit[:12]}:")
+    for endpoint, stats in results["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(endpoint) or {}
+        for metric in ("latency_ms", "ttfb_ms"):
+            old, new = before.get(metric), stats.get(metric)
+            if not old or not new:
+                continue
+            changes = "  ".join(
+                f"{key} {old[key]:.0f} -> {new[key]:.0f} ({(new[key] - old[key]) / old[key]:+.0%})"
+                for key in ("p50", "p95", "p99")
+                if old[key]
+            )
+            label = endpoint if metric == "latency_ms" else f"{endpoint} ttfb"
+            print(f"  {label:<37}{changes}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20, help="Concurrent users")
+    parser.add_argument("--iterations", type=int, default=5, help="Quizzes per user")
+    parser.add_argument(
+        "--pdf-pages",
+        type=lambda value: [int(pages) for pages in value.split(",")],
+        default=[2, 10, 40],
+        help="Comma-separated PDF sizes in pages, used in turn",
+    )
+    parser.add_argument("--answers", type=int, default=5, help="Answers per quiz")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=200)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--prewarm",
+        action="store_true",
+        help="Keep explanation prewarming on (feedback then mostly replays the cache)",
+    )
+    parser.add_argument("--output", type=Path, help="Results file (JSON)")
+    parser.add_argument(
+        "--compare", type=Path, help="Earlier results file to compare with"
+    )
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["LLM_FAKE_LATENCY_SECONDS"] = str(args.llm_latency)
+    os.environ["LLM_FAKE_JITTER_SECONDS"] = str(args.llm_jitter)
+    os.environ["LLM_FAKE_TOKENS_PER_SECOND"] = str(args.llm_tokens_per_second)
+    os.environ["LLM_FAKE_ERROR_RATE"] = str(args.llm_error_rate)
+    os.environ["LLM_FAKE_RATE_LIMIT_RATE"] = str(args.llm_rate_limit_rate)
+    # Measure the app, not a provider quota the fake does not have
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = "0"
+    os.environ["LLM_TOKENS_PER_MINUTE"] = "0"
+    os.environ["EXPLANATION_PREWARM_ENABLED"] = str(args.prewarm).lower()
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from main import app
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with BackgroundServer(app) as backend:
+        results = asyncio.run(run(backend.base_url, args))
+
+    revision = _git_revision()
+    config = {
+        key: str(value) if isinstance(value, Path) else value
+        for key, value in vars(args).items()
+    }
+    results = {"started_at": started_at, "git": revision, "config": config, **results}
+
+    _print_report(results)
+    if args.compare:
+        _print_comparison(results, json.loads(args.compare.read_text()))
+
+    output = args.output
+    if output is None:
+        name = (revision["commit"] or "unknown")[:7] + (
+            "-dirty" if revision["dirty"] else ""
+        )
+        output = RESULTS_DIR / f"load-{name}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"results saved to {output}")
+
+    errors = sum(
+        sum(stats["errors"].values()) for stats in results["endpoints"].values()
+    )
+    print("PASS" if errors == 0 else "FAIL")
+    sys.exit(0 if errors == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark for representative passage selection on very long documents
+
+Builds the text of a synthetic N-page document and times PassageSelector
+choosing passages for one generation prompt.
+
+Usage (from apps/backend):
+    python -m benchmarks.passage_selection --pages 1000 --budget 875
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.pdfs import make_paragraphs
+from src.quiz.passages import PassageSelector
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--budget", type=int, default=875, help="Token budget")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    text = "\n".join(" ".join(lines) for lines in make_paragraphs(args.pages, seed=11))
+    selector = PassageSelector()
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        selected = selector.select(text, args.budget)
+        timings.append(time.perf_counter() - started)
+
+    best, worst = min(timings), max(timings)
+    print(f"document:   {args.pages} pages, {len(text) / 1e6:.1f}M chars")
+    print(
+        f"selected:   {len(selected)} chars in {selected.count(chr(10) * 2) + 1} passages"
+    )
+    print(f"best/worst: {best * 1000:.0f}ms / {worst * 1000:.0f}ms")
+
+    passed = worst < args.max_seconds
+    print("PASS" if passed else "FAIL")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Per-document PDF timeouts on a busy worker pool
+
+Queues many healthy tasks (each well inside the timeout) behind a small pool
+together with one runaway task. Healthy tasks must not time out however long
+they waited in the queue, the runaway must fail alone with only its own
+worker replaced, and a document whose tasks together exceed the timeout must
+fail even though each task alone fits.
+
+Usage (from apps/backend):
+    python -m benchmarks.pdf_timeouts --processes 2 --healthy 12 --timeout 1.0
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from src.pdf.workers import PdfExtractionTimeoutError, PdfWorkerPool
+
+
+async def run(processes: int, healthy: int, timeout: float) -> bool:
+    pool = PdfWorkerPool(processes=processes, timeout=timeout)
+    pool.start()
+    task_seconds = timeout * 0.4
+    try:
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            pool.run(time.sleep, timeout * 10),
+            *(pool.run(time.sleep, task_seconds) for _ in range(healthy)),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - started
+        runaway, rest = results[0], results[1:]
+        healthy_ok = sum(result is None for result in rest)
+
+        # Three steps of one document (like page count, then batches): each
+        # fits in the timeout, together they do not
+        deadline = pool.new_deadline()
+        document = []
+        for _ in range(3):
+            try:
+                document.append(
+                    await pool.run(time.sleep, timeout * 0.45, deadline=deadline)
+                )
+            except PdfExtractionTimeoutError as e:
+                document.append(e)
+    finally:
+        pool.close()
+
+    print(
+        f"queue of {healthy} x {task_seconds:.1f}s tasks on {processes} workers, {timeout:.1f}s timeout"
+    )
+    print(f"healthy tasks ok:       {healthy_ok}/{healthy} in {elapsed:.2f}s")
+    print(f"runaway task:           {type(runaway).__name__}")
+    print(f"worker replacements:    {pool.restarts}")
+    print(f"shared-deadline tasks:  {[type(r).__name__ for r in document]}")
+
+    passed = (
+        healthy_ok == healthy
+        and isinstance(runaway, PdfExtractionTimeoutError)
+        and any(isinstance(r, PdfExtractionTimeoutError) for r in document)
+    )
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--healthy", type=int, default=12)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run(args.processes, args.healthy, args.timeout)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Synthetic PDF factory for benchmarks - builds text PDFs without extra dependencies
+"""
+
+import random
+from typing import List
+
+WORDS = (
+    "photosynthesis chlorophyll membrane protein enzyme catalyst molecule "
+    "equilibrium velocity momentum gravity orbit planet electron nucleus "
+    "theorem integral derivative matrix vector algorithm recursion compiler "
+    "revolution empire treaty parliament economy inflation currency market "
+    "ecosystem habitat species evolution mutation genome cell tissue organ"
+).split()
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_paragraphs(num_pages: int, lines_per_page: int = 40, seed: int = 7) -> List[List[str]]:
+    """Generate deterministic pseudo-prose, one list of lines per page"""
+    rng = random.Random(seed)
+    pages = []
+    for page_number in range(num_pages):
+        lines = [f"Chapter {page_number // 10 + 1}, page {page_number + 1}."]
+        for _ in range(lines_per_page - 1):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(8, 14))]
+            lines.append(" ".join(words).capitalize() + ".")
+        pages.append(lines)
+    return pages
+
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """Serialize pages of text lines into a minimal, valid PDF document"""
+    objects: List[bytes] = []
+    num_pages = len(pages)
+    font_id = 3
+    first_page_id = 4
+
+    page_ids = [first_page_id + 2 * i for i in range(num_pages)]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {num_pages} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for page_id, lines in zip(page_ids, pages):
+        content = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in lines:
+            content.append(f"({_escape(line)}) Tj T*")
+        content.append("ET")
+        stream = "\n".join(content).encode("latin-1", "replace")
+        objects.append(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                f"/Resources << /Font << /F1 {font_id} 0 R >> >> "
+                f"/Contents {page_id + 1} 0 R >>"
+            ).encode()
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n" % (len(objects) + 1)
+    output += b"0000000000 65535 f \n"
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += (
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref_offset)
+    )
+    return bytes(output)
+
+
+def make_pdf(num_pages: int, lines_per_page: int = 40, seed: int = 7) -> bytes:
+    """Convenience wrapper returning a PDF with ``num_pages`` pages of prose"""
+    return build_pdf(make_paragraphs(num_pages, lines_per_page, seed))
@@ -0,0 +1,101 @@
+"""
+Prompt budget check: fixed character slice versus token-budgeted prompts
+
+Builds generation prompts for texts whose characters-per-token ratio differs
+(plain prose, number-heavy tables, accented text) and compares the old
+3500-character slice with prompts fitted to the model's token budget. The
+fitted prompts should use nearly all of the text budget, never exceed the
+context window once the completion is reserved, and end on a sentence.
+
+Usage (from apps/backend):
+    python -m benchmarks.prompt_budget --model gpt-3.5-turbo --text-tokens 3000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from benchmarks.pdfs import WORDS, make_paragraphs
+
+OLD_PROMPT_TEXT_CHARS = 3500
+
+
+def _sentences(words, rng: random.Random, count: int) -> str:
+    return " ".join(
+        " ".join(rng.choice(words) for _ in range(rng.randint(8, 20))).capitalize()
+        + "."
+        for _ in range(count)
+    )
+
+
+def make_texts() -> dict:
+    rng = random.Random(3)
+    prose = "\n".join(" ".join(lines) for lines in make_paragraphs(40, seed=5))
+    numbers = _sentences(
+        [f"{rng.randint(0, 99999)}.{rng.randint(0, 99)}" for _ in range(500)] + WORDS,
+        rng,
+        2000,
+    )
+    accented = _sentences(
+        "élève über façade naïve crème brûlée smörgåsbord señal ação jalapeño".split(),
+        rng,
+        2000,
+    )
+    return {"prose": prose, "numbers": numbers, "accented": accented}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="gpt-3.5-turbo")
+    parser.add_argument("--text-tokens", type=int, default=3000)
+    parser.add_argument("--questions", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+    os.environ["QUIZ_GENERATION_MODEL"] = args.model
+    os.environ["QUIZ_PROMPT_TEXT_TOKENS"] = str(args.text_tokens)
+    from src.quiz.services import COMPLETION_TOKENS_PER_QUESTION, QuizGenerationService
+
+    service = QuizGenerationService()
+    counter = service.tokens
+    reserve = args.questions * COMPLETION_TOKENS_PER_QUESTION
+    budget = service._text_budget(args.questions)
+    print(
+        f"model: {args.model} (context {counter.context_window}, "
+        f"{'tiktoken' if counter.exact else 'estimated'} counts), "
+        f"text budget {budget} tokens, completion reserve {reserve}"
+    )
+
+    passed = True
+    for name, text in make_texts().items():
+        old_tokens = counter.count(text[:OLD_PROMPT_TEXT_CHARS])
+
+        started = time.perf_counter()
+        messages = service._generation_messages(text, args.questions)
+        elapsed = time.perf_counter() - started
+        prompt = messages[-1]["content"]
+        fitted = prompt.split("Text to analyze:\n", 1)[1].rsplit("\n\nGenerate", 1)[0]
+        new_tokens = counter.count(fitted)
+        total = counter.count_messages(messages) + reserve
+
+        print(
+            f"{name:>9}: old slice {old_tokens:5d} tokens ({old_tokens / budget:4.0%}), "
+            f"fitted {new_tokens:5d} tokens ({new_tokens / budget:4.0%}), "
+            f"prompt+reserve {total}/{counter.context_window}, "
+            f"ends {fitted[-12:]!r}, {elapsed * 1000:.1f}ms"
+        )
+        passed &= (
+            new_tokens <= budget
+            and new_tokens >= 0.95 * budget
+            and total <= counter.context_window
+            and fitted.endswith(".")
+        )
+
+    print("PASS" if passed else "FAIL")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Targeted top-up against blind regeneration for quizzes with invalid questions
+
+The fake LLM makes ``--invalid-rate`` of its questions name an answer that is
+not among the options, so single calls come back short. Blind regeneration
+repeats the full 10-question call until one comes back complete; the top-up
+stage asks only for the missing questions in small concurrent calls.
+
+Usage (from apps/backend):
+    python -m benchmarks.quiz_topup --quizzes 20 --invalid-rate 0.2 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.pdfs import make_paragraphs
+
+NUM_QUESTIONS = 10
+MAX_ATTEMPTS = 10
+
+
+def _texts(count: int):
+    return [
+        "\n".join(line for page in make_paragraphs(2, seed=seed) for line in page)
+        for seed in range(count)
+    ]
+
+
+async def _blind(service, text: str) -> int:
+    """Full regeneration until a complete quiz arrives (or attempts run out)"""
+    best = 0
+    for _ in range(MAX_ATTEMPTS):
+        questions = await service._request_questions(text, NUM_QUESTIONS)
+        best = max(best, len(questions))
+        if best == NUM_QUESTIONS:
+            break
+    return best
+
+
+async def _topped_up(service, text: str) -> int:
+    questions = await service.generate_questions_from_text(
+        text, NUM_QUESTIONS, force_regenerate=True, mode="single"
+    )
+    return len(questions)
+
+
+async def _measure(label: str, strategy, service, texts, server: FakeOpenAIServer):
+    requests, tokens = server.requests, server.completion_tokens
+    started = time.perf_counter()
+    sizes = await asyncio.gather(*(strategy(service, text) for text in texts))
+    elapsed = time.perf_counter() - started
+    calls = (server.requests - requests) / len(texts)
+    completion = (server.completion_tokens - tokens) / len(texts)
+    complete = sum(size == NUM_QUESTIONS for size in sizes) / len(texts)
+    print(
+        f"{label:<20}{complete:>6.0%} complete  {calls:>5.1f} calls/quiz  "
+        f"{completion:>6.0f} completion tokens/quiz  {elapsed:.2f}s"
+    )
+    return complete, completion, elapsed
+
+
+async def run(quizzes: int, server: FakeOpenAIServer) -> bool:
+    from src.quiz.services import QuizGenerationService
+
+    service = QuizGenerationService()
+    texts = _texts(quizzes)
+    blind = await _measure("blind regeneration:", _blind, service, texts, server)
+    topup = await _measure("targeted top-up:", _topped_up, service, texts, server)
+
+    passed = topup[0] >= blind[0] and topup[1] < blind[1] and topup[2] < blind[2]
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quizzes", type=int, default=20)
+    parser.add_argument("--invalid-rate", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(
+        latency=args.latency, invalid_rate=args.invalid_rate
+    ) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+        os.environ["QUIZ_CACHE_ENABLED"] = "false"
+        # Compare call strategies, not the quota limiter
+        os.environ["LLM_REQUESTS_PER_MINUTE"] = "0"
+        os.environ["LLM_TOKENS_PER_MINUTE"] = "0"
+        passed = asyncio.run(run(args.quizzes, server))
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
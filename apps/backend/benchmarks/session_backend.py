@@ -0,0 +1,145 @@
+"""
+Throughput check for the shared SQLite session backend
+
+Starts N worker processes on one SQLite database, the way N uvicorn workers
+would share it. Each worker first stores its own quizzes through
+``QuizManagementService.store_questions``, then edits questions of quizzes
+written by the *other* workers through ``update_question``. Every edit must
+find its session, which is the 404 a per-process store gives once requests
+land on a different worker than the upload.
+
+Usage (from apps/backend):
+    python -m benchmarks.session_backend --workers 8 --sessions 500 --updates 2000
+"""
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+
+QUESTIONS_PER_SESSION = 10
+
+
+def _questions(session_id: str):
+    from src.quiz.dto import QuestionAnswer
+
+    return [
+        QuestionAnswer(
+            id=str(i + 1),
+            question=f"Question {i + 1} of {session_id}?",
+            answer=f"Answer {i + 1}A",
+            options=[f"Answer {i + 1}{letter}" for letter in "ABCD"],
+        )
+        for i in range(QUESTIONS_PER_SESSION)
+    ]
+
+
+def _worker(worker, workers, path, sessions, updates, stored, barrier, results) -> None:
+    asyncio.run(
+        _work(worker, workers, path, sessions, updates, stored, barrier, results)
+    )
+
+
+async def _work(worker, workers, path, sessions, updates, stored, barrier, results):
+    from fastapi import HTTPException
+
+    from src.quiz.dto import QuestionUpdateRequest
+    from src.quiz.services import QuizManagementService
+    from src.quiz.sessions import SqliteSessionStore
+
+    service = QuizManagementService(session_store=SqliteSessionStore(path))
+    quizzes = [
+        (f"w{worker}-s{i}", _questions(f"w{worker}-s{i}")) for i in range(sessions)
+    ]
+
+    barrier.wait()
+    started = time.perf_counter()
+    for session_id, questions in quizzes:
+        await service.store_questions(questions, session_id, "Benchmark Quiz")
+    write_seconds = time.perf_counter() - started
+
+    # Only edit other workers' sessions once every worker has stored its own
+    stored.wait()
+    rng = random.Random(worker)
+    others = [w for w in range(workers) if w != worker] or [worker]
+    missing = 0
+    started = time.perf_counter()
+    for _ in range(updates):
+        session_id = f"w{rng.choice(others)}-s{rng.randrange(sessions)}"
+        question_id = str(rng.randrange(QUESTIONS_PER_SESSION) + 1)
+        try:
+            await service.update_question(
+                QuestionUpdateRequest(
+                    id=question_id,
+                    question=f"Edited question {question_id}?",
+                    answer=f"Answer {question_id}B",
+                    options=[f"Answer {question_id}{letter}" for letter in "ABCD"],
+                ),
+                session_id,
+            )
+        except HTTPException:
+            missing += 1
+    update_seconds = time.perf_counter() - started
+
+    results.put((write_seconds, update_seconds, missing))
+
+
+def run(workers: int, sessions: int, updates: int) -> bool:
+    context = mp.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.db")
+        barrier = context.Barrier(workers)
+        stored = context.Barrier(workers)
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=_worker,
+                args=(w, workers, path, sessions, updates, stored, barrier, results),
+            )
+            for w in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        outcomes = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    write_seconds = max(o[0] for o in outcomes)
+    update_seconds = max(o[1] for o in outcomes)
+    missing = sum(o[2] for o in outcomes)
+    total_sessions = workers * sessions
+    total_updates = workers * updates
+
+    print(f"workers:                {workers}")
+    print(
+        f"store_questions:        {total_sessions} sessions in {write_seconds:.2f}s"
+        f" ({total_sessions / write_seconds:,.0f}/s,"
+        f" {total_sessions * QUESTIONS_PER_SESSION / write_seconds:,.0f} questions/s)"
+    )
+    print(
+        f"update_question:        {total_updates} updates in {update_seconds:.2f}s"
+        f" ({total_updates / update_seconds:,.0f}/s)"
+    )
+    print(f"session not found:      {missing}")
+
+    passed = missing == 0
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--updates", type=int, default=2000)
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.workers, args.sessions, args.updates) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Time-to-first-question check for streamed quiz generation
+
+Uploads a PDF to ``/quiz/upload-pdf/stream`` while the fake LLM streams its
+JSON array token by token after a fixed latency. With incremental parsing the
+first ``question`` event arrives shortly after the first question object is
+complete, long before the whole completion has streamed.
+
+Usage (from apps/backend):
+    python -m benchmarks.streaming_generation --latency 1.0 --token-delay 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+
+from benchmarks.fake_openai import BackgroundServer, FakeOpenAIServer
+from benchmarks.pdfs import make_pdf
+
+
+async def run(base_url: str) -> bool:
+    pdf = make_pdf(num_pages=2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        started = time.perf_counter()
+        first_question = None
+        events = []
+        async with client.stream(
+            "POST",
+            "/quiz/upload-pdf/stream",
+            files={"file": ("handout.pdf", pdf, "application/pdf")},
+            headers={"X-Session-ID": "streaming"},
+        ) as response:
+            response.raise_for_status()
+            buffer = ""
+            async for text in response.aiter_text():
+                buffer += text
+                *complete, buffer = buffer.split("\n\n")
+                for raw in complete:
+                    fields = dict(line.split(": ", 1) for line in raw.split("\n"))
+                    events.append(fields)
+                    if fields.get("event") == "question" and first_question is None:
+                        first_question = time.perf_counter() - started
+        total = time.perf_counter() - started
+
+    questions = [json.loads(e["data"]) for e in events if e.get("event") == "question"]
+    done = bool(events) and events[-1].get("event") == "done"
+
+    print(f"time to first question: {first_question or 0:.2f}s")
+    print(f"time to full quiz:      {total:.2f}s")
+    print(f"questions streamed:     {len(questions)}")
+
+    passed = done and len(questions) == 10 and first_question < total / 2
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(latency=args.latency, token_delay=args.token_delay) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+        # Measure generation, not a cached replay
+        os.environ["QUIZ_CACHE_ENABLED"] = "false"
+        os.environ["EXPLANATION_PREWARM_ENABLED"] = "false"
+        from main import app
+
+        # A real socket: ASGITransport buffers the whole response body
+        with BackgroundServer(app) as backend:
+            passed = asyncio.run(run(backend.base_url))
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Concurrent uploads of one shared PDF against a slow fake LLM
+
+A class uploading the same handout at once should cost one extraction and
+one generation. With the quiz cache disabled (so only coalescing can help),
+every upload must still succeed, the fake LLM must see a single generation,
+and each session must own an independent copy: editing one student's
+question leaves the others unchanged.
+
+Usage (from apps/backend):
+    python -m benchmarks.upload_coalescing --uploads 30 --latency 1.0
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.pdfs import make_pdf
+
+
+async def _upload(client: httpx.AsyncClient, pdf: bytes, session_id: str) -> dict:
+    response = await client.post(
+        "/quiz/upload-pdf",
+        files={"file": (f"{session_id}.pdf", pdf, "application/pdf")},
+        headers={"X-Session-ID": session_id},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def run(uploads: int, server: FakeOpenAIServer) -> bool:
+    from main import app
+    from src.pdf.services import _extractions
+
+    pdf = make_pdf(num_pages=20)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver", timeout=60
+    ) as client:
+        started = time.perf_counter()
+        quizzes = await asyncio.gather(
+            *(_upload(client, pdf, f"student-{i}") for i in range(uploads))
+        )
+        elapsed = time.perf_counter() - started
+
+        first = quizzes[0]["questions"][0]
+        response = await client.put(
+            f"/quiz/questions/{first['id']}",
+            json={**first, "answer": first["options"][1]},
+            headers={"X-Session-ID": "student-0"},
+        )
+        response.raise_for_status()
+        response = await client.post(
+            "/quiz/check-answer",
+            json={"question_id": first["id"], "user_answer": first["answer"]},
+            headers={"X-Session-ID": "student-1"},
+        )
+        response.raise_for_status()
+        other_unchanged = response.json()["correct"]
+        stats = (await client.get("/quiz/cache/stats")).json()
+
+    titles = {quiz["quiz_title"] for quiz in quizzes}
+    same_quiz = all(quiz["questions"] == quizzes[0]["questions"] for quiz in quizzes)
+
+    print(f"{uploads} identical uploads:  {elapsed:.2f}s")
+    print(
+        f"PDF extractions:        {_extractions.started} ({_extractions.joined} joined)"
+    )
+    print(f"LLM requests:           {server.requests}")
+    print(f"coalesced generations:  {stats['coalesced']}")
+    print(f"per-upload titles:      {len(titles)}")
+    print(f"edit isolated:          {other_unchanged}")
+
+    passed = (
+        same_quiz
+        and _extractions.started == 1
+        and stats["coalesced"] == uploads - 1
+        and len(titles) == uploads
+        and other_unchanged
+    )
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uploads", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with FakeOpenAIServer(latency=args.latency) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+        # Coalescing alone must prevent the duplicate work
+        os.environ["QUIZ_CACHE_ENABLED"] = "false"
+        os.environ["EXPLANATION_PREWARM_ENABLED"] = "false"
+        passed = asyncio.run(run(args.uploads, server))
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,24 +8,52 @@ following a clean architecture pattern:
 - DTO Layer: Data transfer objects (dto.py files)
 """
 
+import logging
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.common.api import common_router
+from src.common.middleware import UploadSizeLimitMiddleware
+from src.llm.api import llm_router
+from src.llm.providers import get_llm_provider
 from src.pdf.api import pdf_router
+from src.pdf.services import get_max_upload_size_mb
+from src.pdf.workers import get_pdf_worker_pool
 from src.quiz.api import quiz_router
+from src.quiz.jobs import get_quiz_job_queue
+from src.quiz.services import get_quiz_management_service
 
 load_dotenv()
 
+# INFO includes one line per LLM call with its prompt and completion tokens
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan - warm up workers and release shared resources"""
+    get_pdf_worker_pool().start()
+    yield
+    get_pdf_worker_pool().close()
+    await get_quiz_job_queue().close()
+    await get_quiz_management_service().close()
+    await get_llm_provider().close()
+
+
 app = FastAPI(
     title="Quiz Generator API",
     version="1.0.0",
     description="AI-powered quiz generator from PDF documents",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS configuration for development and production
@@ -42,6 +70,12 @@ if cors_origins:
     production_origins = [origin.strip() for origin in cors_origins.split(",")]
     allowed_origins.extend(production_origins)
 
+# Reject oversized uploads while they stream in (slack covers multipart framing)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=get_max_upload_size_mb() * 1024 * 1024 + 64 * 1024,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
@@ -63,6 +97,7 @@ app.add_middleware(
 app.include_router(common_router)
 app.include_router(quiz_router)
 app.include_router(pdf_router)
+app.include_router(llm_router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,280 @@
+"""
+Common caches - In-memory and disk-backed LRU caches with TTL
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """
+    In-memory LRU cache with optional TTL and byte budget
+
+    Entries are kept in access order in an OrderedDict, so lookups, inserts
+    and evictions are all O(1). Expiry is amortized: expired entries are
+    dropped when read, and every write also pops a bounded number of expired
+    entries from the LRU end, so there is never a full sweep. With
+    ``refresh_on_access`` the TTL slides on every read, which keeps the LRU
+    end ordered by expiry and makes that incremental purge exact.
+    """
+
+    # Expired entries purged per write; keeps the per-request cost bounded
+    PURGE_BATCH = 16
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+        refresh_on_access: bool = False,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.refresh_on_access = refresh_on_access
+        self._clock = clock
+        self._sizeof = sizeof or (lambda value: 0)
+        # Format: {key: (expires_at, size_in_bytes, value)}
+        self._data: "OrderedDict[str, Tuple[float, int, V]]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expires_at(self) -> float:
+        if self.ttl_seconds is None:
+            return float("inf")
+        return self._clock() + self.ttl_seconds
+
+    def _pop(self, key: str) -> Optional[Tuple[float, int, V]]:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+        return entry
+
+    def _purge_expired(self) -> None:
+        """Drop up to PURGE_BATCH expired entries from the LRU end"""
+        now = self._clock()
+        for _ in range(self.PURGE_BATCH):
+            if not self._data:
+                return
+            oldest_key, (expires_at, _, _) = next(iter(self._data.items()))
+            if expires_at > now:
+                return
+            self._pop(oldest_key)
+            self.expirations += 1
+
+    def get(self, key: str) -> Optional[V]:
+        """Return the cached value, or None if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, size, value = entry
+        if expires_at <= self._clock():
+            self._pop(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        if self.refresh_on_access:
+            self._data[key] = (self._expires_at(), size, value)
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: V) -> None:
+        """Insert or refresh a value, evicting least recently used entries"""
+        self._purge_expired()
+
+        size = self._sizeof(value)
+        self._pop(key)
+        self._data[key] = (self._expires_at(), size, value)
+        self._total_bytes += size
+
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None
+            and self._total_bytes > self.max_bytes
+            and len(self._data) > 1
+        ):
+            self._pop(next(iter(self._data)))
+            self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        """Remove a key, returning whether it was present"""
+        return self._pop(key) is not None
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > self._clock()
+
+    def stats(self) -> Dict[str, int]:
+        """Occupancy and hit/miss counters"""
+        return {
+            "entries": len(self._data),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class DiskCache:
+    """
+    Disk-backed JSON cache with TTL and size-bounded LRU eviction
+
+    Each entry is a JSON file named after its key. File modification times
+    track recency (they are touched on every hit), and an in-memory index of
+    file sizes keeps eviction O(evicted) instead of rescanning the directory.
+    Safe to share between threads; writes are atomic via os.replace.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 100 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # Format: {key: size_in_bytes}, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from the files already on disk"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[: -len(".json")], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def _remove(self, key: str) -> None:
+        size = self._index.pop(key, 0)
+        self._total_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing, expired or unreadable"""
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as fh:
+                    entry = json.load(fh)
+            except (OSError, ValueError):
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            if self.ttl_seconds is not None and (
+                time.time() - entry.get("created_at", 0) > self.ttl_seconds
+            ):
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            # Touch the file so recency survives restarts
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self._index.move_to_end(key)
+            self.hits += 1
+            return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        """Write a value atomically and evict LRU entries over the size budget"""
+        payload = json.dumps({"created_at": time.time(), "value": value})
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    fh.write(payload)
+                os.replace(tmp_path, path)
+            except OSError:
+                # Leave no partial file behind, e.g. when the disk is full
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+            self._total_bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+
+            while self._total_bytes > self.max_bytes and self._index:
+                oldest_key = next(iter(self._index))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        """Remove a key, returning whether it was present"""
+        with self._lock:
+            present = key in self._index
+            self._remove(key)
+            return present
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> Dict[str, int]:
+        """Occupancy and hit/miss counters"""
+        return {
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,56 @@
+"""
+Common middleware - ASGI middleware shared across modules
+"""
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject request bodies larger than ``max_bytes`` while they arrive
+
+    Requests that declare a too-large Content-Length are refused with 413
+    before any of the body is read. Bodies without a trustworthy length are
+    counted chunk by chunk, and reading stops with 413 as soon as the limit
+    is crossed, so an oversized upload is never fully received or buffered.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    def _too_large_detail(self) -> str:
+        return f"Request body exceeds the {self.max_bytes // (1024 * 1024)}MB limit"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > self.max_bytes:
+                response = JSONResponse(
+                    {"detail": self._too_large_detail()}, status_code=413
+                )
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Surfaces through FastAPI's exception handling as a 413
+                    raise HTTPException(
+                        status_code=413, detail=self._too_large_detail()
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
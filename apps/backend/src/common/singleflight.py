@@ -0,0 +1,60 @@
+"""
+Single flight - Coalesce identical concurrent work into one execution
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Run at most one call per key at a time; concurrent callers share it
+
+    The first caller for a key starts the work as a task and later callers
+    await the same task, receiving its result or its exception. The task is
+    shielded from caller cancellation, so one client disconnecting does not
+    fail the others. The key is forgotten once the work finishes: callers
+    arriving afterwards start a new flight (or hit whatever cache the work
+    filled).
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.joined = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._flights
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: str, work: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``work`` for ``key``, or wait for the run already in flight
+
+        Args:
+            key: Identity of the work; equal keys must produce equal results
+            work: Coroutine function started only if no flight exists
+
+        Returns:
+            The shared result
+        """
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.create_task(work())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.started += 1
+        else:
+            self.joined += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Mark the exception retrieved even if every caller has gone away
+        if not task.cancelled():
+            task.exception()
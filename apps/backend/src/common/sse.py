@@ -0,0 +1,106 @@
+"""
+Server-Sent Events - Framing and coalescing for streamed text
+"""
+
+import asyncio
+import time
+from typing import AsyncGenerator, AsyncIterator, Optional
+
+DONE_SENTINEL = "[DONE]"
+HEARTBEAT = ": keep-alive\n\n"
+_END = object()
+
+
+def format_event(
+    data: str, event: Optional[str] = None, event_id: Optional[int] = None
+) -> str:
+    """Frame one SSE event; multi-line data becomes one data line per line"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream_events(
+    deltas: AsyncIterator[str],
+    window_seconds: float = 0.05,
+    max_bytes: int = 512,
+    heartbeat_seconds: float = 15.0,
+) -> AsyncGenerator[str, None]:
+    """
+    Coalesce text deltas into numbered SSE events
+
+    Deltas are buffered until ``window_seconds`` have passed since the first
+    buffered one or ``max_bytes`` have accumulated, then sent as a single
+    event, so a word-by-word LLM stream becomes a few events instead of
+    hundreds. While the source is silent a heartbeat comment is sent every
+    ``heartbeat_seconds`` to keep proxies from closing the connection. The
+    stream ends with an ``event: done`` carrying the legacy ``[DONE]`` data.
+
+    Args:
+        deltas: Source of text fragments
+        window_seconds: Longest time a fragment waits to be sent
+        max_bytes: Buffered UTF-8 size that triggers an immediate send
+        heartbeat_seconds: Idle time between heartbeat comments
+
+    Yields:
+        SSE-framed strings ready to write to the response
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for delta in deltas:
+                if delta:
+                    await queue.put(delta)
+            await queue.put(_END)
+        except Exception as e:
+            await queue.put(e)
+
+    pump_task = asyncio.create_task(pump())
+    event_id = 0
+    buffer = []
+    buffered_bytes = 0
+    deadline = 0.0
+
+    def flush() -> str:
+        nonlocal event_id, buffered_bytes
+        event_id += 1
+        data = "".join(buffer)
+        buffer.clear()
+        buffered_bytes = 0
+        return format_event(data, event_id=event_id)
+
+    try:
+        while True:
+            timeout = (
+                max(deadline - time.monotonic(), 0.0) if buffer else heartbeat_seconds
+            )
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield flush() if buffer else HEARTBEAT
+                continue
+
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                if buffer:
+                    yield flush()
+                raise item
+
+            if not buffer:
+                deadline = time.monotonic() + window_seconds
+            buffer.append(item)
+            buffered_bytes += len(item.encode("utf-8"))
+            if buffered_bytes >= max_bytes:
+                yield flush()
+
+        if buffer:
+            yield flush()
+        yield format_event(DONE_SENTINEL, event="done", event_id=event_id + 1)
+    finally:
+        pump_task.cancel()
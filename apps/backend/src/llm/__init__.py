@@ -0,0 +1 @@
+# LLM package
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+LLM API endpoints - Route handlers for outbound LLM call monitoring
+"""
+
+from fastapi import APIRouter, Depends
+
+from src.llm.dto import LLMGatewayStats
+from src.llm.gateway import LLMGateway, get_llm_gateway
+
+# Create LLM router
+llm_router = APIRouter(prefix="/llm", tags=["LLM"])
+
+
+@llm_router.get("/stats", response_model=LLMGatewayStats)
+async def get_llm_gateway_stats(
+    llm_gateway: LLMGateway = Depends(get_llm_gateway),
+):
+    """
+    Report outbound LLM call counts, load and timing
+
+    Args:
+        llm_gateway: Injected LLM gateway
+
+    Returns:
+        LLMGatewayStats with counters and recent latency percentiles
+    """
+    return llm_gateway.stats()
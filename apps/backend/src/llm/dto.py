@@ -0,0 +1,33 @@
+"""
+LLM-related Data Transfer Objects (DTOs)
+"""
+
+from pydantic import BaseModel, Field
+
+
+class LLMGatewayStats(BaseModel):
+    """DTO for outbound LLM call statistics"""
+
+    calls: int = Field(..., description="Completed calls, successful or not")
+    failures: int = Field(..., description="Calls that failed after all retries")
+    retries: int = Field(
+        ..., description="Retried attempts after 429, 5xx or connection errors"
+    )
+    in_flight: int = Field(..., description="Calls currently holding a slot")
+    waiting: int = Field(..., description="Calls waiting for quota or a slot")
+    max_in_flight: int = Field(..., description="Cap on concurrent calls")
+    requests_per_minute: float = Field(..., description="Request quota (0 = unlimited)")
+    tokens_per_minute: float = Field(..., description="Token quota (0 = unlimited)")
+    prompt_tokens: int = Field(..., description="Prompt tokens sent so far")
+    completion_tokens: int = Field(..., description="Completion tokens received so far")
+    recent_calls: int = Field(
+        ..., description="Calls covered by the timing percentiles"
+    )
+    wait_ms_p50: float = Field(
+        ..., description="Median time queued for quota and a slot"
+    )
+    wait_ms_p95: float = Field(..., description="95th percentile queueing time")
+    duration_ms_p50: float = Field(
+        ..., description="Median call duration, retries included"
+    )
+    duration_ms_p95: float = Field(..., description="95th percentile call duration")
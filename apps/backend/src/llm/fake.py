@@ -0,0 +1,226 @@
+"""
+Fake LLM provider - Deterministic offline completions for load tests and benchmarks
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from openai import InternalServerError, RateLimitError
+from openai.types import CompletionUsage
+from openai.types.chat import (
+    ChatCompletion,
+    ChatCompletionChunk,
+    ChatCompletionMessage,
+)
+from openai.types.chat.chat_completion import Choice
+from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice
+from openai.types.chat.chat_completion_chunk import ChoiceDelta
+
+from src.llm.providers import LLMProvider
+from src.llm.tokens import get_token_counter
+
+FEEDBACK_TEXT = (
+    "Not quite, but you are close! The correct answer follows directly from "
+    "the definition in the text. Try to recall the key term next time."
+)
+
+# Key terms make each fake question distinct enough to pass de-duplication
+TERMS = (
+    "osmosis diffusion catalyst isotope alloy polymer tectonics erosion "
+    "monsoon glacier meiosis enzyme ribosome quasar nebula comet vector "
+    "tensor lattice entropy enthalpy plasma photon neutrino aqueduct feudalism "
+    "mercantilism tariff sonnet allegory syntax morpheme algorithm compiler "
+    "kernel protocol cipher ledger annuity dividend"
+).split()
+
+# Generation prompts ask for "exactly N multiple-choice questions"
+_QUIZ_REQUEST = re.compile(r"exactly (\d+)")
+
+# Completion pieces of about four characters, the size of a real token
+_TOKEN = re.compile(r"\s*\S{1,4}|\s+$")
+
+_FAKE_URL = "http://fake-llm.local/v1/chat/completions"
+
+
+def fake_questions(num_questions: int = 10, topic: str = "Sample") -> List[Dict]:
+    """Schema-valid quiz questions as the real model would return them"""
+    questions = []
+    for i in range(num_questions):
+        digest = hashlib.sha1(f"{topic}:{i}".encode()).digest()
+        first, second = TERMS[digest[0] % len(TERMS)], TERMS[digest[1] % len(TERMS)]
+        options = [f"Answer {i + 1}{letter}" for letter in "ABCD"]
+        questions.append(
+            {
+                "question": f"{topic} question number {i + 1}: how does {first} relate to {second}?",
+                "answer": options[0],
+                "options": options,
+            }
+        )
+    return questions
+
+
+class _FakeStream:
+    """Chunk stream with the ``close()`` of an SDK stream"""
+
+    def __init__(self, chunks: AsyncIterator[ChatCompletionChunk]):
+        self._chunks = chunks
+
+    def __aiter__(self) -> AsyncIterator[ChatCompletionChunk]:
+        return self._chunks
+
+    async def close(self) -> None:
+        await self._chunks.aclose()
+
+
+class FakeLLMProvider(LLMProvider):
+    """
+    Offline provider answering like the real model, without network or cost
+
+    Generation prompts get a JSON array of exactly the requested number of
+    schema-valid questions, derived from a hash of the prompt, so the same
+    prompt always gets the same quiz; any other prompt gets a short feedback
+    text. Replies arrive after ``latency_seconds`` plus up to
+    ``jitter_seconds`` and are produced at ``tokens_per_second`` (0 for
+    instant), streamed piece by piece when ``stream=True``. A
+    ``rate_limit_rate`` fraction of calls fails at once with a 429 and an
+    ``error_rate`` fraction fails with a 500 after the latency; an
+    ``invalid_rate`` fraction of questions names an answer missing from its
+    options. Timing and failures come from a seeded generator.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.5,
+        jitter_seconds: float = 0.1,
+        tokens_per_second: float = 100.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        invalid_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.invalid_rate = invalid_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.failed = 0
+
+    async def create(self, **request: Any) -> Any:
+        self.calls += 1
+        roll = self._rng.random()
+        delay = self.latency_seconds + self._rng.uniform(0, self.jitter_seconds)
+        if roll < self.rate_limit_rate:
+            self.failed += 1
+            raise self._error(RateLimitError, 429, "Rate limit reached")
+        await asyncio.sleep(delay)
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.failed += 1
+            raise self._error(InternalServerError, 500, "The server had an error")
+
+        model = request.get("model", "fake")
+        messages = request.get("messages", [])
+        pieces = _TOKEN.findall(self._reply(messages))
+        finish_reason = "stop"
+        if request.get("max_tokens") and len(pieces) > request["max_tokens"]:
+            pieces, finish_reason = pieces[: request["max_tokens"]], "length"
+        prompt_tokens = get_token_counter(model).count_messages(messages)
+        usage = CompletionUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=len(pieces),
+            total_tokens=prompt_tokens + len(pieces),
+        )
+
+        if request.get("stream"):
+            include_usage = (request.get("stream_options") or {}).get("include_usage")
+            return _FakeStream(
+                self._stream(
+                    model, pieces, finish_reason, usage if include_usage else None
+                )
+            )
+
+        if self.tokens_per_second > 0:
+            await asyncio.sleep(len(pieces) / self.tokens_per_second)
+        return ChatCompletion(
+            id=f"chatcmpl-{uuid.uuid4().hex}",
+            object="chat.completion",
+            created=int(time.time()),
+            model=model,
+            choices=[
+                Choice(
+                    index=0,
+                    finish_reason=finish_reason,
+                    message=ChatCompletionMessage(
+                        role="assistant", content="".join(pieces)
+                    ),
+                )
+            ],
+            usage=usage,
+        )
+
+    async def _stream(
+        self,
+        model: str,
+        pieces: List[str],
+        finish_reason: str,
+        usage: Optional[CompletionUsage],
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+        def chunk(**fields: Any) -> ChatCompletionChunk:
+            return ChatCompletionChunk(
+                id=completion_id,
+                object="chat.completion.chunk",
+                created=int(time.time()),
+                model=model,
+                **fields,
+            )
+
+        for piece in pieces:
+            if self.tokens_per_second > 0:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            yield chunk(
+                choices=[ChunkChoice(index=0, delta=ChoiceDelta(content=piece))]
+            )
+        yield chunk(
+            choices=[
+                ChunkChoice(index=0, delta=ChoiceDelta(), finish_reason=finish_reason)
+            ]
+        )
+        if usage is not None:
+            yield chunk(choices=[], usage=usage)
+
+    def _reply(self, messages: List[Dict[str, str]]) -> str:
+        prompt = (messages[-1].get("content") or "") if messages else ""
+        match = _QUIZ_REQUEST.search(prompt)
+        if not match:
+            return FEEDBACK_TEXT
+
+        digest = hashlib.sha1(prompt.encode()).hexdigest()
+        questions = fake_questions(int(match.group(1)), f"Topic {digest[:6]}")
+        for i, question in enumerate(questions):
+            # Decided by the prompt, not call order, so replies stay deterministic
+            draw = hashlib.sha1(f"{digest}:{i}".encode()).digest()
+            if int.from_bytes(draw[:4], "big") / 2**32 < self.invalid_rate:
+                question["answer"] = "None of the listed answers"
+        return json.dumps(questions, indent=2)
+
+    @staticmethod
+    def _error(error_type, status_code: int, message: str) -> Exception:
+        response = httpx.Response(
+            status_code,
+            headers={"retry-after": "0.1"},
+            request=httpx.Request("POST", _FAKE_URL),
+        )
+        return error_type(message, response=response, body=None)
@@ -0,0 +1,375 @@
+"""
+LLM gateway - Rate limiting, concurrency caps and retries for every LLM call
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+)
+
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    InternalServerError,
+    RateLimitError,
+)
+
+from src.llm.dto import LLMGatewayStats
+from src.llm.providers import LLMProvider, get_llm_provider
+from src.llm.tokens import get_token_counter
+
+logger = logging.getLogger(__name__)
+
+# 429s, 5xx, timeouts and dropped connections are worth another attempt
+RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError)
+
+# Completion allowance charged against the token quota when a call sets no max_tokens
+DEFAULT_COMPLETION_TOKENS = 1000
+
+# Calls kept for the timing percentiles
+TIMING_WINDOW = 1000
+
+
+class TokenBucket:
+    """
+    Continuously refilling token bucket for a per-minute quota
+
+    The bucket holds up to one minute of quota. Waiters are served in
+    arrival order, and spending can be corrected after the fact, so a call
+    that used more tokens than estimated delays the ones behind it.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self._clock = clock
+        self._tokens = per_minute
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until ``amount`` is available and spend it"""
+        # A request larger than the bucket would never fit; let it drain it
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= amount
+
+    def adjust(self, amount: float) -> None:
+        """Charge (or refund, if negative) tokens without waiting"""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class _CallTiming:
+    """Timing of one gateway call, from queueing to completion"""
+
+    __slots__ = (
+        "model",
+        "queued_at",
+        "wait",
+        "duration",
+        "attempts",
+        "ok",
+        "prompt_tokens",
+        "completion_tokens",
+    )
+
+    def __init__(self, model: str, queued_at: float, prompt_tokens: int):
+        self.model = model
+        self.queued_at = queued_at
+        self.wait = 0.0
+        self.duration = 0.0
+        self.attempts = 0
+        self.ok = False
+        # Estimated until the provider reports usage
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = 0
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LLMGateway:
+    """
+    Single path for chat completion calls
+
+    Each call first waits for request and token budget (token buckets sized
+    to the provider's requests- and tokens-per-minute quota) and for one of
+    ``max_in_flight`` slots, so bursts queue briefly instead of failing.
+    Rate limit, server and connection errors are retried with jittered
+    exponential backoff, honouring ``Retry-After``. Streams are retried
+    only until they are established, and hold their slot until closed.
+    Every call is logged with its prompt and completion token counts, as
+    reported by the provider or, failing that, counted locally.
+    """
+
+    def __init__(
+        self,
+        provider: Optional[LLMProvider] = None,
+        requests_per_minute: float = 3500,
+        tokens_per_minute: float = 90_000,
+        max_in_flight: int = 32,
+        max_retries: int = 4,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 20.0,
+        rng: Optional[random.Random] = None,
+    ):
+        # OpenAI, or the offline fake selected by LLM_PROVIDER
+        self.provider = provider or get_llm_provider()
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._rng = rng or random.Random()
+        # A quota of 0 disables that limiter
+        self._request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        )
+        self._token_bucket = (
+            TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        )
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._timings: Deque[_CallTiming] = deque(maxlen=TIMING_WINDOW)
+
+    async def chat(self, **request: Any) -> Any:
+        """
+        Create a chat completion
+
+        Args:
+            **request: Arguments for ``chat.completions.create``
+
+        Returns:
+            The ChatCompletion
+
+        Raises:
+            openai.OpenAIError: If the call fails or retries are exhausted
+        """
+        async with self._admitted(request) as timing:
+            response = await self._create(request, timing)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                self._record_usage(timing, usage)
+            elif response.choices and response.choices[0].message.content:
+                timing.completion_tokens = get_token_counter(timing.model).count(
+                    response.choices[0].message.content
+                )
+            return response
+
+    async def stream_chat(self, **request: Any) -> AsyncGenerator[Any, None]:
+        """
+        Stream a chat completion
+
+        Use with ``contextlib.aclosing`` so the slot is released as soon as
+        the caller stops reading.
+
+        Args:
+            **request: Arguments for ``chat.completions.create``
+
+        Yields:
+            ChatCompletionChunk objects
+
+        Raises:
+            openai.OpenAIError: If the call fails or retries are exhausted
+        """
+        async with self._admitted(request) as timing:
+            stream = await self._create(
+                {
+                    **request,
+                    "stream": True,
+                    # The final chunk carries the usage of the whole call
+                    "stream_options": {"include_usage": True},
+                },
+                timing,
+            )
+            deltas: List[str] = []
+            usage = None
+            try:
+                async for chunk in stream:
+                    if getattr(chunk, "usage", None) is not None:
+                        usage = chunk.usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        deltas.append(chunk.choices[0].delta.content)
+                    yield chunk
+            finally:
+                await stream.close()
+                if usage is not None:
+                    self._record_usage(timing, usage)
+                else:
+                    # Closed before the usage chunk arrived
+                    timing.completion_tokens = get_token_counter(timing.model).count(
+                        "".join(deltas)
+                    )
+
+    @asynccontextmanager
+    async def _admitted(self, request: Dict[str, Any]) -> AsyncIterator[_CallTiming]:
+        """Wait for quota and an in-flight slot, then time and log the call"""
+        model = request.get("model", "")
+        timing = _CallTiming(
+            model,
+            time.monotonic(),
+            get_token_counter(model).count_messages(request.get("messages", [])),
+        )
+        # Charged against the token quota now; corrected once usage is known
+        estimated_tokens = timing.prompt_tokens + (
+            request.get("max_tokens") or DEFAULT_COMPLETION_TOKENS
+        )
+        self.waiting += 1
+        try:
+            if self._request_bucket is not None:
+                await self._request_bucket.acquire()
+            if self._token_bucket is not None:
+                await self._token_bucket.acquire(estimated_tokens)
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        started = time.monotonic()
+        timing.wait = started - timing.queued_at
+        self.in_flight += 1
+        try:
+            yield timing
+            timing.ok = True
+        except (GeneratorExit, asyncio.CancelledError):
+            # The caller stopped reading early; not a provider failure
+            timing.ok = True
+            raise
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+            timing.duration = time.monotonic() - started
+            self.calls += 1
+            self.failures += not timing.ok
+            self._timings.append(timing)
+            if self._token_bucket is not None:
+                self._token_bucket.adjust(
+                    timing.prompt_tokens + timing.completion_tokens - estimated_tokens
+                )
+            self.prompt_tokens += timing.prompt_tokens
+            self.completion_tokens += timing.completion_tokens
+            logger.info(
+                "llm call model=%s prompt_tokens=%d completion_tokens=%d "
+                "wait_ms=%.0f duration_ms=%.0f attempts=%d ok=%s",
+                timing.model,
+                timing.prompt_tokens,
+                timing.completion_tokens,
+                timing.wait * 1000,
+                timing.duration * 1000,
+                timing.attempts,
+                timing.ok,
+            )
+
+    async def _create(self, request: Dict[str, Any], timing: _CallTiming) -> Any:
+        """Call the provider, retrying transient failures"""
+        while True:
+            timing.attempts += 1
+            try:
+                return await self.provider.create(**request)
+            except RETRYABLE_ERRORS as e:
+                if timing.attempts > self.max_retries:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self._backoff(timing.attempts, e))
+                # A retry is another request against the quota
+                if self._request_bucket is not None:
+                    await self._request_bucket.acquire()
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential delay, at least the server's Retry-After"""
+        ceiling = min(
+            self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempt - 1)
+        )
+        delay = self._rng.uniform(0, ceiling)
+        if isinstance(error, APIStatusError):
+            retry_after = error.response.headers.get("retry-after")
+            try:
+                delay = max(delay, float(retry_after))
+            except (TypeError, ValueError):
+                pass
+        return min(delay, self.backoff_max_seconds)
+
+    @staticmethod
+    def _record_usage(timing: _CallTiming, usage: Any) -> None:
+        """Take the provider's token counts and recalibrate the local estimate"""
+        get_token_counter(timing.model).calibrate(
+            timing.prompt_tokens, usage.prompt_tokens
+        )
+        timing.prompt_tokens = usage.prompt_tokens
+        timing.completion_tokens = usage.completion_tokens
+
+    def stats(self) -> LLMGatewayStats:
+        """Call counters, current load and recent timing percentiles"""
+        waits = [timing.wait for timing in self._timings]
+        durations = [timing.duration for timing in self._timings]
+        return LLMGatewayStats(
+            calls=self.calls,
+            failures=self.failures,
+            retries=self.retries,
+            in_flight=self.in_flight,
+            waiting=self.waiting,
+            max_in_flight=self.max_in_flight,
+            requests_per_minute=self.requests_per_minute,
+            tokens_per_minute=self.tokens_per_minute,
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.completion_tokens,
+            recent_calls=len(self._timings),
+            wait_ms_p50=_percentile(waits, 0.5) * 1000,
+            wait_ms_p95=_percentile(waits, 0.95) * 1000,
+            duration_ms_p50=_percentile(durations, 0.5) * 1000,
+            duration_ms_p95=_percentile(durations, 0.95) * 1000,
+        )
+
+
+# Global singleton instance - one quota and slot pool per worker process
+_llm_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Dependency for LLMGateway - configured from environment"""
+    global _llm_gateway
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway(
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "3500")),
+            tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "90000")),
+            max_in_flight=int(os.getenv("LLM_MAX_IN_FLIGHT", "32")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "4")),
+            backoff_base_seconds=float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5")),
+            backoff_max_seconds=float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "20")),
+        )
+    return _llm_gateway
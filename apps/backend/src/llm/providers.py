@@ -0,0 +1,73 @@
+"""
+LLM providers - Backends that serve chat completion calls for the gateway
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from src.llm.services import LLMClientService, get_llm_client_service
+
+
+class LLMProvider(ABC):
+    """
+    Backend behind the LLM gateway
+
+    Providers speak the OpenAI chat completions shape: ``create`` takes the
+    arguments of ``chat.completions.create`` and returns a ChatCompletion,
+    or, with ``stream=True``, an async iterable of ChatCompletionChunk
+    objects with an async ``close()``. Failures raise the OpenAI SDK error
+    types, so the gateway retries every provider the same way.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def create(self, **request: Any) -> Any:
+        """Create a chat completion or stream"""
+
+    async def close(self) -> None:
+        """Release connections or other resources"""
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI (or an OpenAI-compatible endpoint) through the shared async client"""
+
+    name = "openai"
+
+    def __init__(self, llm_client_service: Optional[LLMClientService] = None):
+        self._llm_client_service = llm_client_service or get_llm_client_service()
+
+    async def create(self, **request: Any) -> Any:
+        return await self._llm_client_service.client.chat.completions.create(**request)
+
+    async def close(self) -> None:
+        await self._llm_client_service.close()
+
+
+# Global singleton instance - one provider per worker process
+_llm_provider: Optional[LLMProvider] = None
+
+
+def get_llm_provider() -> LLMProvider:
+    """Dependency for LLMProvider - chosen by LLM_PROVIDER (openai | fake)"""
+    global _llm_provider
+    if _llm_provider is None:
+        name = os.getenv("LLM_PROVIDER", "openai").lower()
+        if name == "openai":
+            _llm_provider = OpenAIProvider()
+        elif name == "fake":
+            from src.llm.fake import FakeLLMProvider
+
+            _llm_provider = FakeLLMProvider(
+                latency_seconds=float(os.getenv("LLM_FAKE_LATENCY_SECONDS", "0.5")),
+                jitter_seconds=float(os.getenv("LLM_FAKE_JITTER_SECONDS", "0.1")),
+                tokens_per_second=float(os.getenv("LLM_FAKE_TOKENS_PER_SECOND", "100")),
+                error_rate=float(os.getenv("LLM_FAKE_ERROR_RATE", "0")),
+                rate_limit_rate=float(os.getenv("LLM_FAKE_RATE_LIMIT_RATE", "0")),
+                invalid_rate=float(os.getenv("LLM_FAKE_INVALID_RATE", "0")),
+                seed=int(os.getenv("LLM_FAKE_SEED", "0")),
+            )
+        else:
+            raise ValueError(f"Unknown LLM_PROVIDER: {name}")
+    return _llm_provider
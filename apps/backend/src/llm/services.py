@@ -0,0 +1,81 @@
+"""
+LLM services - Shared async OpenAI client for all modules
+"""
+
+import os
+from typing import Optional
+
+import httpx
+from fastapi import HTTPException
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+
+class LLMClientService:
+    """Service owning the process-wide async OpenAI client and its connection pool"""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: float = 30.0,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.timeout = timeout
+        self._client: Optional[AsyncOpenAI] = None
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """
+        Lazy initialization of the shared AsyncOpenAI client
+
+        A single client (and therefore a single httpx connection pool) is
+        reused by every request, so concurrent LLM calls only pay for
+        connection setup once and never block the event loop.
+        OPENAI_BASE_URL is honoured, which allows pointing the service at a
+        local OpenAI-compatible endpoint. The SDK's own retries are off:
+        the LLM gateway retries under the shared rate limits instead.
+        """
+        if self._client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise HTTPException(
+                    status_code=500,
+                    detail="OpenAI API key not configured. Please check your environment variables.",
+                )
+
+            self._client = AsyncOpenAI(
+                api_key=api_key,
+                timeout=self.timeout,
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive_connections,
+                    ),
+                    timeout=self.timeout,
+                ),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared client and release pooled connections"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+# Global singleton instance - one connection pool per worker process
+_llm_client_service: Optional[LLMClientService] = None
+
+
+def get_llm_client_service() -> LLMClientService:
+    """Dependency for LLMClientService - Singleton to share the connection pool"""
+    global _llm_client_service
+    if _llm_client_service is None:
+        _llm_client_service = LLMClientService(
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "20")),
+            timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "30")),
+        )
+    return _llm_client_service
@@ -0,0 +1,126 @@
+"""
+Token counting - Per-model prompt sizes for context budgeting
+"""
+
+import math
+import re
+from typing import Dict, Iterable, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Optional: exact counts when installed
+    tiktoken = None
+
+# Context windows (prompt + completion) of the models the app can be configured with
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 16_385,
+    "gpt-4": 8_192,
+    "gpt-4-turbo": 128_000,
+    "gpt-4o": 128_000,
+    "gpt-4o-mini": 128_000,
+}
+DEFAULT_CONTEXT_WINDOW = 8_192
+
+# Tokens per estimated token for each tokenizer generation (o200k packs more per token)
+_MODEL_SCALES = {"gpt-4o": 0.9, "gpt-4o-mini": 0.9}
+
+# Chat formatting adds a few tokens per message and to prime the reply
+TOKENS_PER_MESSAGE = 4
+REPLY_PRIMING_TOKENS = 3
+
+# Same split as the GPT tokenizers' pre-tokenizer: words with their leading
+# space, digit groups of up to three, punctuation runs and whitespace
+_PIECE = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+", re.UNICODE
+)
+
+
+def _estimate_piece(piece: str) -> int:
+    word = piece.lstrip(" ")
+    if not word or word.isspace():
+        return 1
+    if word.isdigit():
+        return 1
+    if not word.isascii():
+        # Accented and non-Latin text splits into far more tokens
+        return math.ceil(len(word) / 2)
+    if word[0].isalpha():
+        # Common words are one token; long or rare ones split every few letters
+        return 1 + (len(word) - 1) // 7
+    return math.ceil(len(word) / 2)
+
+
+class TokenCounter:
+    """
+    Token counts for one model
+
+    Uses the model's tiktoken encoding when tiktoken is installed and its
+    encoding files are available. Otherwise counts come from a regex
+    pre-tokenizer and a per-piece estimate. That estimate is recalibrated
+    from the prompt token counts the provider reports, so it converges on
+    the real tokenizer as traffic flows.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self.context_window = MODEL_CONTEXT_WINDOWS.get(
+            _base_model(model), DEFAULT_CONTEXT_WINDOW
+        )
+        self.scale = _MODEL_SCALES.get(_base_model(model), 1.0)
+        self._encoding = _load_encoding(model)
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from the model's own tokenizer"""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """Tokens in a text"""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        estimate = sum(_estimate_piece(piece) for piece in _PIECE.findall(text))
+        return math.ceil(estimate * self.scale)
+
+    def count_messages(self, messages: Iterable[Dict[str, str]]) -> int:
+        """Prompt tokens of a chat request, formatting overhead included"""
+        return REPLY_PRIMING_TOKENS + sum(
+            TOKENS_PER_MESSAGE + self.count(message.get("content") or "")
+            for message in messages
+        )
+
+    def calibrate(self, estimated: int, actual: int) -> None:
+        """Move the estimate toward a provider-reported prompt token count"""
+        if self._encoding is not None or estimated <= 0 or actual <= 0:
+            return
+        # Exponential moving average of the observed ratio, kept within sane bounds
+        ratio = actual / estimated
+        self.scale = min(3.0, max(0.3, self.scale * (0.8 + 0.2 * ratio)))
+
+
+def _base_model(model: str) -> str:
+    """Strip dated snapshot suffixes such as gpt-4o-2024-08-06"""
+    for name in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+        if model == name or model.startswith(f"{name}-"):
+            return name
+    return model
+
+
+def _load_encoding(model: str) -> Optional[object]:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        # Unknown model, or encoding files unavailable offline
+        return None
+
+
+# One counter per model, shared by prompt building and the LLM gateway
+_token_counters: Dict[str, TokenCounter] = {}
+
+
+def get_token_counter(model: str) -> TokenCounter:
+    """Shared TokenCounter for a model"""
+    if model not in _token_counters:
+        _token_counters[model] = TokenCounter(model)
+    return _token_counters[model]
@@ -1,7 +1,9 @@
 """
 PDF API endpoints - Route handlers for PDF operations
 """
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, File, UploadFile, HTTPException, Query
 
 from src.pdf.services import PdfProcessingService
 from src.pdf.dto import PdfUploadResponse
@@ -12,12 +14,18 @@ pdf_router = APIRouter(prefix="/pdf", tags=["PDF"])
 
 
 @pdf_router.post("/extract-text", response_model=PdfUploadResponse)
-async def extract_text_from_pdf(file: UploadFile = File(...)):
+async def extract_text_from_pdf(
+    file: UploadFile = File(...),
+    pages: Optional[str] = Query(
+        default=None, description="Pages to extract, e.g. '1-5,8' (default: all)"
+    ),
+):
     """
     Extract text from uploaded PDF file
     
     Args:
         file: The uploaded PDF file
+        pages: Optional 1-based page selection
         
     Returns:
         PdfUploadResponse with extracted text and file info
@@ -32,7 +40,7 @@ async def extract_text_from_pdf(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail=validation_error)
         
         # Process the PDF
-        result = await PdfProcessingService.extract_text_from_pdf(file)
+        result = await PdfProcessingService.extract_text_from_pdf(file, pages=pages)
         return result
         
     except HTTPException:
@@ -2,7 +2,7 @@
 PDF-related Data Transfer Objects (DTOs)
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 
 class PdfUploadResponse(BaseModel):
@@ -11,6 +11,12 @@ class PdfUploadResponse(BaseModel):
     text_extracted: str = Field(..., description="Extracted text from the PDF")
     file_name: str = Field(..., description="Name of the uploaded file")
     file_size: int = Field(..., description="Size of the uploaded file in bytes")
+    page_count: int = Field(0, description="Total number of pages in the PDF")
+    page_texts: List[str] = Field(
+        default_factory=list,
+        exclude=True,
+        description="Extracted text per selected page, in page order (not serialized)",
+    )
 
 
 class PdfProcessingError(BaseModel):
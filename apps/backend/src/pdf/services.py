@@ -1,24 +1,194 @@
 """
 PDF services - Business logic for PDF processing
 """
-import io
-from typing import Optional
+import asyncio
+import hashlib
+import math
+import os
+import tempfile
+from typing import BinaryIO, List, Optional, Tuple
 
-import PyPDF2
 from fastapi import HTTPException, UploadFile
+from src.common.singleflight import SingleFlight
 from src.pdf.dto import PdfUploadResponse
+from src.pdf.workers import (
+    DocumentDeadline,
+    PdfExtractionTimeoutError,
+    PdfWorkerUnavailableError,
+    count_pages,
+    extract_pages,
+    get_pdf_worker_pool,
+)
+
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Smaller batches cost more in per-task PDF re-opening than they gain in parallelism
+MIN_PAGES_PER_BATCH = 10
+
+# Identical uploads (same bytes and page selection) in flight share one extraction
+_extractions: SingleFlight[PdfUploadResponse] = SingleFlight()
+
+
+def get_max_upload_size_mb() -> int:
+    """Maximum accepted PDF size in MB (MAX_UPLOAD_SIZE_MB, default 10)"""
+    return int(os.getenv("MAX_UPLOAD_SIZE_MB", "10"))
 
 
 class PdfProcessingService:
     """Service for processing PDF files"""
 
     @staticmethod
-    async def extract_text_from_pdf(file: UploadFile) -> PdfUploadResponse:
+    async def spool_upload(
+        file: UploadFile, max_size_mb: Optional[int] = None
+    ) -> Tuple[str, int, str]:
+        """
+        Copy an upload to a temporary file chunk by chunk
+
+        Memory use stays bounded by the chunk size however large the file
+        is, and the size limit is enforced as bytes are copied. The content
+        hash is computed in the same pass. The copy runs in a thread: the
+        upload's own spool and the new file are both blocking file I/O.
+
+        Args:
+            file: The uploaded file
+            max_size_mb: Maximum allowed file size in MB
+
+        Returns:
+            Tuple of (temporary file path, file size in bytes, SHA-256 hex digest)
+
+        Raises:
+            HTTPException: 413 if the file exceeds the size limit
+        """
+        max_bytes = (max_size_mb or get_max_upload_size_mb()) * 1024 * 1024
+        if file.size is not None and file.size > max_bytes:
+            # Known from the multipart parser: no need to copy anything
+            raise PdfProcessingService._too_large(max_bytes)
+        return await asyncio.to_thread(
+            PdfProcessingService._spool, file.file, max_bytes
+        )
+
+    @staticmethod
+    def _spool(source: BinaryIO, max_bytes: int) -> Tuple[str, int, str]:
+        """Blocking body of spool_upload"""
+        file_size = 0
+        digest = hashlib.sha256()
+
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        try:
+            with os.fdopen(fd, "wb") as spooled:
+                while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if file_size > max_bytes:
+                        raise PdfProcessingService._too_large(max_bytes)
+                    spooled.write(chunk)
+                    digest.update(chunk)
+        except BaseException:
+            os.remove(path)
+            raise
+
+        return path, file_size, digest.hexdigest()
+
+    @staticmethod
+    def _too_large(max_bytes: int) -> HTTPException:
+        return HTTPException(
+            status_code=413,
+            detail=f"File exceeds the {max_bytes // (1024 * 1024)}MB limit",
+        )
+
+    @staticmethod
+    def parse_page_ranges(pages: Optional[str], page_count: int) -> List[int]:
+        """
+        Parse a page selection such as "1-5,8" into zero-based page numbers
+
+        Args:
+            pages: Comma-separated 1-based pages or inclusive ranges; None selects all
+            page_count: Number of pages in the document
+
+        Returns:
+            Sorted, de-duplicated zero-based page numbers
+
+        Raises:
+            HTTPException: If the selection is malformed or out of range
+        """
+        if not pages or not pages.strip():
+            return list(range(page_count))
+
+        selected = set()
+        for part in pages.split(","):
+            part = part.strip()
+            try:
+                if "-" in part:
+                    start_text, end_text = part.split("-", 1)
+                    start = int(start_text) if start_text.strip() else 1
+                    end = int(end_text) if end_text.strip() else page_count
+                else:
+                    start = end = int(part)
+            except ValueError:
+                raise HTTPException(
+                    status_code=400, detail=f"Invalid page range: '{part}'"
+                )
+
+            if start < 1 or end > page_count or start > end:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Page range '{part}' is outside the document's {page_count} pages",
+                )
+            selected.update(range(start - 1, end))
+
+        return sorted(selected)
+
+    @staticmethod
+    async def extract_pages_parallel(
+        path: str,
+        page_numbers: List[int],
+        deadline: Optional[DocumentDeadline] = None,
+    ) -> List[str]:
+        """
+        Extract pages in batches spread across the worker pool
+
+        Args:
+            path: Path of the spooled PDF
+            page_numbers: Zero-based pages to extract, in order
+            deadline: The document's processing budget, shared by all batches
+
+        Returns:
+            Text of each requested page, in the same order
+        """
+        pool = get_pdf_worker_pool()
+        deadline = deadline or pool.new_deadline()
+        batch_size = max(
+            MIN_PAGES_PER_BATCH, math.ceil(len(page_numbers) / pool.processes)
+        )
+        batches = [
+            page_numbers[i : i + batch_size]
+            for i in range(0, len(page_numbers), batch_size)
+        ]
+
+        results = await asyncio.gather(
+            *(
+                pool.run(extract_pages, path, batch, deadline=deadline)
+                for batch in batches
+            )
+        )
+        return [page_text for batch_texts in results for page_text in batch_texts]
+
+    @staticmethod
+    async def extract_text_from_pdf(
+        file: UploadFile,
+        max_size_mb: Optional[int] = None,
+        pages: Optional[str] = None,
+    ) -> PdfUploadResponse:
         """
         Extract text from uploaded PDF file
 
+        Concurrent uploads of the same bytes with the same page selection
+        are parsed once: later callers wait for the extraction in flight.
+
         Args:
             file: The uploaded PDF file
+            max_size_mb: Maximum allowed file size in MB
+            pages: Optional page selection such as "1-5,8" (1-based, inclusive)
 
         Returns:
             PdfUploadResponse with extracted text and file info
@@ -26,20 +196,133 @@ class PdfProcessingService:
         Raises:
             HTTPException: If PDF processing fails
         """
+        path, file_size, digest = await PdfProcessingService.spool_pdf(
+            file, max_size_mb
+        )
+        return await PdfProcessingService.extract_spooled_pdf(
+            path, digest, file.filename, file_size, pages
+        )
+
+    @staticmethod
+    async def spool_pdf(
+        file: UploadFile, max_size_mb: Optional[int] = None
+    ) -> Tuple[str, int, str]:
+        """
+        Check that an upload is a PDF and copy it to a temporary file
+
+        The caller owns the returned file; extract_spooled_pdf removes it.
+
+        Args:
+            file: The uploaded PDF file
+            max_size_mb: Maximum allowed file size in MB
+
+        Returns:
+            Tuple of (temporary file path, file size in bytes, SHA-256 hex digest)
+
+        Raises:
+            HTTPException: 400 if the file is not a PDF, 413 if it is too large
+        """
         if not file.filename.endswith(".pdf"):
             raise HTTPException(status_code=400, detail="File must be a PDF")
 
         try:
-            # Read file contents
-            contents = await file.read()
-            file_size = len(contents)
+            # Stream the upload to disk; the worker parses straight from the file
+            return await PdfProcessingService.spool_upload(file, max_size_mb)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Error processing PDF: {str(e)}"
+            )
+
+    @staticmethod
+    async def extract_spooled_pdf(
+        path: str,
+        digest: str,
+        file_name: str,
+        file_size: int,
+        pages: Optional[str] = None,
+    ) -> PdfUploadResponse:
+        """
+        Extract text from a PDF written by spool_pdf, then remove the file
+
+        Args:
+            path: Path of the spooled PDF
+            digest: SHA-256 hex digest of the file
+            file_name: Original file name, reported in the response
+            file_size: File size in bytes
+            pages: Optional page selection such as "1-5,8" (1-based, inclusive)
+
+        Returns:
+            PdfUploadResponse with extracted text and file info
+
+        Raises:
+            HTTPException: If PDF processing fails
+        """
+        try:
+            key = f"{digest}:{pages or ''}"
+            flight_path = None
+            if key not in _extractions:
+                # The flight parses this copy and removes it when done, even
+                # if this caller disconnects while others are waiting
+                flight_path, path = path, None
 
-            # Extract text using PyPDF2
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(contents))
+            result = await _extractions.do(
+                key,
+                lambda: PdfProcessingService._extract_spooled(
+                    flight_path, pages, file_name, file_size
+                ),
+            )
+            # Shared text, this caller's file name
+            return result.model_copy(
+                update={"file_name": file_name, "file_size": file_size}
+            )
 
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
+        except HTTPException:
+            # Re-raise HTTP exceptions as-is
+            raise
+        except PdfExtractionTimeoutError as e:
+            raise HTTPException(
+                status_code=422, detail=f"PDF is too complex to process: {str(e)}"
+            )
+        except PdfWorkerUnavailableError:
+            raise HTTPException(
+                status_code=503,
+                detail="PDF processing is temporarily unavailable. Please try again.",
+                headers={"Retry-After": "5"},
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Error processing PDF: {str(e)}"
+            )
+        finally:
+            if path is not None:
+                os.remove(path)
+
+    @staticmethod
+    def discard_spooled_pdf(path: str) -> None:
+        """Remove a spooled PDF that will not be extracted"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    async def _extract_spooled(
+        path: str, pages: Optional[str], file_name: str, file_size: int
+    ) -> PdfUploadResponse:
+        """Extract the selected pages of a spooled PDF, then remove the file"""
+        try:
+            # Extract the selected pages with PyPDF2 across worker processes
+            # One timeout for the whole document, not one per task
+            pool = get_pdf_worker_pool()
+            deadline = pool.new_deadline()
+            page_count = await pool.run(count_pages, path, deadline=deadline)
+            page_numbers = PdfProcessingService.parse_page_ranges(pages, page_count)
+            page_texts = await PdfProcessingService.extract_pages_parallel(
+                path, page_numbers, deadline
+            )
+            text = "\n".join(page_texts)
 
             if not text.strip():
                 raise HTTPException(
@@ -50,17 +333,13 @@ class PdfProcessingService:
             return PdfUploadResponse(
                 success=True,
                 text_extracted=text,
-                file_name=file.filename,
+                file_name=file_name,
                 file_size=file_size,
+                page_count=page_count,
+                page_texts=page_texts,
             )
-
-        except HTTPException:
-            # Re-raise HTTP exceptions as-is
-            raise
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, detail=f"Error processing PDF: {str(e)}"
-            )
+        finally:
+            os.remove(path)
 
     @staticmethod
     def validate_pdf_file(file: UploadFile, max_size_mb: int = 10) -> Optional[str]:
@@ -80,7 +359,7 @@ class PdfProcessingService:
         if not file.filename.endswith(".pdf"):
             return "File must be a PDF"
 
-        # Note: FastAPI doesn't provide file size directly for UploadFile
-        # Size validation would need to be done after reading the file
+        # Size is enforced with a 413 while the body streams in
+        # (UploadSizeLimitMiddleware) and again while spooling (spool_upload)
 
         return None
@@ -0,0 +1,290 @@
+"""
+PDF workers - Process pool for CPU-bound PDF parsing
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+import PyPDF2
+
+# Spawned workers do not inherit the event loop, threads or sockets of the API
+_mp_context = multiprocessing.get_context("spawn")
+
+
+class PdfExtractionTimeoutError(Exception):
+    """Raised when a document takes longer than the per-document timeout"""
+
+
+class PdfWorkerUnavailableError(Exception):
+    """Raised when no worker process can be started for a task"""
+
+
+# Worker functions below hand PyPDF2 an open file: given a path it would
+# read the whole file into a BytesIO first
+
+
+def count_pages(path: str) -> int:
+    """Number of pages in a PDF (runs inside a worker process)"""
+    with open(path, "rb") as fh:
+        return len(PyPDF2.PdfReader(fh).pages)
+
+
+def extract_pages(path: str, page_numbers: List[int]) -> List[str]:
+    """Extract the text of the given zero-based pages (runs inside a worker process)"""
+    with open(path, "rb") as fh:
+        pdf_reader = PyPDF2.PdfReader(fh)
+        return [pdf_reader.pages[number].extract_text() for number in page_numbers]
+
+
+class DocumentDeadline:
+    """
+    Processing time budget shared by every task of one document
+
+    The clock only runs while at least one of the document's tasks is on a
+    worker: time spent queued behind other uploads is free, while page
+    counting and every page batch draw from the same budget.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self._spent = 0.0
+        self._running = 0
+        self._since = 0.0
+
+    def remaining(self) -> float:
+        """Seconds left in the budget"""
+        spent = self._spent
+        if self._running:
+            spent += time.monotonic() - self._since
+        return self.seconds - spent
+
+    def task_started(self) -> None:
+        if self._running == 0:
+            self._since = time.monotonic()
+        self._running += 1
+
+    def task_finished(self) -> None:
+        self._running -= 1
+        if self._running == 0:
+            self._spent += time.monotonic() - self._since
+
+
+class _WorkerTimeout(Exception):
+    """The worker did not answer within the task's remaining budget"""
+
+
+def _worker_main(conn) -> None:
+    """Worker process loop: run (function, args) messages until told to stop"""
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        function, args = message
+        try:
+            outcome = (True, function(*args))
+        except Exception as e:
+            outcome = (False, e)
+        try:
+            conn.send(outcome)
+        except Exception as e:
+            # Unpicklable result or exception
+            conn.send((False, RuntimeError(f"PDF worker failed: {e!r}")))
+
+
+class _Worker:
+    """One worker process and the pipe it is driven through"""
+
+    def __init__(self):
+        self.conn, child_conn = _mp_context.Pipe()
+        try:
+            self.process = _mp_context.Process(
+                target=_worker_main, args=(child_conn,), daemon=True
+            )
+            self.process.start()
+        except BaseException:
+            self.conn.close()
+            raise
+        finally:
+            child_conn.close()
+
+    def call(self, function: Callable, args: tuple, timeout: float) -> Tuple[bool, Any]:
+        """Run a task and wait for its outcome (blocking; runs in a thread)"""
+        self.conn.send((function, args))
+        if not self.conn.poll(timeout):
+            raise _WorkerTimeout()
+        return self.conn.recv()
+
+    def kill(self) -> None:
+        """Stop the process at once; a runaway parser cannot be interrupted"""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class PdfWorkerPool:
+    """
+    Worker processes that run PDF parsing off the event loop
+
+    Each worker is fed by its own dispatcher, which takes the next queued
+    task, hands it to the worker and waits for the result for no longer
+    than the task's document has left of its timeout (see DocumentDeadline).
+    A task that runs out of time has its worker killed and replaced -
+    the only reliable way to stop a runaway parser - so only that document
+    fails and every other upload keeps its worker and its budget.
+    """
+
+    def __init__(self, processes: int = 2, timeout: float = 30.0):
+        self.processes = processes
+        self.timeout = timeout
+        self._workers: List[Optional[_Worker]] = [None] * processes
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self.restarts = 0
+
+    def start(self) -> None:
+        """Spawn the worker processes ahead of the first request"""
+        for index in range(self.processes):
+            if self._workers[index] is None:
+                self._workers[index] = _Worker()
+
+    def _start_dispatchers(self) -> asyncio.Queue:
+        # Dispatchers are created on first use, inside the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._dispatchers = [
+                asyncio.create_task(self._dispatch(index))
+                for index in range(self.processes)
+            ]
+        return self._queue
+
+    def new_deadline(self) -> DocumentDeadline:
+        """A fresh per-document budget of ``timeout`` seconds"""
+        return DocumentDeadline(self.timeout)
+
+    async def run(
+        self,
+        function: Callable,
+        *args: Any,
+        deadline: Optional[DocumentDeadline] = None,
+    ) -> Any:
+        """
+        Run a picklable function in a worker process
+
+        Args:
+            function: Module-level function to run
+            *args: Picklable arguments
+            deadline: Budget of the document this task belongs to; pass the
+                same one to every task of a document (defaults to a budget
+                for this task alone)
+
+        Raises:
+            PdfExtractionTimeoutError: If the document's budget runs out
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._start_dispatchers().put_nowait(
+            (function, args, deadline or self.new_deadline(), future)
+        )
+        return await future
+
+    async def _dispatch(self, index: int) -> None:
+        while True:
+            function, args, deadline, future = await self._queue.get()
+            # The caller went away while the task was queued
+            if future.done():
+                continue
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                future.set_exception(self._timeout_error())
+                continue
+
+            if self._workers[index] is None:
+                try:
+                    self._workers[index] = await asyncio.to_thread(_Worker)
+                except Exception as e:
+                    # Process or memory limits: fail this task, keep serving
+                    # the queue so later tasks can try a fresh spawn
+                    if not future.done():
+                        future.set_exception(
+                            PdfWorkerUnavailableError(
+                                f"Could not start a PDF worker: {e!r}"
+                            )
+                        )
+                    continue
+            worker = self._workers[index]
+            deadline.task_started()
+            try:
+                ok, value = await asyncio.to_thread(
+                    worker.call, function, args, remaining
+                )
+            except _WorkerTimeout:
+                await self._replace(index)
+                ok, value = False, self._timeout_error()
+            except (EOFError, OSError) as e:
+                # The worker died (out of memory, crashed native code)
+                await self._replace(index)
+                ok, value = (
+                    False,
+                    RuntimeError(f"PDF worker exited unexpectedly: {e!r}"),
+                )
+            finally:
+                deadline.task_finished()
+
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    async def _replace(self, index: int) -> None:
+        """Kill one worker; a fresh one is spawned for its next task"""
+        worker, self._workers[index] = self._workers[index], None
+        self.restarts += 1
+        if worker is not None:
+            await asyncio.to_thread(worker.kill)
+
+    def _timeout_error(self) -> PdfExtractionTimeoutError:
+        return PdfExtractionTimeoutError(
+            f"PDF processing exceeded {self.timeout:.0f} seconds"
+        )
+
+    def close(self) -> None:
+        """Stop the dispatchers and terminate the worker processes"""
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        self._dispatchers = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                *_, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(
+                        RuntimeError("Server shut down before the PDF was processed")
+                    )
+            self._queue = None
+        for index, worker in enumerate(self._workers):
+            if worker is not None:
+                worker.kill()
+                self._workers[index] = None
+
+
+# Global singleton instance - one worker pool per API process
+_pdf_worker_pool: Optional[PdfWorkerPool] = None
+
+
+def get_pdf_worker_pool() -> PdfWorkerPool:
+    """Shared PdfWorkerPool configured from environment"""
+    global _pdf_worker_pool
+    if _pdf_worker_pool is None:
+        _pdf_worker_pool = PdfWorkerPool(
+            processes=int(
+                os.getenv("PDF_WORKER_PROCESSES", str(min(4, os.cpu_count() or 1)))
+            ),
+            timeout=float(os.getenv("PDF_EXTRACTION_TIMEOUT_SECONDS", "30")),
+        )
+    return _pdf_worker_pool
@@ -2,18 +2,36 @@
 Quiz API endpoints - Route handlers for quiz operations
 """
 
-from typing import Optional
-
-from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+import itertools
+import json
+from typing import Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    UploadFile,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
+from src.common.sse import DONE_SENTINEL, HEARTBEAT, format_event
 from src.pdf.services import PdfProcessingService
 from src.quiz.dto import (
     AnswerRequest,
     AnswerResponse,
+    ExplanationCacheStats,
+    GenerationCacheStats,
+    GradeQuizRequest,
+    GradeQuizResponse,
     QuestionAnswer,
     QuestionUpdateRequest,
+    QuizJobStatus,
     QuizResponse,
+    SessionStoreStats,
 )
+from src.quiz.jobs import QuizJobQueue, get_quiz_job_queue
 from src.quiz.services import (
     QuizGenerationService,
     QuizManagementService,
@@ -24,52 +42,166 @@ from src.quiz.services import (
 # Create Quiz router
 quiz_router = APIRouter(prefix="/quiz", tags=["Quiz"])
 
+# Event streams for job status and generation share these response headers
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Stop reverse proxies from buffering the event stream
+    "X-Accel-Buffering": "no",
+}
 
 
-@quiz_router.post("/upload-pdf", response_model=QuizResponse)
+@quiz_router.post(
+    "/upload-pdf",
+    response_model=QuizResponse,
+    responses={202: {"model": QuizJobStatus, "description": "Generation queued"}},
+)
 async def upload_pdf_and_generate_quiz(
     file: UploadFile = File(...),
     x_session_id: Optional[str] = Header(default="default"),
+    force_regenerate: bool = Query(
+        default=False, description="Ignore cached quizzes and generate a new one"
+    ),
+    pages: Optional[str] = Query(
+        default=None, description="Pages to quiz on, e.g. '1-5,8' (default: all)"
+    ),
+    mode: Optional[Literal["single", "chunked", "auto"]] = Query(
+        default=None,
+        description="Generation mode: 'chunked' draws questions from the whole document",
+    ),
+    background: bool = Query(
+        default=False,
+        description="Queue generation and return a job id immediately (202)",
+    ),
     quiz_generation_service: QuizGenerationService = Depends(
         get_quiz_generation_service
     ),
     quiz_management_service: QuizManagementService = Depends(
         get_quiz_management_service
     ),
+    quiz_job_queue: QuizJobQueue = Depends(get_quiz_job_queue),
 ):
     """
     Upload PDF and generate quiz questions
 
+    In background mode the request only copies the upload to disk; text
+    extraction and generation run in a queued job that is polled at
+    ``/quiz/jobs/{id}`` or followed at ``/quiz/jobs/{id}/events``, and
+    extraction errors (such as an unreadable PDF or a bad page selection)
+    are reported as the job's failure detail.
+
     Args:
         file: The uploaded PDF file
+        force_regenerate: Bypass the generation cache
+        pages: Optional 1-based page selection
+        mode: Generation mode (defaults to QUIZ_GENERATION_MODE)
+        background: Return a queued job instead of waiting for the quiz
         quiz_generation_service: Injected quiz generation service
         quiz_management_service: Injected quiz management service
+        quiz_job_queue: Injected generation job queue
 
     Returns:
-        QuizResponse with generated questions
+        QuizResponse with generated questions, or the queued job's status
 
     Raises:
-        HTTPException: If PDF processing or question generation fails
+        HTTPException: If PDF processing or question generation fails, or
+            the job queue is full
     """
     try:
-        # Extract text from PDF
-        pdf_result = await PdfProcessingService.extract_text_from_pdf(file)
-
         # Use PDF filename as quiz title
         quiz_title = file.filename or "Generated Quiz"
+        session_id = x_session_id or "default"
 
-        # Generate questions from extracted text
-        questions = await quiz_generation_service.generate_questions_from_text(
-            pdf_result.text_extracted
-        )
+        # Copy the upload to disk while the request body is still available
+        path, file_size, digest = await PdfProcessingService.spool_pdf(file)
+        file_name = file.filename
 
-        # Store questions for later reference with session ID
-        quiz_management_service.store_questions(
-            questions, x_session_id or "default", quiz_title
+        async def generate() -> QuizResponse:
+            # Extract text from PDF
+            pdf_result = await PdfProcessingService.extract_spooled_pdf(
+                path, digest, file_name, file_size, pages=pages
+            )
+
+            # Generate questions from extracted text
+            questions = await quiz_generation_service.generate_questions_from_text(
+                pdf_result.text_extracted, force_regenerate=force_regenerate, mode=mode
+            )
+
+            # Store questions for later reference with session ID
+            await quiz_management_service.store_questions(
+                questions, session_id, quiz_title
+            )
+            # Pre-generate distractor explanations once the response is sent
+            quiz_management_service.schedule_explanation_prewarm(questions, session_id)
+
+            return QuizResponse(quiz_title=quiz_title, questions=questions)
+
+        if background:
+            try:
+                job = quiz_job_queue.submit(quiz_title, session_id, generate)
+            except HTTPException:
+                PdfProcessingService.discard_spooled_pdf(path)
+                raise
+            return JSONResponse(
+                status_code=202,
+                content=job.to_status().model_dump(),
+                headers={"Location": f"/quiz/jobs/{job.job_id}"},
+            )
+
+        return await generate()
+
+    except HTTPException:
+        # Re-raise HTTP exceptions as-is
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Unexpected error generating quiz: {str(e)}"
         )
 
-        return QuizResponse(quiz_title=quiz_title, questions=questions)
 
+@quiz_router.post("/upload-pdf/stream")
+async def upload_pdf_and_stream_quiz(
+    file: UploadFile = File(...),
+    x_session_id: Optional[str] = Header(default="default"),
+    force_regenerate: bool = Query(
+        default=False, description="Ignore cached quizzes and generate a new one"
+    ),
+    pages: Optional[str] = Query(
+        default=None, description="Pages to quiz on, e.g. '1-5,8' (default: all)"
+    ),
+    quiz_generation_service: QuizGenerationService = Depends(
+        get_quiz_generation_service
+    ),
+    quiz_management_service: QuizManagementService = Depends(
+        get_quiz_management_service
+    ),
+):
+    """
+    Upload PDF and stream quiz questions as they are generated
+
+    Server-Sent Events: ``quiz`` with the title, one ``question`` per
+    generated question, then ``done``, or ``error`` if generation fails
+    midway. PDF errors are returned as regular HTTP errors before the
+    stream starts.
+
+    Args:
+        file: The uploaded PDF file
+        x_session_id: Session ID from header
+        force_regenerate: Bypass the generation cache
+        pages: Optional 1-based page selection
+        quiz_generation_service: Injected quiz generation service
+        quiz_management_service: Injected quiz management service
+
+    Returns:
+        StreamingResponse of quiz events
+
+    Raises:
+        HTTPException: If PDF processing fails
+    """
+    try:
+        pdf_result = await PdfProcessingService.extract_text_from_pdf(
+            file, pages=pages
+        )
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
@@ -78,6 +210,182 @@ async def upload_pdf_and_generate_quiz(
             status_code=500, detail=f"Unexpected error generating quiz: {str(e)}"
         )
 
+    quiz_title = file.filename or "Generated Quiz"
+    session_id = x_session_id or "default"
+
+    async def generate_events():
+        event_ids = itertools.count(1)
+        yield format_event(
+            json.dumps({"quiz_title": quiz_title}),
+            event="quiz",
+            event_id=next(event_ids),
+        )
+
+        questions = []
+        try:
+            async for question in quiz_generation_service.stream_questions_from_text(
+                pdf_result.text_extracted, force_regenerate=force_regenerate
+            ):
+                questions.append(question)
+                yield format_event(
+                    question.model_dump_json(),
+                    event="question",
+                    event_id=next(event_ids),
+                )
+        except HTTPException as e:
+            yield format_event(
+                json.dumps({"detail": e.detail}), event="error", event_id=next(event_ids)
+            )
+            return
+        except Exception as e:
+            detail = f"Unexpected error generating quiz: {str(e)}"
+            yield format_event(
+                json.dumps({"detail": detail}), event="error", event_id=next(event_ids)
+            )
+            return
+
+        await quiz_management_service.store_questions(
+            questions, session_id, quiz_title
+        )
+        quiz_management_service.schedule_explanation_prewarm(questions, session_id)
+        yield format_event(DONE_SENTINEL, event="done", event_id=next(event_ids))
+
+    return StreamingResponse(
+        generate_events(), media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
+@quiz_router.get("/jobs/{job_id}", response_model=QuizJobStatus)
+async def get_quiz_job(
+    job_id: str,
+    quiz_job_queue: QuizJobQueue = Depends(get_quiz_job_queue),
+):
+    """
+    Poll a background quiz generation job
+
+    Args:
+        job_id: Job id returned by a background upload
+        quiz_job_queue: Injected generation job queue
+
+    Returns:
+        QuizJobStatus, with the quiz once the job has succeeded
+
+    Raises:
+        HTTPException: 404 if the job is unknown or has expired
+    """
+    job = quiz_job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_status()
+
+
+@quiz_router.get("/jobs/{job_id}/events")
+async def stream_quiz_job(
+    job_id: str,
+    quiz_job_queue: QuizJobQueue = Depends(get_quiz_job_queue),
+    quiz_management_service: QuizManagementService = Depends(
+        get_quiz_management_service
+    ),
+):
+    """
+    Follow a background quiz generation job
+
+    Server-Sent Events: a ``status`` event with the current QuizJobStatus
+    and one more on every state change, then ``done`` once the job has
+    succeeded or failed.
+
+    Args:
+        job_id: Job id returned by a background upload
+        quiz_job_queue: Injected generation job queue
+        quiz_management_service: Injected quiz management service
+
+    Returns:
+        StreamingResponse of job status events
+
+    Raises:
+        HTTPException: 404 if the job is unknown or has expired
+    """
+    job = quiz_job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    heartbeat_seconds = quiz_management_service.sse_heartbeat_seconds
+
+    async def job_events():
+        event_ids = itertools.count(1)
+        while True:
+            version = job.version
+            yield format_event(
+                job.to_status().model_dump_json(),
+                event="status",
+                event_id=next(event_ids),
+            )
+            if job.finished:
+                break
+            while not await job.wait_for_change(version, heartbeat_seconds):
+                yield HEARTBEAT
+        yield format_event(DONE_SENTINEL, event="done", event_id=next(event_ids))
+
+    return StreamingResponse(
+        job_events(), media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
+@quiz_router.get("/cache/stats", response_model=GenerationCacheStats)
+async def get_generation_cache_stats(
+    quiz_generation_service: QuizGenerationService = Depends(
+        get_quiz_generation_service
+    ),
+):
+    """
+    Report quiz generation cache hit/miss counts and occupancy
+
+    Args:
+        quiz_generation_service: Injected quiz generation service
+
+    Returns:
+        GenerationCacheStats for the memory and disk tiers
+    """
+    stats = quiz_generation_service.cache.stats()
+    stats.coalesced = quiz_generation_service.generations.joined
+    return stats
+
+
+@quiz_router.get("/explanations/stats", response_model=ExplanationCacheStats)
+async def get_explanation_cache_stats(
+    quiz_management_service: QuizManagementService = Depends(
+        get_quiz_management_service
+    ),
+):
+    """
+    Report wrong-answer explanation cache effectiveness
+
+    Args:
+        quiz_management_service: Injected quiz management service
+
+    Returns:
+        ExplanationCacheStats for this worker's explanation cache
+    """
+    return quiz_management_service.explanations.stats()
+
+
+@quiz_router.get("/sessions/stats", response_model=SessionStoreStats)
+async def get_session_store_stats(
+    quiz_management_service: QuizManagementService = Depends(
+        get_quiz_management_service
+    ),
+):
+    """
+    Report session store occupancy, eviction and expiry counts
+
+    Args:
+        quiz_management_service: Injected quiz management service
+
+    Returns:
+        SessionStoreStats for this worker's session store
+    """
+    return await quiz_management_service.sessions.stats()
+
 
 @quiz_router.put("/questions/{question_id}", response_model=QuestionAnswer)
 async def update_question(
@@ -110,7 +418,7 @@ async def update_question(
                 detail="Question ID in URL must match ID in request body",
             )
 
-        updated_question = quiz_management_service.update_question(
+        updated_question = await quiz_management_service.update_question(
             question_update, x_session_id or "default"
         )
         return updated_question
@@ -127,6 +435,7 @@ async def update_question(
 @quiz_router.post("/check-answer", response_model=AnswerResponse)
 async def check_answer(
     answer_request: AnswerRequest,
+    x_session_id: Optional[str] = Header(default="default"),
     quiz_management_service: QuizManagementService = Depends(
         get_quiz_management_service
     ),
@@ -135,7 +444,9 @@ async def check_answer(
     Check if the provided answer is correct
 
     Args:
-        answer_request: The answer to check
+        answer_request: The answer to check; omit ``questions`` to use the
+            quiz stored for the session
+        x_session_id: Session ID from header
         quiz_management_service: Injected quiz management service
 
     Returns:
@@ -145,7 +456,9 @@ async def check_answer(
         HTTPException: If question not found or answer checking fails
     """
     try:
-        result = quiz_management_service.check_answer(answer_request)
+        result = await quiz_management_service.check_answer(
+            answer_request, x_session_id or "default"
+        )
         return result
 
     except HTTPException:
@@ -157,9 +470,47 @@ async def check_answer(
         )
 
 
+@quiz_router.post("/grade", response_model=GradeQuizResponse)
+async def grade_quiz(
+    grade_request: GradeQuizRequest,
+    x_session_id: Optional[str] = Header(default="default"),
+    quiz_management_service: QuizManagementService = Depends(
+        get_quiz_management_service
+    ),
+):
+    """
+    Grade all answers of a quiz submission in a single request
+
+    Args:
+        grade_request: The answers to grade; omit ``questions`` to use the
+            quiz stored for the session
+        x_session_id: Session ID from header
+        quiz_management_service: Injected quiz management service
+
+    Returns:
+        GradeQuizResponse with per-question results and the overall score
+
+    Raises:
+        HTTPException: If the session or a question is not found or grading fails
+    """
+    try:
+        return await quiz_management_service.grade_quiz(
+            grade_request, x_session_id or "default"
+        )
+
+    except HTTPException:
+        # Re-raise HTTP exceptions as-is
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Unexpected error grading quiz: {str(e)}"
+        )
+
+
 @quiz_router.post("/check-answer-stream")
 async def check_answer_stream(
     answer_request: AnswerRequest,
+    x_session_id: Optional[str] = Header(default="default"),
     quiz_management_service: QuizManagementService = Depends(
         get_quiz_management_service
     ),
@@ -168,7 +519,9 @@ async def check_answer_stream(
     Check answer and provide streaming feedback for incorrect answers
 
     Args:
-        answer_request: The answer to check
+        answer_request: The answer to check; omit ``questions`` to use the
+            quiz stored for the session
+        x_session_id: Session ID from header
         quiz_management_service: Injected quiz management service
 
     Returns:
@@ -178,19 +531,22 @@ async def check_answer_stream(
         HTTPException: If question not found or streaming fails
     """
     try:
-
-        async def generate_feedback():
-            async for chunk in quiz_management_service.get_streaming_feedback(
-                answer_request
-            ):
-                yield chunk
+        # Resolve before the 200 is sent, so an unknown question is a 404
+        session_id = x_session_id or "default"
+        question, answer_key = await quiz_management_service.resolve_answer(
+            answer_request, session_id
+        )
 
         return StreamingResponse(
-            generate_feedback(),
-            media_type="text/plain",
+            quiz_management_service.get_streaming_feedback(
+                question, answer_key, answer_request.user_answer
+            ),
+            media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
+                # Stop reverse proxies from buffering the event stream
+                "X-Accel-Buffering": "no",
                 "Access-Control-Allow-Origin": "*",
                 "Access-Control-Allow-Headers": "*",
             },
@@ -0,0 +1,127 @@
+"""
+Quiz generation cache - Content-addressed cache for generated quizzes
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from typing import List, Optional
+
+from src.common.cache import DiskCache, LRUCache
+from src.quiz.dto import GenerationCacheStats, QuestionAnswer
+
+logger = logging.getLogger(__name__)
+
+
+class QuizGenerationCache:
+    """
+    Two-tier cache of generated quizzes keyed by content hash
+
+    A small in-memory LRU sits in front of a size-bounded disk tier, so
+    repeat uploads of the same document skip the LLM entirely and survive
+    process restarts. Disk I/O runs in a worker thread to keep the event
+    loop free.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 100 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        memory_entries: int = 128,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._memory: LRUCache[List[dict]] = LRUCache(
+            max_entries=memory_entries, ttl_seconds=ttl_seconds
+        )
+        self._disk = (
+            DiskCache(directory, max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+            if enabled
+            else None
+        )
+
+    @staticmethod
+    def make_key(
+        text: str, num_questions: int, model: str, prompt_version: str
+    ) -> str:
+        """Hash of everything that determines the generated quiz"""
+        digest = hashlib.sha256()
+        digest.update(f"{prompt_version}\0{model}\0{num_questions}\0".encode("utf-8"))
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[List[QuestionAnswer]]:
+        """Look up a quiz in memory first, then on disk"""
+        if not self.enabled:
+            return None
+
+        data = self._memory.get(key)
+        if data is None and self._disk is not None:
+            data = await asyncio.to_thread(self._disk.get, key)
+            if data is not None:
+                self._memory.set(key, data)
+
+        if data is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        # Fresh models per caller so edits never leak into the cache
+        return [QuestionAnswer(**q) for q in data]
+
+    async def set(self, key: str, questions: List[QuestionAnswer]) -> None:
+        """
+        Store a generated quiz in both tiers
+
+        Best effort: a failed disk write (full disk, permissions) is logged
+        and the quiz stays in the memory tier, so an already generated quiz
+        is never turned into an error.
+        """
+        if not self.enabled:
+            return
+
+        data = [q.model_dump() for q in questions]
+        self._memory.set(key, data)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.set, key, data)
+            except OSError as e:
+                logger.warning("Quiz cache disk write failed: %s", e)
+
+    def stats(self) -> GenerationCacheStats:
+        """Hit/miss counters and per-tier occupancy"""
+        lookups = self.hits + self.misses
+        return GenerationCacheStats(
+            enabled=self.enabled,
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / lookups if lookups else 0.0,
+            memory=self._memory.stats(),
+            disk=self._disk.stats() if self._disk is not None else {},
+        )
+
+
+# Global singleton instance
+_quiz_generation_cache: Optional[QuizGenerationCache] = None
+
+
+def get_quiz_generation_cache() -> QuizGenerationCache:
+    """Dependency for QuizGenerationCache - configured from environment"""
+    global _quiz_generation_cache
+    if _quiz_generation_cache is None:
+        _quiz_generation_cache = QuizGenerationCache(
+            directory=os.getenv(
+                "QUIZ_CACHE_DIR",
+                os.path.join(tempfile.gettempdir(), "quiz-generator-cache"),
+            ),
+            max_bytes=int(float(os.getenv("QUIZ_CACHE_MAX_MB", "100")) * 1024 * 1024),
+            ttl_seconds=float(os.getenv("QUIZ_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+            memory_entries=int(os.getenv("QUIZ_CACHE_MEMORY_ENTRIES", "128")),
+            enabled=os.getenv("QUIZ_CACHE_ENABLED", "true").lower() == "true",
+        )
+    return _quiz_generation_cache
@@ -0,0 +1,115 @@
+"""
+Near-duplicate detection - MinHash/LSH index over generated questions
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import DefaultDict, List, Set, Tuple
+
+import numpy as np
+
+from src.quiz.passages import STOP_WORDS
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SHORT_STOP_WORDS = frozenset("a an as at be by in is it of on or to".split())
+# Mersenne prime 2^31 - 1 keeps (a * x + b) inside uint64 for 32-bit hashes
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def shingles(text: str) -> Set[str]:
+    """
+    Content words plus word bigrams of the normalized text
+
+    Stop words are dropped and a plural "s" is stripped, so rewordings such
+    as "in a plant" / "in plants" share most shingles while questions that
+    differ in their key term do not.
+    """
+    words = [
+        word[:-1] if len(word) > 3 and word.endswith("s") else word
+        for word in _WORD.findall(text.lower())
+        if word not in STOP_WORDS and word not in _SHORT_STOP_WORDS
+    ]
+    bigrams = {f"{first} {second}" for first, second in zip(words, words[1:])}
+    return set(words) | bigrams
+
+
+class NearDuplicateIndex:
+    """
+    Index that flags texts whose shingle sets nearly overlap
+
+    Each text is reduced to a MinHash signature; signatures are split into
+    LSH bands so only texts sharing a band bucket are compared. Adding and
+    checking are O(signature) on average, making deduplication of a batch
+    near-linear instead of all-pairs.
+    """
+
+    def __init__(
+        self,
+        num_permutations: int = 64,
+        bands: int = 32,
+        threshold: float = 0.6,
+        seed: int = 1,
+    ):
+        if num_permutations % bands:
+            raise ValueError("num_permutations must be divisible by bands")
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), num_permutations, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), num_permutations, dtype=np.uint64)
+        self.bands = bands
+        self.rows = num_permutations // bands
+        self.threshold = threshold
+        self._signatures: List[np.ndarray] = []
+        self._buckets: DefaultDict[Tuple[int, bytes], List[int]] = defaultdict(list)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of the text's shingles"""
+        hashed = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles(text) or {text}),
+            dtype=np.uint64,
+        )
+        hashed %= _PRIME
+        permuted = (self._a[:, None] * hashed[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def is_duplicate(self, text: str) -> bool:
+        """Whether the text nearly duplicates one already in the index"""
+        return self._find_duplicate(self.signature(text))
+
+    def _find_duplicate(self, signature: np.ndarray) -> bool:
+        candidates = {
+            index
+            for key in self._band_keys(signature)
+            for index in self._buckets.get(key, ())
+        }
+        if not candidates:
+            return False
+
+        # Fraction of agreeing MinHash rows estimates Jaccard similarity
+        stacked = np.stack([self._signatures[index] for index in candidates])
+        agreement = (stacked == signature).mean(axis=1)
+        return bool((agreement >= self.threshold).any())
+
+    def add(self, text: str) -> bool:
+        """
+        Add a text unless it nearly duplicates an indexed one
+
+        Returns:
+            True if the text was added, False if it was a near-duplicate
+        """
+        signature = self.signature(text)
+        if self._find_duplicate(signature):
+            return False
+
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        for key in self._band_keys(signature):
+            self._buckets[key].append(position)
+        return True
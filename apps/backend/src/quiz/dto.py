@@ -2,7 +2,7 @@
 Quiz-related Data Transfer Objects (DTOs)
 """
 
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -31,13 +31,32 @@ class QuizResponse(BaseModel):
     )
 
 
+class QuizJobStatus(BaseModel):
+    """DTO for the state of a background quiz generation job"""
+
+    job_id: str = Field(..., description="Job identifier")
+    status: Literal["queued", "running", "succeeded", "failed"] = Field(
+        ..., description="Current job state"
+    )
+    quiz_title: str = Field(..., description="Title of the quiz, from the PDF filename")
+    created_at: float = Field(..., description="Submission time (Unix seconds)")
+    started_at: Optional[float] = Field(None, description="Time generation started")
+    finished_at: Optional[float] = Field(None, description="Time the job finished")
+    detail: Optional[str] = Field(None, description="Error message of a failed job")
+    result: Optional[QuizResponse] = Field(
+        None, description="Generated quiz once the job has succeeded"
+    )
+
+
 class AnswerRequest(BaseModel):
     """DTO for submitting an answer to a question"""
 
     question_id: str = Field(..., description="ID of the question being answered")
     user_answer: str = Field(..., description="User's submitted answer")
-    questions: List[QuestionAnswer] = Field(
-        ..., description="The full list of questions for context"
+    questions: Optional[List[QuestionAnswer]] = Field(
+        None,
+        description="Full list of questions for stateless clients; "
+        "omit to use the quiz stored for the session",
     )
 
 
@@ -49,6 +68,42 @@ class AnswerResponse(BaseModel):
     explanation: Optional[str] = Field(None, description="Explanation of the answer")
 
 
+class SubmittedAnswer(BaseModel):
+    """DTO for one answer in a whole-quiz submission"""
+
+    question_id: str = Field(..., description="ID of the question being answered")
+    user_answer: str = Field(..., description="User's submitted answer")
+
+
+class GradeQuizRequest(BaseModel):
+    """DTO for grading all answers of a quiz at once"""
+
+    answers: List[SubmittedAnswer] = Field(..., description="Answers to grade")
+    questions: Optional[List[QuestionAnswer]] = Field(
+        None,
+        description="Full list of questions for stateless clients; "
+        "omit to use the quiz stored for the session",
+    )
+
+
+class GradedAnswer(AnswerResponse):
+    """DTO for the result of one graded answer"""
+
+    question_id: str = Field(..., description="ID of the graded question")
+
+
+class GradeQuizResponse(BaseModel):
+    """DTO for whole-quiz grading results"""
+
+    results: List[GradedAnswer] = Field(..., description="Per-question results")
+    correct_count: int = Field(..., description="Number of correct answers")
+    answered_count: int = Field(..., description="Number of graded answers")
+    total_questions: int = Field(..., description="Number of questions in the quiz")
+    score: float = Field(
+        ..., description="Fraction of the quiz's questions answered correctly"
+    )
+
+
 class QuestionUpdateRequest(BaseModel):
     """DTO for updating a question"""
 
@@ -58,3 +113,45 @@ class QuestionUpdateRequest(BaseModel):
     options: Optional[List[str]] = Field(
         None, description="Updated multiple choice options"
     )
+
+
+class GenerationCacheStats(BaseModel):
+    """DTO for quiz generation cache statistics"""
+
+    enabled: bool = Field(..., description="Whether the generation cache is enabled")
+    hits: int = Field(..., description="Lookups served from the cache")
+    misses: int = Field(..., description="Lookups that required a fresh generation")
+    hit_rate: float = Field(..., description="Fraction of lookups served from the cache")
+    memory: Dict[str, int] = Field(..., description="In-memory tier counters")
+    disk: Dict[str, int] = Field(..., description="Disk tier counters")
+    coalesced: int = Field(
+        0, description="Generations that joined an identical one already in flight"
+    )
+
+
+class ExplanationCacheStats(BaseModel):
+    """DTO for wrong-answer explanation cache statistics"""
+
+    enabled: bool = Field(..., description="Whether the explanation cache is enabled")
+    hits: int = Field(..., description="Explanations replayed from the cache")
+    misses: int = Field(..., description="Explanations that required an LLM call")
+    hit_rate: float = Field(..., description="Fraction of lookups served from the cache")
+    questions: int = Field(..., description="Questions with cached explanations")
+    evictions: int = Field(..., description="Questions evicted by the LRU cap")
+    expirations: int = Field(..., description="Questions dropped after their TTL")
+    invalidations: int = Field(..., description="Questions invalidated by edits")
+
+
+class SessionStoreStats(BaseModel):
+    """DTO for quiz session store statistics"""
+
+    sessions: int = Field(..., description="Sessions currently stored")
+    approximate_bytes: int = Field(..., description="Approximate memory held by sessions")
+    max_sessions: int = Field(..., description="LRU cap on stored sessions")
+    max_bytes: Optional[int] = Field(None, description="Approximate byte budget")
+    ttl_seconds: Optional[float] = Field(None, description="Idle time before a session expires")
+    backend: str = Field(..., description="Session backend in use (memory or sqlite)")
+    hits: int = Field(..., description="Session lookups that found a live session")
+    misses: int = Field(..., description="Session lookups for unknown or expired sessions")
+    evictions: int = Field(..., description="Sessions evicted by the entry cap or byte budget")
+    expirations: int = Field(..., description="Sessions dropped after their TTL")
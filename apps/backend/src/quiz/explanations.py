@@ -0,0 +1,112 @@
+"""
+Explanation cache - Reuse generated feedback for common wrong answers
+"""
+
+import os
+from typing import Dict, Optional, Tuple
+
+from src.common.cache import LRUCache
+from src.quiz.dto import ExplanationCacheStats
+from src.quiz.grading import normalize_answer
+
+
+class ExplanationCache:
+    """
+    In-memory cache of wrong-answer explanations
+
+    Entries are grouped per normalized question text in an LRU with TTL, and
+    each question holds up to ``answers_per_question`` explanations keyed by
+    (chosen answer, correct answer). Grouping by question makes invalidating
+    every explanation of an edited question a single delete.
+    """
+
+    def __init__(
+        self,
+        max_questions: int = 4096,
+        answers_per_question: int = 16,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.answers_per_question = answers_per_question
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._questions: LRUCache[Dict[Tuple[str, str], str]] = LRUCache(
+            max_entries=max_questions, ttl_seconds=ttl_seconds
+        )
+
+    def get(self, question: str, chosen: str, correct: str) -> Optional[str]:
+        """Cached explanation for a wrong answer, if any"""
+        if not self.enabled:
+            return None
+
+        answers = self._questions.get(normalize_answer(question))
+        explanation = (
+            answers.get((normalize_answer(chosen), normalize_answer(correct)))
+            if answers is not None
+            else None
+        )
+        if explanation is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return explanation
+
+    def contains(self, question: str, chosen: str, correct: str) -> bool:
+        """Whether an explanation is cached, without counting a lookup"""
+        answers = self._questions.get(normalize_answer(question))
+        return (
+            answers is not None
+            and (normalize_answer(chosen), normalize_answer(correct)) in answers
+        )
+
+    def set(self, question: str, chosen: str, correct: str, explanation: str) -> None:
+        """Store the explanation generated for a wrong answer"""
+        if not self.enabled:
+            return
+
+        key = normalize_answer(question)
+        answers = self._questions.get(key) or {}
+        answers[(normalize_answer(chosen), normalize_answer(correct))] = explanation
+        while len(answers) > self.answers_per_question:
+            answers.pop(next(iter(answers)))
+        self._questions.set(key, answers)
+
+    def invalidate(self, question: str) -> None:
+        """Drop every explanation cached for a question"""
+        if self._questions.delete(normalize_answer(question)):
+            self.invalidations += 1
+
+    def stats(self) -> ExplanationCacheStats:
+        """Hit/miss counters and occupancy"""
+        lookups = self.hits + self.misses
+        counters = self._questions.stats()
+        return ExplanationCacheStats(
+            enabled=self.enabled,
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / lookups if lookups else 0.0,
+            questions=counters["entries"],
+            evictions=counters["evictions"],
+            expirations=counters["expirations"],
+            invalidations=self.invalidations,
+        )
+
+
+# Global singleton instance
+_explanation_cache: Optional[ExplanationCache] = None
+
+
+def get_explanation_cache() -> ExplanationCache:
+    """Dependency for ExplanationCache - configured from environment"""
+    global _explanation_cache
+    if _explanation_cache is None:
+        _explanation_cache = ExplanationCache(
+            max_questions=int(os.getenv("EXPLANATION_CACHE_MAX_QUESTIONS", "4096")),
+            ttl_seconds=float(
+                os.getenv("EXPLANATION_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+            ),
+            enabled=os.getenv("EXPLANATION_CACHE_ENABLED", "true").lower() == "true",
+        )
+    return _explanation_cache
@@ -0,0 +1,144 @@
+"""
+Answer grading - Normalized answer keys precomputed per question
+"""
+
+import json
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import FrozenSet, List, NamedTuple, Tuple
+
+from src.quiz.dto import QuestionAnswer
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+_OPTION_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def normalize_answer(text: str, strip_punctuation: bool = True) -> str:
+    """Casefold, unify Unicode forms, optionally drop punctuation, squash spaces"""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text)
+    text = text.casefold()
+    if strip_punctuation:
+        text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class AnswerKey(NamedTuple):
+    """
+    Precomputed grading data for one question
+
+    ``accepted`` holds every normalized form that counts as correct: the
+    answer itself and, for multiple choice, the matching option's letter
+    ("B", "b)", "(b)" all normalize to "b"). Punctuation is only ignored when
+    that keeps all options distinct, so "C" and "C++" are never confused.
+    Grading is then a set lookup, with an optional fuzzy fallback.
+    """
+
+    answer: str
+    accepted: FrozenSet[str]
+    choices: Tuple[str, ...]
+    correct_choice: int
+    strip_punctuation: bool
+
+    @classmethod
+    def from_question(cls, question: QuestionAnswer) -> "AnswerKey":
+        options = question.options or []
+        strip_punctuation = cls._can_strip_punctuation(question.answer, options)
+
+        def normalize(text: str) -> str:
+            return normalize_answer(text, strip_punctuation)
+
+        choices = tuple(normalize(option) for option in options)
+        reference = normalize(question.answer)
+        correct_choice = choices.index(reference) if reference in choices else -1
+
+        accepted = {reference}
+        # Letter aliases, unless an option is itself a bare letter
+        if 0 <= correct_choice < len(_OPTION_LETTERS) and not any(
+            len(choice) == 1 for choice in choices
+        ):
+            accepted.add(_OPTION_LETTERS[correct_choice])
+
+        return cls(
+            answer=question.answer,
+            accepted=frozenset(accepted),
+            choices=choices,
+            correct_choice=correct_choice,
+            strip_punctuation=strip_punctuation,
+        )
+
+    @staticmethod
+    def _can_strip_punctuation(answer: str, options: List[str]) -> bool:
+        """Whether ignoring punctuation keeps the answer and options distinct"""
+        loose = [normalize_answer(option) for option in options]
+        if len(set(loose)) != len(loose):
+            return False
+
+        loose_answer = normalize_answer(answer)
+        strict_answer = normalize_answer(answer, strip_punctuation=False)
+        return bool(loose_answer) and all(
+            form != loose_answer or normalize_answer(option, False) == strict_answer
+            for option, form in zip(options, loose)
+        )
+
+    def grade(self, user_answer: str, fuzzy_threshold: float = 0.0) -> bool:
+        """
+        Whether ``user_answer`` is correct
+
+        Args:
+            user_answer: Raw answer as submitted
+            fuzzy_threshold: Minimum similarity ratio (0-1) accepted for
+                near-miss spellings; 0 disables fuzzy matching
+
+        Returns:
+            True if the answer matches the key
+        """
+        # Fast path: answers typed or clicked exactly as an option need no
+        # regex normalization, whether right or wrong
+        quick = user_answer.strip().casefold()
+        if quick in self.accepted:
+            return True
+        if quick in self.choices and fuzzy_threshold <= 0:
+            return False
+
+        normalized = normalize_answer(user_answer, self.strip_punctuation)
+        if normalized in self.accepted:
+            return True
+        if fuzzy_threshold <= 0 or not normalized:
+            return False
+
+        if self.choices:
+            # Only a near-miss of the correct option counts, never of another
+            ratios = [
+                SequenceMatcher(None, normalized, choice).ratio()
+                for choice in self.choices
+            ]
+            best = max(range(len(ratios)), key=ratios.__getitem__)
+            return best == self.correct_choice and ratios[best] >= fuzzy_threshold
+
+        reference = normalize_answer(self.answer, self.strip_punctuation)
+        return SequenceMatcher(None, normalized, reference).ratio() >= fuzzy_threshold
+
+    def to_json(self) -> str:
+        return json.dumps(
+            [
+                self.answer,
+                sorted(self.accepted),
+                list(self.choices),
+                self.correct_choice,
+                self.strip_punctuation,
+            ]
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "AnswerKey":
+        answer, accepted, choices, correct_choice, strip_punctuation = json.loads(data)
+        return cls(
+            answer,
+            frozenset(accepted),
+            tuple(choices),
+            correct_choice,
+            strip_punctuation,
+        )
@@ -0,0 +1,208 @@
+"""
+Quiz generation jobs - Bounded background workers for slow generations
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from src.common.cache import LRUCache
+from src.quiz.dto import QuizJobStatus, QuizResponse
+
+JobRunner = Callable[[], Awaitable[QuizResponse]]
+
+# Job states, in the order a job moves through them
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+class QuizJob:
+    """State of one background quiz generation"""
+
+    def __init__(self, quiz_title: str, session_id: str, run: JobRunner):
+        self.job_id = uuid.uuid4().hex
+        self.quiz_title = quiz_title
+        self.session_id = session_id
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.detail: Optional[str] = None
+        self.result: Optional[QuizResponse] = None
+        self._run: Optional[JobRunner] = run
+        # Bumped on every state change so watchers never miss one
+        self.version = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def _transition(self, status: str) -> None:
+        self.status = status
+        if status == RUNNING:
+            self.started_at = time.time()
+        elif self.finished:
+            self.finished_at = time.time()
+            # Release the extracted text captured by the runner
+            self._run = None
+        self.version += 1
+        # Wake current watchers; later ones wait on a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def execute(self) -> None:
+        """Run the generation, recording its result or error"""
+        self._transition(RUNNING)
+        try:
+            self.result = await self._run()
+        except HTTPException as e:
+            self.fail(e.detail)
+        except Exception as e:
+            self.fail(f"Unexpected error generating quiz: {str(e)}")
+        else:
+            self._transition(SUCCEEDED)
+
+    def fail(self, detail: str) -> None:
+        """Mark the job failed with an error message"""
+        self.detail = detail
+        self._transition(FAILED)
+
+    async def wait_for_change(self, version: int, timeout: float) -> bool:
+        """
+        Wait until the job moves past ``version``
+
+        Returns:
+            False if ``timeout`` passed first
+        """
+        if self.version != version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_status(self) -> QuizJobStatus:
+        return QuizJobStatus(
+            job_id=self.job_id,
+            status=self.status,
+            quiz_title=self.quiz_title,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            detail=self.detail,
+            result=self.result,
+        )
+
+
+class QuizJobQueue:
+    """
+    In-process queue of quiz generations served by a fixed set of workers
+
+    At most ``concurrency`` generations run at once and at most
+    ``max_queued`` wait behind them; submissions beyond that are refused
+    with a 503 so the client can retry instead of holding a connection
+    open. Finished jobs stay queryable for ``ttl_seconds``. Jobs live in
+    the API process that accepted them, so with several workers the job
+    endpoints need sticky routing; the quiz itself lands in the shared
+    session store.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        max_queued: int = 100,
+        ttl_seconds: Optional[float] = 3600,
+        max_finished: int = 1000,
+    ):
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        # Queued and running jobs are never evicted; finished ones age out
+        self._active: Dict[str, QuizJob] = {}
+        self._finished: LRUCache[QuizJob] = LRUCache(
+            max_entries=max_finished, ttl_seconds=ttl_seconds
+        )
+
+    def _start(self) -> asyncio.Queue:
+        # Workers are created on first use, inside the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queued)
+            self._workers = [
+                asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+            ]
+        return self._queue
+
+    def submit(self, quiz_title: str, session_id: str, run: JobRunner) -> QuizJob:
+        """
+        Queue a generation
+
+        Args:
+            quiz_title: Title reported with the job status
+            session_id: Session the runner stores the quiz in
+            run: Coroutine function that generates and stores the quiz
+
+        Returns:
+            The queued job
+
+        Raises:
+            HTTPException: 503 if the queue is full
+        """
+        queue = self._start()
+        job = QuizJob(quiz_title, session_id, run)
+        try:
+            queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Quiz generation queue is full, please retry shortly",
+                headers={"Retry-After": "5"},
+            )
+        self._active[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[QuizJob]:
+        """Queued, running or recently finished job by id"""
+        return self._active.get(job_id) or self._finished.get(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job: QuizJob = await self._queue.get()
+            try:
+                await job.execute()
+            finally:
+                if job.finished:
+                    self._active.pop(job.job_id, None)
+                    self._finished.set(job.job_id, job)
+                self._queue.task_done()
+
+    async def close(self) -> None:
+        """Stop the workers and fail the jobs they leave unfinished"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        for job in list(self._active.values()):
+            job.fail("Server shut down before the quiz was generated")
+        self._active.clear()
+
+
+# Global singleton instance - one job queue per API process
+_quiz_job_queue: Optional[QuizJobQueue] = None
+
+
+def get_quiz_job_queue() -> QuizJobQueue:
+    """Dependency for QuizJobQueue - configured from environment"""
+    global _quiz_job_queue
+    if _quiz_job_queue is None:
+        _quiz_job_queue = QuizJobQueue(
+            concurrency=int(os.getenv("QUIZ_JOB_CONCURRENCY", "4")),
+            max_queued=int(os.getenv("QUIZ_JOB_QUEUE_DEPTH", "100")),
+            ttl_seconds=float(os.getenv("QUIZ_JOB_TTL_SECONDS", "3600")),
+        )
+    return _quiz_job_queue
@@ -0,0 +1,108 @@
+"""
+Incremental JSON parsing - Objects of a JSON array as its text streams in
+"""
+
+import json
+from typing import Any, List, Optional
+
+
+class JsonArrayStream:
+    """
+    Incremental parser for a streamed JSON array of objects
+
+    Text is fed in arbitrary fragments (LLM deltas). A single pass tracks
+    nesting depth and string/escape state, and each top-level object is
+    decoded with ``json.loads`` as soon as its closing brace arrives. Text
+    before the array (such as a Markdown code fence or a preamble like
+    "Here [is] the quiz:") is ignored: the array starts at the first ``[``
+    followed by optional whitespace and ``{`` or ``]``. Consumed text is
+    discarded, so the buffer never holds more than the object currently
+    being received.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object_start: Optional[int] = None
+        self.started = False
+        self.finished = False
+        self.malformed = 0
+
+    def feed(self, fragment: str) -> List[Any]:
+        """
+        Consume a fragment and return the objects it completed
+
+        Args:
+            fragment: Next piece of the streamed text
+
+        Returns:
+            Decoded top-level array elements completed by this fragment;
+            elements that are not valid JSON are counted in ``malformed``
+        """
+        if self.finished:
+            return []
+
+        self._text += fragment
+        completed = []
+        text = self._text
+        # A "[" at the end of the text, not yet known to open the array
+        pending: Optional[int] = None
+
+        for index in range(self._position, len(text)):
+            char = text[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if not self.started:
+                if char == "[":
+                    following = text[index + 1 :].lstrip()
+                    if not following:
+                        pending = index
+                        break
+                    if following[0] in "{]":
+                        self.started = True
+                        self._depth = 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                if self._depth == 1 and char == "{":
+                    self._object_start = index
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 1 and self._object_start is not None:
+                    try:
+                        completed.append(
+                            json.loads(text[self._object_start : index + 1])
+                        )
+                    except json.JSONDecodeError:
+                        self.malformed += 1
+                    self._object_start = None
+                elif self._depth == 0:
+                    self.finished = True
+                    break
+
+        if pending is not None:
+            # Look at the bracket again once more text has arrived
+            self._text = text[pending:]
+            self._position = 0
+            return completed
+
+        # Keep only the object still being received
+        keep_from = self._object_start if self._object_start is not None else len(text)
+        self._text = text[keep_from:]
+        self._position = len(text) - keep_from
+        if self._object_start is not None:
+            self._object_start = 0
+        return completed
@@ -0,0 +1,142 @@
+"""
+Passage selection - Pick representative passages of long documents for prompts
+"""
+
+import re
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from src.quiz.text import estimate_tokens, fits_in_tokens, split_into_sections
+
+_WORD = re.compile(r"[a-z]{3,}")
+
+STOP_WORDS = frozenset(
+    "the and for are but not you all any can had her was one our out has him his "
+    "how its may new now old see two way who did get let put say she too use that "
+    "with have this will your from they been were which their there what when "
+    "would about into than them then these some could other more only also such "
+    "each most over very after where while those being because between".split()
+)
+
+
+class PassageSelector:
+    """
+    Selects a diverse, high-information subset of a document's passages
+
+    The text is cut into short segments, each scored with TF-IDF weights:
+    centrality (cosine similarity to the document centroid) times information
+    density (TF-IDF mass per token). Segments are then picked greedily with
+    maximal marginal relevance, so near-identical passages are not chosen
+    twice, until the token budget is full. All scoring is vectorized with
+    NumPy over a sparse (segment, term) coordinate list.
+    """
+
+    def __init__(self, segment_tokens: int = 120, diversity: float = 0.5):
+        self.segment_tokens = segment_tokens
+        self.diversity = diversity
+
+    def select(
+        self,
+        text: str,
+        budget_tokens: int,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+    ) -> str:
+        """
+        Return passages of ``text`` that fit in ``budget_tokens``
+
+        Args:
+            text: Full document text
+            budget_tokens: Token budget for the selected passages
+            count_tokens: Token counter for the target model
+
+        Returns:
+            Selected passages in document order, or the text itself if it fits
+        """
+        if fits_in_tokens(text, budget_tokens, count_tokens):
+            return text
+
+        segments = split_into_sections(text, self.segment_tokens, count_tokens)
+        scores, rows, cols, weights = self._score_segments(segments)
+        # Token cost of each segment, including its "\n\n" separator
+        sizes = np.array([count_tokens(segment) + 1 for segment in segments])
+        chosen = self._pick_diverse(
+            segments, scores, rows, cols, weights, sizes, budget_tokens
+        )
+        return "\n\n".join(segments[i] for i in sorted(chosen))
+
+    def _score_segments(self, segments: List[str]):
+        """TF-IDF weights per (segment, term) and a relevance score per segment"""
+        vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        lengths = np.empty(len(segments), dtype=np.int64)
+
+        for index, segment in enumerate(segments):
+            words = [w for w in _WORD.findall(segment.lower()) if w not in STOP_WORDS]
+            term_ids.extend(vocabulary.setdefault(w, len(vocabulary)) for w in words)
+            lengths[index] = len(words)
+
+        num_segments = len(segments)
+        num_terms = max(len(vocabulary), 1)
+        segment_ids = np.repeat(np.arange(num_segments, dtype=np.int64), lengths)
+        terms = np.asarray(term_ids, dtype=np.int64)
+
+        # Sparse term frequencies as (segment, term, count) coordinates
+        pairs, counts = np.unique(segment_ids * num_terms + terms, return_counts=True)
+        rows, cols = np.divmod(pairs, num_terms)
+
+        document_frequency = np.bincount(cols, minlength=num_terms)
+        idf = np.log((1 + num_segments) / (1 + document_frequency)) + 1.0
+        weights = (1.0 + np.log(counts)) * idf[cols]
+
+        mass = np.bincount(rows, weights=weights, minlength=num_segments)
+        norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=num_segments))
+        weights = weights / np.maximum(norms[rows], 1e-12)
+
+        centroid = (
+            np.bincount(cols, weights=weights, minlength=num_terms) / num_segments
+        )
+        centroid /= max(np.linalg.norm(centroid), 1e-12)
+        centrality = np.bincount(
+            rows, weights=weights * centroid[cols], minlength=num_segments
+        )
+
+        density = mass / np.maximum(lengths, 1)
+        density /= max(density.max(), 1e-12)
+        return centrality * density, rows, cols, weights
+
+    def _pick_diverse(
+        self, segments, scores, rows, cols, weights, sizes, budget_tokens
+    ):
+        """Greedy maximal-marginal-relevance selection under a token budget"""
+        num_terms = int(cols.max()) + 1 if len(cols) else 1
+        redundancy = np.zeros(len(segments))
+        available = np.ones(len(segments), dtype=bool)
+        chosen: List[int] = []
+        remaining = budget_tokens
+
+        while remaining > 0:
+            available &= sizes <= remaining
+            if not available.any():
+                break
+
+            marginal = np.where(
+                available,
+                (1 - self.diversity) * scores - self.diversity * redundancy,
+                -np.inf,
+            )
+            best = int(np.argmax(marginal))
+            chosen.append(best)
+            available[best] = False
+            remaining -= int(sizes[best])
+
+            # Cosine similarity of every segment to the one just chosen
+            picked = rows == best
+            dense = np.zeros(num_terms)
+            dense[cols[picked]] = weights[picked]
+            similarity = np.bincount(
+                rows, weights=weights * dense[cols], minlength=len(segments)
+            )
+            redundancy = np.maximum(redundancy, similarity)
+
+        return chosen
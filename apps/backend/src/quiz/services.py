@@ -2,49 +2,512 @@
 Quiz services - Business logic for quiz operations
 """
 
+import asyncio
 import json
+import logging
+import math
 import os
-from typing import AsyncGenerator, Dict, List, Optional, Tuple
+import re
+from contextlib import aclosing
+from typing import AsyncGenerator, Callable, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
-from openai import OpenAI
+from openai import RateLimitError
+from src.common.singleflight import SingleFlight
+from src.common.sse import format_event, stream_events
+from src.llm.gateway import LLMGateway, get_llm_gateway
+from src.llm.tokens import TokenCounter, get_token_counter
+from src.quiz.cache import QuizGenerationCache, get_quiz_generation_cache
 from src.quiz.dto import (
     AnswerRequest,
     AnswerResponse,
+    GradedAnswer,
+    GradeQuizRequest,
+    GradeQuizResponse,
     QuestionAnswer,
     QuestionUpdateRequest,
 )
+from src.quiz.dedup import NearDuplicateIndex
+from src.quiz.explanations import ExplanationCache, get_explanation_cache
+from src.quiz.grading import AnswerKey, normalize_answer
+from src.quiz.json_stream import JsonArrayStream
+from src.quiz.passages import PassageSelector
+from src.quiz.sessions import SessionStore, create_session_store
+from src.quiz.text import (
+    fit_to_tokens,
+    fits_in_tokens,
+    split_into_sections,
+    spread_evenly,
+)
+
+logger = logging.getLogger(__name__)
+
+GENERATION_MODEL = "gpt-3.5-turbo"
+# Bump whenever the generation prompt changes so cached quizzes are not reused
+PROMPT_VERSION = "3"
+# Default cap on source text tokens per generation prompt (0 = fill the context)
+PROMPT_TEXT_TOKENS = 3000
+GENERATION_SYSTEM_PROMPT = (
+    "You are a helpful assistant that creates quiz questions. "
+    "Always respond with valid JSON only."
+)
+# single: one call on the start of the text; chunked: map-reduce over the
+# whole text; auto: chunked only when the text does not fit in one prompt
+GENERATION_MODES = ("single", "chunked", "auto")
+# Completion tokens reserved per requested question
+COMPLETION_TOKENS_PER_QUESTION = 200
+# Sent in the error event when feedback cannot be generated
+FEEDBACK_ERROR_DETAIL = "Could not generate feedback right now. Please try again."
+# Cached explanations replay as leading-space words, the shape of LLM deltas,
+# so they are coalesced into events exactly like a live stream
+_REPLAY_WORD = re.compile(r"\s*\S+")
 
 
 class QuizGenerationService:
     """Service for generating quiz questions using OpenAI"""
 
-    def __init__(self):
-        self._client = None
+    def __init__(
+        self,
+        llm_gateway: Optional[LLMGateway] = None,
+        cache: Optional[QuizGenerationCache] = None,
+    ):
+        # Shared rate limits, concurrency cap and retries for LLM calls
+        self.llm = llm_gateway or get_llm_gateway()
+        self.cache = cache or get_quiz_generation_cache()
+        # Identical generations in flight (same cache key) run once
+        self.generations: SingleFlight[List[QuestionAnswer]] = SingleFlight()
+        self.model = os.getenv("QUIZ_GENERATION_MODEL", GENERATION_MODEL)
+        self.tokens: TokenCounter = get_token_counter(self.model)
+        self.prompt_text_tokens = int(
+            os.getenv("QUIZ_PROMPT_TEXT_TOKENS", str(PROMPT_TEXT_TOKENS))
+        )
+        self.default_mode = os.getenv("QUIZ_GENERATION_MODE", "single")
+        self.max_sections = int(os.getenv("QUIZ_MAX_SECTIONS", "8"))
+        # Short quizzes are topped up in small concurrent calls for a few rounds
+        self.topup_rounds = int(os.getenv("QUIZ_TOPUP_ROUNDS", "2"))
+        self.topup_batch_size = int(os.getenv("QUIZ_TOPUP_BATCH_SIZE", "3"))
+        self.passage_selector = (
+            PassageSelector()
+            if os.getenv("QUIZ_PASSAGE_SELECTION", "true").lower() == "true"
+            else None
+        )
 
-    @property
-    def client(self):
-        """Lazy initialization of OpenAI client"""
-        if self._client is None:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise HTTPException(
-                    status_code=500,
-                    detail="OpenAI API key not configured. Please check your environment variables.",
+    async def generate_questions_from_text(
+        self,
+        text: str,
+        num_questions: int = 10,
+        force_regenerate: bool = False,
+        mode: Optional[str] = None,
+    ) -> List[QuestionAnswer]:
+        """
+        Generate quiz questions from extracted text, reusing cached quizzes
+
+        Concurrent requests for the same quiz share one generation, and each
+        caller receives its own copy of the questions.
+
+        Args:
+            text: The extracted text from PDF
+            num_questions: Number of questions to generate
+            force_regenerate: Skip the cache lookup and generate a fresh quiz
+            mode: One of GENERATION_MODES (defaults to QUIZ_GENERATION_MODE)
+
+        Returns:
+            List of generated QuestionAnswer objects
+
+        Raises:
+            HTTPException: If question generation fails
+        """
+        mode = mode or self.default_mode
+        if mode not in GENERATION_MODES:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown generation mode: {mode}"
+            )
+        if mode == "auto":
+            budget = self._text_budget(num_questions)
+            fits = fits_in_tokens(text, budget, self.tokens.count)
+            mode = "single" if fits else "chunked"
+
+        cache_key = self.cache.make_key(
+            text, num_questions, self.model, f"{PROMPT_VERSION}:{mode}"
+        )
+        if not force_regenerate:
+            cached_questions = await self.cache.get(cache_key)
+            if cached_questions:
+                return cached_questions
+
+        questions = await self.generations.do(
+            cache_key, lambda: self._generate(text, num_questions, mode, cache_key)
+        )
+        # Copies, so one session editing its quiz never touches another's
+        return [question.model_copy(deep=True) for question in questions]
+
+    async def _generate(
+        self, text: str, num_questions: int, mode: str, cache_key: str
+    ) -> List[QuestionAnswer]:
+        """Generate a quiz in the given mode and cache it"""
+        if mode == "chunked":
+            questions = await self._generate_chunked(text, num_questions)
+            if len(questions) < num_questions:
+                prompt_text = await self._select_passages(text, num_questions)
+                questions = await self._complete_quiz(
+                    prompt_text, questions, num_questions
                 )
+        else:
+            prompt_text = await self._select_passages(text, num_questions)
+            questions = await self._request_questions(prompt_text, num_questions)
+            questions = await self._complete_quiz(
+                prompt_text, questions, num_questions
+            )
+        await self.cache.set(cache_key, questions)
+        return questions
+
+    async def stream_questions_from_text(
+        self,
+        text: str,
+        num_questions: int = 10,
+        force_regenerate: bool = False,
+    ) -> AsyncGenerator[QuestionAnswer, None]:
+        """
+        Generate quiz questions, yielding each one as soon as it is complete
 
-            self._client = OpenAI(api_key=api_key)
-        return self._client
+        Uses single mode. The LLM token stream is parsed incrementally, so
+        the first question arrives long before the completion ends. Cached
+        quizzes are replayed immediately, and finished quizzes are cached
+        like generate_questions_from_text does.
 
-    async def generate_questions_from_text(
-        self, text: str, num_questions: int = 10
+        Args:
+            text: The extracted text from PDF
+            num_questions: Number of questions to generate
+            force_regenerate: Skip the cache lookup and generate a fresh quiz
+
+        Yields:
+            QuestionAnswer objects numbered from 1
+
+        Raises:
+            HTTPException: If question generation fails
+        """
+        cache_key = self.cache.make_key(
+            text, num_questions, self.model, f"{PROMPT_VERSION}:single"
+        )
+        if not force_regenerate:
+            cached_questions = await self.cache.get(cache_key)
+            if cached_questions:
+                for question in cached_questions:
+                    yield question
+                return
+
+        prompt_text = await self._select_passages(text, num_questions)
+        index = NearDuplicateIndex()
+        questions: List[QuestionAnswer] = []
+
+        # aclosing ends the LLM stream as soon as enough questions arrived
+        async with aclosing(
+            self._stream_questions(prompt_text, num_questions)
+        ) as generated:
+            async for question in generated:
+                if not index.add(self._dedup_text(question)):
+                    continue
+                question = question.model_copy(
+                    update={"id": str(len(questions) + 1)}
+                )
+                questions.append(question)
+                yield question
+                if len(questions) == num_questions:
+                    break
+
+        if not questions:
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to generate valid questions. Please try again.",
+            )
+
+        # Fill slots lost to invalid or duplicate questions, as the
+        # non-streaming path does
+        streamed = len(questions)
+        await self._top_up(prompt_text, questions, index, num_questions)
+        for position in range(streamed, len(questions)):
+            questions[position] = questions[position].model_copy(
+                update={"id": str(position + 1)}
+            )
+            yield questions[position]
+
+        await self.cache.set(cache_key, questions)
+
+    async def _stream_questions(
+        self, text: str, num_questions: int
+    ) -> AsyncGenerator[QuestionAnswer, None]:
+        """
+        Stream a generation request and yield each valid question it completes
+
+        Malformed objects and questions whose answer is not an option are
+        skipped rather than failing the whole quiz.
+
+        Raises:
+            HTTPException: If the request fails or the reply is not a JSON array
+        """
+        parser = JsonArrayStream()
+        position = 0
+        try:
+            async with aclosing(
+                self.llm.stream_chat(
+                    model=self.model,
+                    messages=self._generation_messages(text, num_questions),
+                    temperature=0.7,
+                    timeout=30,
+                    max_tokens=num_questions * COMPLETION_TOKENS_PER_QUESTION,
+                )
+            ) as stream:
+                async for chunk in stream:
+                    if not chunk.choices or chunk.choices[0].delta.content is None:
+                        continue
+                    for data in parser.feed(chunk.choices[0].delta.content):
+                        try:
+                            question = self._parse_question(data, position)
+                        except (KeyError, ValueError):
+                            question = None
+                        position += 1
+                        if question is not None:
+                            yield question
+                    if parser.finished:
+                        break
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise self._generation_error(e)
+
+        if not parser.started:
+            raise HTTPException(
+                status_code=500,
+                detail="OpenAI returned invalid response format. Please try again.",
+            )
+
+    async def _select_passages(self, text: str, num_questions: int) -> str:
+        """
+        Reduce a long text to representative passages that fit one prompt
+
+        Without a selector the prompt simply keeps the start of the text.
+        Scoring is CPU-bound, so it runs in a worker thread.
+        """
+        budget = self._text_budget(num_questions)
+        if self.passage_selector is None or fits_in_tokens(
+            text, budget, self.tokens.count
+        ):
+            return text
+        return await asyncio.to_thread(
+            self.passage_selector.select, text, budget, self.tokens.count
+        )
+
+    def _text_budget(
+        self, num_questions: int, exclude: Optional[List[QuestionAnswer]] = None
+    ) -> int:
+        """
+        Source text tokens that fit in a generation prompt
+
+        The model's context window minus the completion reserved for
+        ``num_questions`` and the instructions around the text, capped at
+        ``prompt_text_tokens``.
+        """
+        instructions = self.tokens.count_messages(
+            self._generation_messages("", num_questions, exclude, fit=False)
+        )
+        available = (
+            self.tokens.context_window
+            - num_questions * COMPLETION_TOKENS_PER_QUESTION
+            - instructions
+        )
+        if self.prompt_text_tokens > 0:
+            available = min(available, self.prompt_text_tokens)
+        return max(0, available)
+
+    def _generation_messages(
+        self,
+        text: str,
+        num_questions: int,
+        exclude: Optional[List[QuestionAnswer]] = None,
+        fit: bool = True,
+    ) -> List[Dict[str, str]]:
+        """Chat messages for a generation call, the text cut to the token budget"""
+        if fit:
+            text = fit_to_tokens(
+                text, self._text_budget(num_questions, exclude), self.tokens.count
+            )
+        return [
+            {"role": "system", "content": GENERATION_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": self._build_generation_prompt(text, num_questions, exclude),
+            },
+        ]
+
+    async def _generate_chunked(
+        self, text: str, num_questions: int
+    ) -> List[QuestionAnswer]:
+        """
+        Map-reduce generation over the whole document
+
+        The text is split into prompt-sized sections (at most max_sections,
+        spread evenly across the document), candidate questions are generated
+        for every section concurrently, and the candidates are merged
+        round-robin so the quiz covers the whole document.
+
+        Args:
+            text: The extracted text from PDF
+            num_questions: Number of questions to generate
+
+        Returns:
+            List of merged QuestionAnswer objects
+
+        Raises:
+            HTTPException: If every section fails to generate
+        """
+        # Budgeted for the whole quiz's completion, so each smaller section request fits
+        sections = split_into_sections(
+            text, self._text_budget(num_questions), self.tokens.count
+        )
+        sections = spread_evenly(sections, self.max_sections)
+        if len(sections) <= 1:
+            return await self._request_questions(text, num_questions)
+
+        # Over-generate slightly so duplicates and rejects can be dropped
+        per_section = max(2, math.ceil(num_questions / len(sections)) + 1)
+        results = await asyncio.gather(
+            *(self._request_questions(section, per_section) for section in sections),
+            return_exceptions=True,
+        )
+
+        candidates = [result for result in results if isinstance(result, list)]
+        if not candidates:
+            raise results[0]
+
+        return self._merge_section_questions(candidates, num_questions)
+
+    @staticmethod
+    def _merge_section_questions(
+        candidates: List[List[QuestionAnswer]], num_questions: int
+    ) -> List[QuestionAnswer]:
+        """Interleave per-section questions round-robin, skipping near-duplicates"""
+        merged: List[QuestionAnswer] = []
+        index = NearDuplicateIndex()
+
+        for rank in range(max(len(section) for section in candidates)):
+            for section_questions in candidates:
+                if rank >= len(section_questions):
+                    continue
+                question = section_questions[rank]
+                if not index.add(QuizGenerationService._dedup_text(question)):
+                    continue
+                merged.append(question)
+                if len(merged) == num_questions:
+                    return QuizGenerationService._renumber(merged)
+
+        return QuizGenerationService._renumber(merged)
+
+    async def _complete_quiz(
+        self, text: str, questions: List[QuestionAnswer], num_questions: int
+    ) -> List[QuestionAnswer]:
+        """
+        Drop near-duplicates and top up the quiz to ``num_questions``
+
+        Args:
+            text: The text the questions were generated from
+            questions: Valid generated questions, possibly with near-duplicates
+            num_questions: Number of questions the quiz should have
+
+        Returns:
+            Questions without near-duplicates, renumbered from 1
+        """
+        index = NearDuplicateIndex()
+        accepted = [q for q in questions if index.add(self._dedup_text(q))]
+        await self._top_up(text, accepted, index, num_questions)
+        return self._renumber(accepted)
+
+    async def _top_up(
+        self,
+        text: str,
+        accepted: List[QuestionAnswer],
+        index: NearDuplicateIndex,
+        num_questions: int,
+    ) -> None:
+        """
+        Request only the missing questions of a short quiz
+
+        Each round asks for exactly the missing number, split into small
+        concurrent calls that list the accepted questions as exclusions.
+        Rounds stop once the quiz is full, after ``topup_rounds``, or when a
+        whole quiz's worth of questions has been requested, so a repair never
+        costs more than regenerating. Failed calls are skipped and the
+        quiz is returned as complete as it got.
+
+        Args:
+            text: The text the questions were generated from
+            accepted: Questions kept so far; new ones are appended in place
+            index: Near-duplicate index already holding ``accepted``
+            num_questions: Number of questions the quiz should have
+        """
+        budget = num_questions
+        for _ in range(self.topup_rounds):
+            missing = min(num_questions - len(accepted), budget)
+            if missing <= 0:
+                return
+            budget -= missing
+
+            batch_sizes = [
+                min(self.topup_batch_size, missing - start)
+                for start in range(0, missing, self.topup_batch_size)
+            ]
+            results = await asyncio.gather(
+                *(
+                    self._request_questions(
+                        text,
+                        size,
+                        exclude=accepted,
+                        max_tokens=size * COMPLETION_TOKENS_PER_QUESTION,
+                    )
+                    for size in batch_sizes
+                ),
+                return_exceptions=True,
+            )
+
+            for result in results:
+                if isinstance(result, BaseException):
+                    continue
+                for question in result:
+                    if len(accepted) == num_questions:
+                        return
+                    if index.add(self._dedup_text(question)):
+                        accepted.append(question)
+
+    @staticmethod
+    def _dedup_text(question: QuestionAnswer) -> str:
+        """Text compared for near-duplicate detection"""
+        return f"{question.question} {question.answer}"
+
+    @staticmethod
+    def _renumber(questions: List[QuestionAnswer]) -> List[QuestionAnswer]:
+        """Copy questions with sequential ids starting at 1"""
+        return [
+            question.model_copy(update={"id": str(position)})
+            for position, question in enumerate(questions, start=1)
+        ]
+
+    async def _request_questions(
+        self,
+        text: str,
+        num_questions: int,
+        exclude: Optional[List[QuestionAnswer]] = None,
+        max_tokens: Optional[int] = None,
     ) -> List[QuestionAnswer]:
         """
         Generate quiz questions from extracted text using OpenAI
 
+        Invalid questions (malformed, or answer not among the options) are
+        skipped, so the result may be short; callers top it up.
+
         Args:
             text: The extracted text from PDF
             num_questions: Number of questions to generate
+            exclude: Existing questions the model must not repeat
+            max_tokens: Completion budget (defaults to the per-question reserve)
 
         Returns:
             List of generated QuestionAnswer objects
@@ -53,20 +516,14 @@ class QuizGenerationService:
             HTTPException: If question generation fails
         """
         try:
-            prompt = self._build_generation_prompt(text, num_questions)
-
-            # Add timeout and retry logic
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that creates quiz questions. Always respond with valid JSON only.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+            # Waits for rate limit budget; 429/5xx are retried with backoff
+            response = await self.llm.chat(
+                model=self.model,
+                messages=self._generation_messages(text, num_questions, exclude),
                 temperature=0.7,
                 timeout=30,  # 30 second timeout
+                max_tokens=max_tokens
+                or num_questions * COMPLETION_TOKENS_PER_QUESTION,
             )
 
             # Check if response and content exist
@@ -106,47 +563,17 @@ class QuizGenerationService:
                 )
 
             questions = []
-            for i, q in enumerate(questions_data[:num_questions]):
+            # Extra questions beyond the request stand in for invalid ones
+            for i, q in enumerate(questions_data):
+                if len(questions) == num_questions:
+                    break
                 try:
-                    # Validate question structure
-                    if not isinstance(q, dict):
-                        raise ValueError(f"Question {i+1} is not a valid object")
-
-                    if "question" not in q or "answer" not in q:
-                        raise ValueError(f"Question {i+1} missing required fields")
-
-                    question_text = str(q["question"]).strip()
-                    correct_answer = str(q["answer"]).strip()
-                    options = q.get("options", [])
-
-                    # Validate that correct answer is in options
-                    if options and correct_answer not in options:
-                        # Try to find a case-insensitive match
-                        matching_option = None
-                        for option in options:
-                            if option.lower() == correct_answer.lower():
-                                matching_option = option
-                                break
-
-                        if matching_option:
-                            correct_answer = matching_option
-                        else:
-                            # Skip this question if correct answer not in options
-                            continue
-
-                    questions.append(
-                        QuestionAnswer(
-                            id=str(i + 1),
-                            question=question_text,
-                            answer=correct_answer,
-                            options=options,
-                        )
-                    )
+                    question = self._parse_question(q, i)
                 except (KeyError, ValueError):
-                    raise HTTPException(
-                        status_code=500,
-                        detail="AI generated malformed questions. Please try again.",
-                    )
+                    # Malformed questions are replaced by the top-up stage
+                    continue
+                if question is not None:
+                    questions.append(question)
 
             if len(questions) == 0:
                 raise HTTPException(
@@ -162,21 +589,91 @@ class QuizGenerationService:
                 detail="Failed to process AI response. Please try again.",
             )
         except Exception as e:
-            # Provide user-friendly error messages based on error type
-            error_msg = str(e).lower()
-            if "authentication" in error_msg or "api_key" in error_msg:
-                detail = "AI service authentication failed. Please contact support."
-            elif "rate_limit" in error_msg:
-                detail = "AI service is currently busy. Please try again in a moment."
-            elif "timeout" in error_msg:
-                detail = "AI service took too long to respond. Please try again."
-            else:
-                detail = "Failed to generate questions. Please try again."
+            raise self._generation_error(e)
+
+    @staticmethod
+    def _generation_error(error: Exception) -> HTTPException:
+        """Map an LLM failure to a user-friendly HTTP error"""
+        if isinstance(error, RateLimitError):
+            # Still limited after the gateway's retries: tell the client to back
+            # off for as long as the provider asked
+            return HTTPException(
+                status_code=503,
+                detail="AI service is currently busy. Please try again in a moment.",
+                headers={"Retry-After": _retry_after_seconds(error)},
+            )
+
+        # Provide user-friendly error messages based on error type
+        error_msg = str(error).lower()
+        if "authentication" in error_msg or "api_key" in error_msg:
+            detail = "AI service authentication failed. Please contact support."
+        elif "timeout" in error_msg:
+            detail = "AI service took too long to respond. Please try again."
+        else:
+            detail = "Failed to generate questions. Please try again."
 
-            raise HTTPException(status_code=500, detail=detail)
+        return HTTPException(status_code=500, detail=detail)
+
+    @staticmethod
+    def _parse_question(q, i: int) -> Optional[QuestionAnswer]:
+        """
+        Validate one generated question object
+
+        Returns:
+            The question with id ``i + 1``, or None if its answer is not
+            among its options
 
-    def _build_generation_prompt(self, text: str, num_questions: int) -> str:
+        Raises:
+            ValueError: If the object is malformed
+        """
+        # Validate question structure
+        if not isinstance(q, dict):
+            raise ValueError(f"Question {i+1} is not a valid object")
+
+        if "question" not in q or "answer" not in q:
+            raise ValueError(f"Question {i+1} missing required fields")
+
+        question_text = str(q["question"]).strip()
+        correct_answer = str(q["answer"]).strip()
+        options = q.get("options", [])
+
+        # Validate that correct answer is in options
+        if options and correct_answer not in options:
+            # Try to find a case-insensitive match
+            matching_option = None
+            for option in options:
+                if option.lower() == correct_answer.lower():
+                    matching_option = option
+                    break
+
+            if matching_option:
+                correct_answer = matching_option
+            else:
+                # Skip this question if correct answer not in options
+                return None
+
+        return QuestionAnswer(
+            id=str(i + 1),
+            question=question_text,
+            answer=correct_answer,
+            options=options,
+        )
+
+    def _build_generation_prompt(
+        self,
+        text: str,
+        num_questions: int,
+        exclude: Optional[List[QuestionAnswer]] = None,
+    ) -> str:
         """Build the prompt for OpenAI question generation"""
+        exclusions = ""
+        if exclude:
+            existing = "\n".join(f"  * {q.question}" for q in exclude)
+            exclusions = (
+                "\n- Do not repeat or paraphrase any of these existing questions:"
+                f"\n{existing}"
+            )
+
         return f"""You are an expert quiz generator. Create exactly {num_questions} multiple-choice questions based on the provided text.
 
 CRITICAL: Respond with ONLY a valid JSON array. No extra text, explanations, or formatting.
@@ -195,10 +692,10 @@ Requirements:
 - The correct answer must be one of the 4 options (exact match)
 - Questions should cover different topics from the text
 - Use clear, grammatically correct language
-- Ensure all JSON is properly formatted with correct quotes and brackets
+- Ensure all JSON is properly formatted with correct quotes and brackets{exclusions}
 
 Text to analyze:
-{text[:3500]}
+{text}
 
 Generate {num_questions} questions now:"""
 
@@ -206,35 +703,131 @@ Generate {num_questions} questions now:"""
 class QuizManagementService:
     """Service for managing quiz questions and answers"""
 
-    def __init__(self):
-        # In-memory storage for questions by session (in production, use a database)
-        # Format: {session_id: (quiz_title, {question_id: QuestionAnswer})}
-        self.sessions_storage: Dict[str, Tuple[str, Dict[str, QuestionAnswer]]] = {}
-
-    def store_questions(
+    def __init__(
+        self,
+        llm_gateway: Optional[LLMGateway] = None,
+        session_store: Optional[SessionStore] = None,
+        explanation_cache: Optional[ExplanationCache] = None,
+    ):
+        self.llm = llm_gateway or get_llm_gateway()
+        self.feedback_model = os.getenv("QUIZ_FEEDBACK_MODEL", GENERATION_MODEL)
+        self.explanations = explanation_cache or get_explanation_cache()
+        # Bounded in-memory storage for questions by session, with TTL and
+        # LRU eviction (in production, use a database)
+        self.sessions = session_store or create_session_store()
+        # Identical explanations in flight (same question and wrong answer)
+        # share one LLM call, whether live or prewarmed
+        self.explanation_flights: SingleFlight[str] = SingleFlight()
+        # Speculative explanations for every distractor of a new quiz; each
+        # question costs one LLM call per wrong option through the same rate
+        # limits as live traffic, so it is opt-in and capped at quiz size
+        self.prewarm_enabled = (
+            os.getenv("EXPLANATION_PREWARM_ENABLED", "false").lower() == "true"
+        )
+        self.prewarm_max_questions = int(
+            os.getenv("EXPLANATION_PREWARM_MAX_QUESTIONS", "10")
+        )
+        self._prewarm_slots = asyncio.Semaphore(
+            int(os.getenv("EXPLANATION_PREWARM_CONCURRENCY", "4"))
+        )
+        self._prewarm_tasks: Dict[str, asyncio.Task] = {}
+        # Feedback streams: delta coalescing window and size, idle heartbeat
+        self.sse_window_seconds = float(os.getenv("SSE_COALESCE_MS", "50")) / 1000
+        self.sse_max_event_bytes = int(os.getenv("SSE_MAX_EVENT_BYTES", "512"))
+        self.sse_heartbeat_seconds = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+        # Similarity (0-1) at which misspelled answers still count; 0 disables
+        self.fuzzy_threshold = float(os.getenv("ANSWER_FUZZY_THRESHOLD", "0"))
+
+    async def store_questions(
         self,
         questions: List[QuestionAnswer],
         session_id: str = "default",
         quiz_title: str = "General Quiz",
     ) -> None:
-        """Store questions in memory storage by session"""
-        if session_id not in self.sessions_storage:
-            self.sessions_storage[session_id] = (quiz_title, {})
+        """Store questions in the session store"""
+        await self.sessions.store_session(session_id, quiz_title, questions)
 
-        self.sessions_storage[session_id] = (quiz_title, {q.id: q for q in questions})
+    def schedule_explanation_prewarm(
+        self, questions: List[QuestionAnswer], session_id: str = "default"
+    ) -> None:
+        """
+        Start pre-generating distractor explanations for a new quiz
+
+        Runs as a background task so the upload response is not delayed. A
+        newer quiz for the same session cancels the previous task.
+        """
+        if not self.prewarm_enabled or not self.explanations.enabled:
+            return
+
+        previous = self._prewarm_tasks.pop(session_id, None)
+        if previous is not None:
+            previous.cancel()
+
+        task = asyncio.create_task(self._prewarm_explanations(questions, session_id))
+        self._prewarm_tasks[session_id] = task
+        task.add_done_callback(
+            lambda done: self._prewarm_tasks.pop(session_id, None)
+            if self._prewarm_tasks.get(session_id) is done
+            else None
+        )
 
-    def get_question_by_id(
+    async def _prewarm_explanations(
+        self, questions: List[QuestionAnswer], session_id: str
+    ) -> None:
+        """Generate and cache explanations for each wrong option of each question"""
+        distractors = [
+            (question, option)
+            for question in questions[: self.prewarm_max_questions]
+            for option in question.options or []
+            if not AnswerKey.from_question(question).grade(option)
+        ]
+
+        abandoned = False
+
+        async def prewarm(question: QuestionAnswer, option: str) -> None:
+            nonlocal abandoned
+            async with self._prewarm_slots:
+                if abandoned:
+                    return
+                # Stop spending tokens once nobody can ask for feedback; the
+                # check must not refresh the TTL of a session nobody uses
+                if not await self.sessions.has_session(session_id, touch=False):
+                    abandoned = True
+                    return
+                if self.explanations.contains(question.question, option, question.answer):
+                    return
+                try:
+                    await self.explanation_flights.do(
+                        _explanation_key(question.question, option, question.answer),
+                        lambda: self._generate_explanation(
+                            question.question, option, question.answer
+                        ),
+                    )
+                except Exception:
+                    # Best effort: the live stream generates it on demand
+                    pass
+
+        tasks = [asyncio.create_task(prewarm(q, option)) for q, option in distractors]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def close(self) -> None:
+        """Cancel pending explanation pre-generation"""
+        tasks = list(self._prewarm_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_question_by_id(
         self, question_id: str, session_id: str = "default"
     ) -> Optional[QuestionAnswer]:
         """Retrieve a question by its ID for a specific session"""
-        session_data = self.sessions_storage.get(session_id)
-        if not session_data:
-            return None
-
-        _, questions_dict = session_data
-        return questions_dict.get(question_id)
+        return await self.sessions.get_question(session_id, question_id)
 
-    def update_question(
+    async def update_question(
         self, question_update: QuestionUpdateRequest, session_id: str = "default"
     ) -> QuestionAnswer:
         """
@@ -250,12 +843,11 @@ class QuizManagementService:
         Raises:
             HTTPException: If question not found
         """
-        session_data = self.sessions_storage.get(session_id)
-        if not session_data:
+        if not await self.sessions.has_session(session_id):
             raise HTTPException(status_code=404, detail="Session not found")
 
-        quiz_title, questions_dict = session_data
-        if question_update.id not in questions_dict:
+        previous = await self.sessions.get_question(session_id, question_update.id)
+        if previous is None:
             raise HTTPException(status_code=404, detail="Question not found")
 
         # Validate that the correct answer is one of the options (with flexible matching)
@@ -287,48 +879,162 @@ class QuizManagementService:
             options=question_update.options,
         )
 
-        questions_dict[question_update.id] = updated_question
-        self.sessions_storage[session_id] = (quiz_title, questions_dict)
+        await self.sessions.put_question(session_id, updated_question)
+        # Explanations written for the old wording or answer are stale
+        self.explanations.invalidate(previous.question)
+        self.explanations.invalidate(updated_question.question)
         return updated_question
 
-    def check_answer(self, answer_request: AnswerRequest) -> AnswerResponse:
+    async def _resolve_question(
+        self, answer_request: AnswerRequest, session_id: str
+    ) -> QuestionAnswer:
+        """
+        Find the question being answered
+
+        Stateless clients send the full quiz in ``answer_request.questions``;
+        otherwise the question is looked up by id in the quiz stored for the
+        session.
+
+        Raises:
+            HTTPException: If the question is not found
         """
-        Check if the provided answer is correct. This method is stateless.
+        if answer_request.questions is not None:
+            question = next(
+                (
+                    q
+                    for q in answer_request.questions
+                    if q.id == answer_request.question_id
+                ),
+                None,
+            )
+            if not question:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Question not found in provided quiz context",
+                )
+            return question
+
+        question = await self.sessions.get_question(
+            session_id, answer_request.question_id
+        )
+        if not question:
+            raise HTTPException(status_code=404, detail="Question not found in session")
+        return question
+
+    async def check_answer(
+        self, answer_request: AnswerRequest, session_id: str = "default"
+    ) -> AnswerResponse:
+        """
+        Check if the provided answer is correct
 
         Args:
-            answer_request: The answer to check, including the list of questions.
+            answer_request: The answer to check, optionally with the list of questions
+            session_id: Session whose stored quiz is used when no list is sent
 
         Returns:
             AnswerResponse with correctness and explanation
 
         Raises:
-            HTTPException: If question not found in the provided list
+            HTTPException: If question not found
         """
-        question = next(
-            (q for q in answer_request.questions if q.id == answer_request.question_id),
-            None,
-        )
+        answer_key = await self._resolve_answer_key(answer_request, session_id)
+        return self._grade(answer_key, answer_request.user_answer)
 
-        if not question:
+    async def grade_quiz(
+        self, grade_request: GradeQuizRequest, session_id: str = "default"
+    ) -> GradeQuizResponse:
+        """
+        Grade all submitted answers of a quiz in one pass
+
+        Args:
+            grade_request: Answers to grade, optionally with the list of questions
+            session_id: Session whose stored quiz is used when no list is sent
+
+        Returns:
+            GradeQuizResponse with per-question results and the overall score
+
+        Raises:
+            HTTPException: If the session or any answered question is not found
+        """
+        if grade_request.questions is not None:
+            answer_keys = {
+                question.id: AnswerKey.from_question(question)
+                for question in grade_request.questions
+            }
+        else:
+            answer_keys = await self.sessions.get_answer_keys(session_id)
+            if answer_keys is None:
+                raise HTTPException(status_code=404, detail="Session not found")
+
+        # The last answer submitted for a question wins
+        answers = {
+            answer.question_id: answer.user_answer for answer in grade_request.answers
+        }
+        unknown = [qid for qid in answers if qid not in answer_keys]
+        if unknown:
             raise HTTPException(
-                status_code=404, detail="Question not found in provided quiz context"
+                status_code=404,
+                detail=f"Questions not found in quiz: {', '.join(unknown)}",
             )
 
-        correct_answer = question.answer
-        user_answer = answer_request.user_answer.strip()
-
-        # Check if the user's answer matches the correct answer (case-insensitive)
-        is_correct = user_answer.lower() == correct_answer.lower()
-
-        # If it's a multiple choice question, also check if any option matches
-        if not is_correct and question.options:
-            for option in question.options:
-                if (
-                    user_answer.lower() == option.lower()
-                    and option.lower() == correct_answer.lower()
-                ):
-                    is_correct = True
-                    break
+        results = [
+            GradedAnswer(
+                question_id=question_id,
+                **self._grade(answer_keys[question_id], user_answer).model_dump(),
+            )
+            for question_id, user_answer in answers.items()
+        ]
+        correct_count = sum(result.correct for result in results)
+        total = len(answer_keys)
+
+        return GradeQuizResponse(
+            results=results,
+            correct_count=correct_count,
+            answered_count=len(results),
+            total_questions=total,
+            score=correct_count / total if total else 0.0,
+        )
+
+    async def resolve_answer(
+        self, answer_request: AnswerRequest, session_id: str = "default"
+    ) -> Tuple[QuestionAnswer, AnswerKey]:
+        """
+        The question being answered and its answer key, from one lookup
+
+        Raises:
+            HTTPException: If the question is not found
+        """
+        question = await self._resolve_question(answer_request, session_id)
+        return question, AnswerKey.from_question(question)
+
+    async def _resolve_answer_key(
+        self, answer_request: AnswerRequest, session_id: str
+    ) -> AnswerKey:
+        """
+        Answer key of the question being answered
+
+        Stored quizzes have their keys precomputed when saved, so only
+        stateless requests build one here.
+
+        Raises:
+            HTTPException: If the question is not found
+        """
+        if answer_request.questions is not None:
+            return AnswerKey.from_question(
+                await self._resolve_question(answer_request, session_id)
+            )
+
+        answer_key = await self.sessions.get_answer_key(
+            session_id, answer_request.question_id
+        )
+        if answer_key is None:
+            raise HTTPException(status_code=404, detail="Question not found in session")
+        return answer_key
+
+    def _grade(self, answer_key: AnswerKey, user_answer: str) -> AnswerResponse:
+        """Grade one answer against a precomputed answer key"""
+        correct_answer = answer_key.answer
+        is_correct = answer_key.grade(user_answer, self.fuzzy_threshold)
 
         explanation = (
             "Correct! Well done!"
@@ -341,67 +1047,137 @@ class QuizManagementService:
         )
 
     async def get_streaming_feedback(
-        self, answer_request: AnswerRequest
+        self, question: QuestionAnswer, answer_key: AnswerKey, user_answer: str
     ) -> AsyncGenerator[str, None]:
         """
-        Get personalized streaming feedback. This method is stateless.
+        Get personalized streaming feedback
+
+        The question is resolved by the caller before the response starts,
+        so a missing question or session is a 404 rather than an error in
+        the middle of an event stream.
 
         Args:
-            answer_request: The answer request, including the list of questions.
+            question: The question being answered
+            answer_key: Answer key of that question
+            user_answer: The submitted answer
 
         Yields:
-            Streaming text chunks with personalized feedback
-
-        Raises:
-            HTTPException: If question not found or streaming fails
+            Server-Sent Events with coalesced feedback text, heartbeats and
+            a final ``done`` event, or an ``error`` event if the explanation
+            cannot be generated
         """
-        question = next(
-            (q for q in answer_request.questions if q.id == answer_request.question_id),
-            None,
-        )
+        user_answer = user_answer.strip()
+        is_correct = answer_key.grade(user_answer, self.fuzzy_threshold)
 
-        if not question:
-            raise HTTPException(
-                status_code=404, detail="Question not found in provided quiz context"
+        try:
+            async for event in stream_events(
+                self._feedback_deltas(question, user_answer, is_correct),
+                window_seconds=self.sse_window_seconds,
+                max_bytes=self.sse_max_event_bytes,
+                heartbeat_seconds=self.sse_heartbeat_seconds,
+            ):
+                yield event
+        except Exception:
+            # Provider error details are for the logs, never for students
+            logger.exception("Feedback explanation failed")
+            yield format_event(
+                json.dumps({"detail": FEEDBACK_ERROR_DETAIL}), event="error"
             )
 
+    async def _feedback_deltas(
+        self, question: QuestionAnswer, user_answer: str, is_correct: bool
+    ) -> AsyncGenerator[str, None]:
+        """Plain-text feedback fragments, before SSE framing"""
         correct_answer = question.answer
-        user_answer = answer_request.user_answer.strip()
-
-        # Check if the user's answer matches the correct answer (case-insensitive)
-        is_correct = user_answer.lower() == correct_answer.lower()
-
-        # If it's a multiple choice question, also check if any option matches
-        if not is_correct and question.options:
-            for option in question.options:
-                if (
-                    user_answer.lower() == option.lower()
-                    and option.lower() == correct_answer.lower()
-                ):
-                    is_correct = True
-                    break
 
         # If answer is correct, just return simple confirmation
         if is_correct:
-            yield "data: Correct! Well done!\n\n"
+            yield "Correct! Well done!"
             return
 
-        # For incorrect answers, generate personalized streaming feedback
-        try:
-            # Initialize OpenAI client
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise HTTPException(
-                    status_code=500, detail="OpenAI API key not configured"
-                )
+        # For incorrect answers, replay a cached explanation or stream a new
+        # one; failures end the stream with an error event
+        explanation = self.explanations.get(
+            question.question, user_answer, correct_answer
+        )
+        if explanation is not None:
+            pieces = _replay(explanation)
+        else:
+            pieces = self._shared_explanation(
+                question.question, user_answer, correct_answer
+            )
 
-            client = OpenAI(api_key=api_key)
+        async for piece in pieces:
+            yield piece
+
+    async def _shared_explanation(
+        self, question: str, user_answer: str, correct_answer: str
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream an explanation, with one LLM call per wrong answer at a time
+
+        The request that starts the generation streams it as it arrives;
+        requests for the same wrong answer while it runs, prewarming
+        included, join the call and replay the finished text.
+        """
+        deltas: asyncio.Queue = asyncio.Queue()
+        key = _explanation_key(question, user_answer, correct_answer)
+        joined = key in self.explanation_flights
+        flight = asyncio.ensure_future(
+            self.explanation_flights.do(
+                key,
+                lambda: self._generate_explanation(
+                    question, user_answer, correct_answer, deltas.put_nowait
+                ),
+            )
+        )
+        flight.add_done_callback(lambda _: deltas.put_nowait(None))
+        try:
+            while (piece := await deltas.get()) is not None:
+                yield piece
+            explanation = await flight
+            if joined:
+                async for piece in _replay(explanation):
+                    yield piece
+        finally:
+            if not flight.done():
+                # Leaving early only detaches this request; the call goes on
+                flight.cancel()
+            elif not flight.cancelled():
+                flight.exception()
+
+    async def _generate_explanation(
+        self,
+        question: str,
+        user_answer: str,
+        correct_answer: str,
+        on_delta: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Run one explanation call to completion, reporting each delta"""
+        pieces = []
+        async with aclosing(
+            self._stream_explanation(question, user_answer, correct_answer)
+        ) as stream:
+            async for piece in stream:
+                pieces.append(piece)
+                if on_delta is not None:
+                    on_delta(piece)
+        return "".join(pieces)
+
+    async def _stream_explanation(
+        self, question: str, user_answer: str, correct_answer: str
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream personalized feedback from the LLM, caching it once complete
 
-            # Build prompt for personalized feedback
-            feedback_prompt = f"""
+        Yields:
+            Raw text deltas as they arrive
+        """
+        # Build prompt for personalized feedback
+        feedback_prompt = f"""
             The user answered a quiz question incorrectly. Provide helpful, encouraging feedback.
             
-            Question: {question.question}
+            Question: {question}
             User's Answer: {user_answer}
             Correct Answer: {correct_answer}
             
@@ -413,9 +1189,11 @@ class QuizManagementService:
             Keep it concise (2-3 sentences max) and encouraging. Be supportive, not critical.
             """
 
-            # Stream the response from OpenAI
-            stream = client.chat.completions.create(
-                model="gpt-3.5-turbo",
+        # Stream the response from OpenAI through the shared gateway
+        explanation = []
+        async with aclosing(
+            self.llm.stream_chat(
+                model=self.feedback_model,
                 messages=[
                     {
                         "role": "system",
@@ -423,47 +1201,47 @@ class QuizManagementService:
                     },
                     {"role": "user", "content": feedback_prompt},
                 ],
-                stream=True,
                 temperature=0.7,
                 max_tokens=150,
             )
+        ) as stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content is not None:
+                    explanation.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+
+        # Only complete explanations are cached, never interrupted ones
+        if "".join(explanation).strip():
+            self.explanations.set(
+                question, user_answer, correct_answer, "".join(explanation)
+            )
 
-            # Buffer to accumulate word fragments
-            word_buffer = ""
-            
-            # Yield each chunk as Server-Sent Events format
-            for chunk in stream:
-                if chunk.choices[0].delta.content is not None:
-                    content = chunk.choices[0].delta.content
-                    word_buffer += content
-                    
-                    # Send complete words or chunks ending with punctuation
-                    if ' ' in word_buffer or any(p in word_buffer for p in '.!?,:;'):
-                        # Split on spaces but keep the space
-                        parts = word_buffer.split(' ')
-                        if len(parts) > 1:
-                            # Send all complete words
-                            for i, part in enumerate(parts[:-1]):
-                                if i > 0:  # Add space before words (except first)
-                                    yield "data:  \n\n"
-                                yield f"data: {part}\n\n"
-                            # Keep the last incomplete part in buffer
-                            word_buffer = parts[-1]
-                        else:
-                            # Single word with punctuation - send it
-                            yield f"data: {word_buffer}\n\n"
-                            word_buffer = ""
-            
-            # Send any remaining content
-            if word_buffer.strip():
-                yield f"data: {word_buffer}\n\n"
 
-            # Signal end of stream
-            yield "data: [DONE]\n\n"
+def _explanation_key(question: str, user_answer: str, correct_answer: str) -> str:
+    """Identity of an explanation, matching how ExplanationCache groups them"""
+    return "\n".join(
+        normalize_answer(text) for text in (question, user_answer, correct_answer)
+    )
 
-        except Exception as e:
-            # Fallback to basic feedback if streaming fails
-            yield f"data: The correct answer is: {correct_answer}. {str(e)}\n\n"
+
+def _retry_after_seconds(error: RateLimitError, default: int = 10) -> str:
+    """Whole seconds from the provider's Retry-After, for our own response"""
+    headers = error.response.headers
+    try:
+        if "retry-after-ms" in headers:
+            seconds = float(headers["retry-after-ms"]) / 1000
+        else:
+            seconds = float(headers["retry-after"])
+    except (KeyError, TypeError, ValueError):
+        # Missing, or an HTTP date rather than a number of seconds
+        return str(default)
+    return str(max(1, math.ceil(seconds)))
+
+
+async def _replay(text: str) -> AsyncGenerator[str, None]:
+    """Yield a cached explanation word by word, like LLM deltas"""
+    for word in _REPLAY_WORD.findall(text):
+        yield word
 
 
 # Global singleton instances - Best approach could be to use a database
@@ -0,0 +1,684 @@
+"""
+Quiz session storage - Pluggable stores for quizzes by session
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from src.common.cache import LRUCache
+from src.quiz.dto import QuestionAnswer, SessionStoreStats
+from src.quiz.grading import AnswerKey
+
+logger = logging.getLogger(__name__)
+
+
+class CompactQuestion(NamedTuple):
+    """Tuple-backed question with its answer key, far smaller than a model"""
+
+    id: str
+    question: str
+    answer: str
+    options: Optional[Tuple[str, ...]]
+    key: AnswerKey
+
+    @classmethod
+    def from_model(cls, question: QuestionAnswer) -> "CompactQuestion":
+        return cls(
+            question.id,
+            question.question,
+            question.answer,
+            tuple(question.options) if question.options is not None else None,
+            AnswerKey.from_question(question),
+        )
+
+    def to_model(self) -> QuestionAnswer:
+        return QuestionAnswer(
+            id=self.id,
+            question=self.question,
+            answer=self.answer,
+            options=list(self.options) if self.options is not None else None,
+        )
+
+
+class QuizSession(NamedTuple):
+    """A stored quiz: its title and questions keyed by question id"""
+
+    title: str
+    questions: Dict[str, CompactQuestion]
+
+
+def _approximate_size(session: QuizSession) -> int:
+    """Approximate memory footprint of a session in bytes"""
+    size = sys.getsizeof(session.title) + sys.getsizeof(session.questions)
+    for question in session.questions.values():
+        size += sys.getsizeof(question)
+        size += sum(sys.getsizeof(field) for field in question[:3])
+        for option in question.options or ():
+            size += sys.getsizeof(option)
+        size += sys.getsizeof(question.key) + sys.getsizeof(question.key.accepted)
+        size += sum(sys.getsizeof(form) for form in question.key.accepted)
+        size += sum(sys.getsizeof(choice) for choice in question.key.choices)
+    return size
+
+
+class SessionStore(ABC):
+    """
+    Backend interface for storing quizzes by session
+
+    Methods are coroutines so backends doing I/O keep it off the event loop.
+    """
+
+    @abstractmethod
+    async def store_session(
+        self, session_id: str, quiz_title: str, questions: List[QuestionAnswer]
+    ) -> None:
+        """Replace the quiz stored for a session"""
+
+    @abstractmethod
+    async def get_session(
+        self, session_id: str
+    ) -> Optional[Tuple[str, List[QuestionAnswer]]]:
+        """Title and questions of a session, or None if unknown or expired"""
+
+    @abstractmethod
+    async def has_session(self, session_id: str, touch: bool = True) -> bool:
+        """
+        Whether the session exists and has not expired
+
+        Args:
+            session_id: The session ID
+            touch: Refresh the session's TTL, as any other read does; pass
+                False for checks that must not keep an idle session alive
+        """
+
+    @abstractmethod
+    async def get_question(
+        self, session_id: str, question_id: str
+    ) -> Optional[QuestionAnswer]:
+        """A single question of a session, or None if either is missing"""
+
+    @abstractmethod
+    async def get_answer_key(
+        self, session_id: str, question_id: str
+    ) -> Optional[AnswerKey]:
+        """Precomputed answer key of a question, or None if either is missing"""
+
+    @abstractmethod
+    async def get_answer_keys(self, session_id: str) -> Optional[Dict[str, AnswerKey]]:
+        """Answer keys of every question by id, or None if the session is missing"""
+
+    @abstractmethod
+    async def put_question(self, session_id: str, question: QuestionAnswer) -> bool:
+        """
+        Replace one question of an existing session
+
+        Returns:
+            False if the session or the question does not exist
+        """
+
+    @abstractmethod
+    async def stats(self) -> SessionStoreStats:
+        """Occupancy, eviction and expiry counters"""
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Per-process session store with sliding TTL, LRU entry cap and byte budget
+
+    Sessions idle for longer than the TTL expire; when the entry cap or the
+    byte budget is exceeded the least recently used sessions are evicted.
+    Expiry is amortized across writes by the underlying LRUCache.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = 24 * 3600,
+        max_entries: int = 10_000,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+    ):
+        self._sessions: LRUCache[QuizSession] = LRUCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            max_bytes=max_bytes,
+            sizeof=_approximate_size,
+            refresh_on_access=True,
+        )
+
+    async def store_session(
+        self, session_id: str, quiz_title: str, questions: List[QuestionAnswer]
+    ) -> None:
+        """Replace the quiz stored for a session"""
+        self._sessions.set(
+            session_id,
+            QuizSession(
+                quiz_title, {q.id: CompactQuestion.from_model(q) for q in questions}
+            ),
+        )
+
+    async def get_session(
+        self, session_id: str
+    ) -> Optional[Tuple[str, List[QuestionAnswer]]]:
+        """Title and questions of a session, or None if unknown or expired"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        return session.title, [q.to_model() for q in session.questions.values()]
+
+    async def has_session(self, session_id: str, touch: bool = True) -> bool:
+        if touch:
+            return self._sessions.get(session_id) is not None
+        return session_id in self._sessions
+
+    async def get_question(
+        self, session_id: str, question_id: str
+    ) -> Optional[QuestionAnswer]:
+        """A single question of a session, or None if either is missing"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        question = session.questions.get(question_id)
+        return question.to_model() if question is not None else None
+
+    async def get_answer_key(
+        self, session_id: str, question_id: str
+    ) -> Optional[AnswerKey]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        question = session.questions.get(question_id)
+        return question.key if question is not None else None
+
+    async def get_answer_keys(self, session_id: str) -> Optional[Dict[str, AnswerKey]]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        return {qid: question.key for qid, question in session.questions.items()}
+
+    async def put_question(self, session_id: str, question: QuestionAnswer) -> bool:
+        """
+        Replace one question of an existing session
+
+        Returns:
+            False if the session or the question does not exist
+        """
+        session = self._sessions.get(session_id)
+        if session is None or question.id not in session.questions:
+            return False
+
+        questions = dict(session.questions)
+        questions[question.id] = CompactQuestion.from_model(question)
+        # Re-set so the byte accounting reflects the edited question
+        self._sessions.set(session_id, QuizSession(session.title, questions))
+        return True
+
+    async def stats(self) -> SessionStoreStats:
+        """Occupancy, eviction and expiry counters"""
+        counters = self._sessions.stats()
+        return SessionStoreStats(
+            sessions=counters["entries"],
+            approximate_bytes=counters["bytes"],
+            max_sessions=self._sessions.max_entries,
+            max_bytes=self._sessions.max_bytes,
+            ttl_seconds=self._sessions.ttl_seconds,
+            backend="memory",
+            hits=counters["hits"],
+            misses=counters["misses"],
+            evictions=counters["evictions"],
+            expirations=counters["expirations"],
+        )
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Session store in a SQLite database shared by all workers on one host
+
+    The database runs in WAL mode so readers never block the single writer
+    and several uvicorn workers can open the same file. Questions are keyed
+    by (session_id, question_id), so single-question reads and updates are
+    primary-key lookups, and storing a quiz writes all of its questions in
+    one transaction. Sessions expire after ``ttl_seconds`` without access;
+    expired and over-cap sessions are purged every ``PURGE_INTERVAL`` writes.
+
+    Every query runs in a worker thread, never on the event loop. Reads only
+    read: the TTL refresh they imply is kept in memory and written for all
+    sessions read since the last flush in one transaction, at most every
+    ``TOUCH_INTERVAL_SECONDS`` and before each write.
+    """
+
+    # Writes between purges of expired and over-cap sessions
+    PURGE_INTERVAL = 64
+    # Pending TTL refreshes from reads are written at most this often
+    TOUCH_INTERVAL_SECONDS = 60.0
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            touched_at REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS sessions_touched_at ON sessions (touched_at);
+        CREATE TABLE IF NOT EXISTS questions (
+            session_id TEXT NOT NULL
+                REFERENCES sessions (session_id) ON DELETE CASCADE,
+            question_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            question TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            options TEXT,
+            answer_key TEXT,
+            PRIMARY KEY (session_id, question_id)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = 24 * 3600,
+        max_entries: int = 100_000,
+        busy_timeout_seconds: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        # Read times not yet written to touched_at, by session
+        self._touches: Dict[str, float] = {}
+        self._touches_flushed_at = clock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.executescript(self._SCHEMA)
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(questions)")}
+        if "answer_key" not in columns:
+            # Databases created before answer keys were stored
+            connection.execute("ALTER TABLE questions ADD COLUMN answer_key TEXT")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection for the calling thread; sqlite3 connections are per-thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_seconds,
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+        return connection
+
+    async def _run(self, function: Callable, *args):
+        """Run a blocking database call in a worker thread"""
+        result = await asyncio.to_thread(function, *args)
+        self._schedule_touch_flush()
+        return result
+
+    def _cutoff(self) -> float:
+        if self.ttl_seconds is None:
+            return float("-inf")
+        return self._clock() - self.ttl_seconds
+
+    def _count(self, found: bool) -> None:
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _live_session(
+        self, connection: sqlite3.Connection, session_id: str, touch: bool = True
+    ):
+        """(title, touched_at) of an unexpired session, noting the read if ``touch``"""
+        row = connection.execute(
+            "SELECT title, touched_at FROM sessions WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        with self._lock:
+            if row is not None:
+                touched_at = max(row[1], self._touches.get(session_id, row[1]))
+                if touched_at < self._cutoff():
+                    row = None
+                elif touch:
+                    self._touches[session_id] = self._clock()
+        self._count(row is not None)
+        return row
+
+    def _take_touches(self) -> Dict[str, float]:
+        with self._lock:
+            touches, self._touches = self._touches, {}
+            self._touches_flushed_at = self._clock()
+        return touches
+
+    def _restore_touches(self, touches: Dict[str, float]) -> None:
+        """Put back refreshes whose transaction failed, for the next flush"""
+        with self._lock:
+            for session_id, touched_at in touches.items():
+                self._touches[session_id] = max(
+                    touched_at, self._touches.get(session_id, touched_at)
+                )
+
+    @staticmethod
+    def _write_touches(
+        connection: sqlite3.Connection, touches: Dict[str, float]
+    ) -> None:
+        connection.executemany(
+            "UPDATE sessions SET touched_at = MAX(touched_at, ?) WHERE session_id = ?",
+            [(touched_at, session_id) for session_id, touched_at in touches.items()],
+        )
+
+    def _flush_touches(self) -> None:
+        """Write the TTL refreshes of every session read since the last flush"""
+        touches = self._take_touches()
+        if not touches:
+            return
+        connection = self._connection()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._write_touches(connection, touches)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except BaseException:
+            self._restore_touches(touches)
+            raise
+
+    def _schedule_touch_flush(self) -> None:
+        """Flush pending TTL refreshes in the background once they are due"""
+        with self._lock:
+            due = (
+                self._touches
+                and self._clock() - self._touches_flushed_at
+                >= self.TOUCH_INTERVAL_SECONDS
+                and (self._flush_task is None or self._flush_task.done())
+            )
+        if due:
+            self._flush_task = asyncio.create_task(self._flush_in_background())
+
+    async def _flush_in_background(self) -> None:
+        try:
+            await asyncio.to_thread(self._flush_touches)
+        except sqlite3.Error as e:
+            logger.warning("Session TTL refresh failed: %s", e)
+
+    @staticmethod
+    def _to_model(row) -> QuestionAnswer:
+        question_id, question, answer, options = row
+        return QuestionAnswer(
+            id=question_id,
+            question=question,
+            answer=answer,
+            options=json.loads(options) if options is not None else None,
+        )
+
+    @staticmethod
+    def _options(question: QuestionAnswer) -> Optional[str]:
+        return json.dumps(question.options) if question.options is not None else None
+
+    async def store_session(
+        self, session_id: str, quiz_title: str, questions: List[QuestionAnswer]
+    ) -> None:
+        """Replace the quiz stored for a session in a single transaction"""
+        await self._run(self._store_session, session_id, quiz_title, questions)
+
+    def _store_session(
+        self, session_id: str, quiz_title: str, questions: List[QuestionAnswer]
+    ) -> None:
+        rows = [
+            (
+                session_id,
+                q.id,
+                position,
+                q.question,
+                q.answer,
+                self._options(q),
+                AnswerKey.from_question(q).to_json(),
+            )
+            for position, q in enumerate(questions)
+        ]
+        connection = self._connection()
+        touches: Dict[str, float] = {}
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Deleting the session cascades to its previous questions
+            connection.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+            connection.execute(
+                "INSERT INTO sessions (session_id, title, touched_at) VALUES (?, ?, ?)",
+                (session_id, quiz_title, self._clock()),
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO questions (session_id, question_id,"
+                " position, question, answer, options, answer_key)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if self._due_for_purge():
+                touches = self._take_touches()
+                self._purge(connection, touches)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            self._restore_touches(touches)
+            raise
+
+    async def get_session(
+        self, session_id: str
+    ) -> Optional[Tuple[str, List[QuestionAnswer]]]:
+        return await self._run(self._get_session, session_id)
+
+    def _get_session(
+        self, session_id: str
+    ) -> Optional[Tuple[str, List[QuestionAnswer]]]:
+        connection = self._connection()
+        session = self._live_session(connection, session_id)
+        if session is None:
+            return None
+        rows = connection.execute(
+            "SELECT question_id, question, answer, options FROM questions"
+            " WHERE session_id = ? ORDER BY position",
+            (session_id,),
+        ).fetchall()
+        return session[0], [self._to_model(row) for row in rows]
+
+    async def has_session(self, session_id: str, touch: bool = True) -> bool:
+        return await self._run(self._has_session, session_id, touch)
+
+    def _has_session(self, session_id: str, touch: bool) -> bool:
+        return self._live_session(self._connection(), session_id, touch) is not None
+
+    async def get_question(
+        self, session_id: str, question_id: str
+    ) -> Optional[QuestionAnswer]:
+        return await self._run(self._get_question, session_id, question_id)
+
+    def _get_question(
+        self, session_id: str, question_id: str
+    ) -> Optional[QuestionAnswer]:
+        connection = self._connection()
+        if self._live_session(connection, session_id) is None:
+            return None
+        row = connection.execute(
+            "SELECT question_id, question, answer, options FROM questions"
+            " WHERE session_id = ? AND question_id = ?",
+            (session_id, question_id),
+        ).fetchone()
+        return self._to_model(row) if row is not None else None
+
+    def _answer_key(self, row) -> AnswerKey:
+        """Stored answer key, rebuilt for rows written without one"""
+        question_id, question, answer, options, answer_key = row
+        if answer_key is not None:
+            return AnswerKey.from_json(answer_key)
+        return AnswerKey.from_question(
+            self._to_model((question_id, question, answer, options))
+        )
+
+    async def get_answer_key(
+        self, session_id: str, question_id: str
+    ) -> Optional[AnswerKey]:
+        return await self._run(self._get_answer_key, session_id, question_id)
+
+    def _get_answer_key(self, session_id: str, question_id: str) -> Optional[AnswerKey]:
+        connection = self._connection()
+        if self._live_session(connection, session_id) is None:
+            return None
+        row = connection.execute(
+            "SELECT question_id, question, answer, options, answer_key"
+            " FROM questions WHERE session_id = ? AND question_id = ?",
+            (session_id, question_id),
+        ).fetchone()
+        return self._answer_key(row) if row is not None else None
+
+    async def get_answer_keys(self, session_id: str) -> Optional[Dict[str, AnswerKey]]:
+        return await self._run(self._get_answer_keys, session_id)
+
+    def _get_answer_keys(self, session_id: str) -> Optional[Dict[str, AnswerKey]]:
+        connection = self._connection()
+        if self._live_session(connection, session_id) is None:
+            return None
+        rows = connection.execute(
+            "SELECT question_id, question, answer, options, answer_key"
+            " FROM questions WHERE session_id = ? ORDER BY position",
+            (session_id,),
+        ).fetchall()
+        return {row[0]: self._answer_key(row) for row in rows}
+
+    async def put_question(self, session_id: str, question: QuestionAnswer) -> bool:
+        return await self._run(self._put_question, session_id, question)
+
+    def _put_question(self, session_id: str, question: QuestionAnswer) -> bool:
+        connection = self._connection()
+        touches = self._take_touches()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Sessions only kept alive by recent reads count as live here too
+            self._write_touches(connection, touches)
+            updated = connection.execute(
+                "UPDATE questions"
+                " SET question = ?, answer = ?, options = ?, answer_key = ?"
+                " WHERE session_id = ? AND question_id = ? AND EXISTS ("
+                "   SELECT 1 FROM sessions"
+                "   WHERE session_id = ? AND touched_at >= ?)",
+                (
+                    question.question,
+                    question.answer,
+                    self._options(question),
+                    AnswerKey.from_question(question).to_json(),
+                    session_id,
+                    question.id,
+                    session_id,
+                    self._cutoff(),
+                ),
+            ).rowcount
+            if updated:
+                connection.execute(
+                    "UPDATE sessions SET touched_at = ? WHERE session_id = ?",
+                    (self._clock(), session_id),
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            self._restore_touches(touches)
+            raise
+        return bool(updated)
+
+    def _due_for_purge(self) -> bool:
+        with self._lock:
+            self._writes += 1
+            return self._writes % self.PURGE_INTERVAL == 0
+
+    def _purge(
+        self, connection: sqlite3.Connection, touches: Dict[str, float]
+    ) -> None:
+        """Delete expired sessions, then the least recently used over the cap"""
+        # Recent reads must count before anything is judged expired or idle
+        self._write_touches(connection, touches)
+        expired = connection.execute(
+            "DELETE FROM sessions WHERE touched_at < ?", (self._cutoff(),)
+        ).rowcount
+        evicted = connection.execute(
+            "DELETE FROM sessions WHERE session_id IN ("
+            " SELECT session_id FROM sessions"
+            " ORDER BY touched_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        with self._lock:
+            self.expirations += expired
+            self.evictions += evicted
+
+    async def stats(self) -> SessionStoreStats:
+        """Database occupancy plus this worker's hit, eviction and expiry counters"""
+        return await self._run(self._stats)
+
+    def _stats(self) -> SessionStoreStats:
+        connection = self._connection()
+        sessions = connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        pages = connection.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        return SessionStoreStats(
+            sessions=sessions,
+            approximate_bytes=(pages - free_pages) * page_size,
+            max_sessions=self.max_entries,
+            max_bytes=None,
+            ttl_seconds=self.ttl_seconds,
+            backend="sqlite",
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+        )
+
+
+def create_session_store() -> SessionStore:
+    """
+    Build the session store selected by SESSION_BACKEND
+
+    ``memory`` (default) keeps sessions in the worker process; ``sqlite``
+    shares them between all workers through SESSION_SQLITE_PATH.
+    """
+    backend = os.getenv("SESSION_BACKEND", "memory").lower()
+    ttl_seconds = float(os.getenv("SESSION_TTL_SECONDS", str(24 * 3600)))
+    max_entries = int(os.getenv("SESSION_MAX_ENTRIES", "10000"))
+
+    if backend == "sqlite":
+        return SqliteSessionStore(
+            path=os.getenv(
+                "SESSION_SQLITE_PATH",
+                os.path.join(tempfile.gettempdir(), "quiz-generator-sessions.db"),
+            ),
+            ttl_seconds=ttl_seconds,
+            max_entries=max_entries,
+        )
+    if backend != "memory":
+        raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
+
+    return MemorySessionStore(
+        ttl_seconds=ttl_seconds,
+        max_entries=max_entries,
+        max_bytes=int(float(os.getenv("SESSION_MAX_MB", "256")) * 1024 * 1024),
+    )
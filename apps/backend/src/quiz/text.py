@@ -0,0 +1,176 @@
+"""
+Quiz text utilities - Token estimates and section splitting for prompts
+"""
+
+import math
+import re
+from typing import Callable, List
+
+# Rough average for English prose with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+# Upper bound in practice; longer texts exceed a budget without being counted
+MAX_CHARS_PER_TOKEN = 32
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+_WORD_BOUNDARY = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text on sentence-ending punctuation, dropping empty pieces"""
+    return [s for s in _SENTENCE_BOUNDARY.split(text) if s.strip()]
+
+
+def split_into_sections(
+    text: str,
+    max_tokens: int,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+) -> List[str]:
+    """
+    Split text into consecutive sections of at most ``max_tokens`` each
+
+    Sections are packed greedily from whole sentences; a single sentence
+    longer than the budget is split on words (or, failing that, characters)
+    so no section exceeds it.
+
+    Args:
+        text: Full document text
+        max_tokens: Token budget per section
+        count_tokens: Token counter for the target model
+
+    Returns:
+        Sections in document order
+    """
+    if max_tokens <= 0:
+        return []
+
+    sections: List[str] = []
+    current: List[str] = []
+    # One token per joining space, which never undercounts the joined section
+    used = 0
+
+    for sentence in split_sentences(text):
+        for piece in _split_long(sentence, max_tokens, count_tokens):
+            size = count_tokens(piece) + 1
+            if current and used + size > max_tokens:
+                _close_section(current, max_tokens, count_tokens, sections)
+                current, used = [], 0
+            current.append(piece)
+            used += size
+
+    if current:
+        _close_section(current, max_tokens, count_tokens, sections)
+    return sections
+
+
+def _split_long(
+    sentence: str, max_tokens: int, count_tokens: Callable[[str], int]
+) -> List[str]:
+    """Cut a sentence into pieces of at most ``max_tokens`` each"""
+    pieces: List[str] = []
+    rest = sentence
+    while not fits_in_tokens(rest, max_tokens, count_tokens):
+        piece = fit_to_tokens(rest, max_tokens, count_tokens)
+        if not piece:
+            # No word fits: halve a character window until it does
+            size = max_tokens * MAX_CHARS_PER_TOKEN
+            while size > 1 and count_tokens(rest[:size]) > max_tokens:
+                size //= 2
+            piece = rest[:size]
+        pieces.append(piece)
+        rest = rest[len(piece) :].lstrip()
+    if rest:
+        pieces.append(rest)
+    return pieces
+
+
+def _close_section(
+    pieces: List[str],
+    max_tokens: int,
+    count_tokens: Callable[[str], int],
+    sections: List[str],
+) -> None:
+    """Append the joined pieces, halving them in the rare case the join is over"""
+    section = " ".join(pieces)
+    if len(pieces) > 1 and count_tokens(section) > max_tokens:
+        middle = len(pieces) // 2
+        _close_section(pieces[:middle], max_tokens, count_tokens, sections)
+        _close_section(pieces[middle:], max_tokens, count_tokens, sections)
+    else:
+        sections.append(section)
+
+
+def spread_evenly(items: List[str], limit: int) -> List[str]:
+    """Pick at most ``limit`` items spaced evenly from start to end"""
+    if len(items) <= limit:
+        return items
+    step = len(items) / limit
+    return [items[int(i * step)] for i in range(limit)]
+
+
+def fits_in_tokens(
+    text: str,
+    max_tokens: int,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+) -> bool:
+    """Whether ``text`` is within ``max_tokens``, without counting huge texts"""
+    if len(text) > max_tokens * MAX_CHARS_PER_TOKEN:
+        return False
+    return count_tokens(text) <= max_tokens
+
+
+def fit_to_tokens(
+    text: str,
+    max_tokens: int,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+) -> str:
+    """
+    Longest prefix of ``text`` within ``max_tokens``, cut on a sentence boundary
+
+    Falls back to a word boundary when even the first sentence is too long.
+    The original whitespace, paragraph breaks included, is preserved.
+
+    Args:
+        text: Text to fit
+        max_tokens: Token budget
+        count_tokens: Token counter for the target model
+
+    Returns:
+        The fitted prefix (the whole text if it already fits)
+    """
+    if max_tokens <= 0:
+        return ""
+    if fits_in_tokens(text, max_tokens, count_tokens):
+        return text
+
+    # Only the start of a long text can make it into the prefix
+    window = text[: max_tokens * MAX_CHARS_PER_TOKEN]
+    for boundary in (_SENTENCE_BOUNDARY, _WORD_BOUNDARY):
+        cuts = [match.start() for match in boundary.finditer(window)]
+        fitted = _longest_prefix(window, cuts, max_tokens, count_tokens)
+        if fitted:
+            return fitted
+    return ""
+
+
+def _longest_prefix(
+    text: str, cuts: List[int], max_tokens: int, count_tokens: Callable[[str], int]
+) -> str:
+    """Longest ``text[:cut]`` within the budget, summing per-piece counts"""
+    used = 0
+    start = 0
+    best = 0
+    for cut in cuts:
+        used += count_tokens(text[start:cut])
+        if used > max_tokens:
+            break
+        best, start = cut, cut
+
+    # Pieces are counted separately; confirm the joined prefix fits
+    while best and count_tokens(text[:best]) > max_tokens:
+        best = max((cut for cut in cuts if cut < best), default=0)
+    return text[:best]
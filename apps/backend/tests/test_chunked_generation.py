@@ -0,0 +1,49 @@
+import asyncio
+import math
+
+from src.llm.fake import FakeLLMProvider
+from src.llm.gateway import LLMGateway
+from src.llm.tokens import TokenCounter
+from src.quiz.cache import QuizGenerationCache
+from src.quiz.services import QuizGenerationService
+
+
+class RecordingProvider(FakeLLMProvider):
+    def __init__(self):
+        super().__init__(latency_seconds=0, jitter_seconds=0, tokens_per_second=0)
+        self.prompts = []
+
+    async def create(self, **request):
+        self.prompts.append(request["messages"][-1]["content"])
+        return await super().create(**request)
+
+
+class DenseTokenCounter(TokenCounter):
+    """Twice as many tokens per character as the generic estimate assumes"""
+
+    def count(self, text):
+        return math.ceil(len(text) / 2)
+
+
+def test_chunked_sections_reach_the_prompt_untruncated(tmp_path):
+    provider = RecordingProvider()
+    service = QuizGenerationService(
+        llm_gateway=LLMGateway(provider=provider),
+        cache=QuizGenerationCache(str(tmp_path), enabled=False),
+    )
+    service.tokens = DenseTokenCounter(service.model)
+    service.prompt_text_tokens = 120
+    service.max_sections = 100
+    service.passage_selector = None
+
+    sentences = [f"Fact number {i} concerns topic {i * 7}." for i in range(60)]
+    asyncio.run(
+        service.generate_questions_from_text(
+            " ".join(sentences), num_questions=5, mode="chunked"
+        )
+    )
+
+    # Every sentence lands whole in some section prompt
+    missing = [s for s in sentences if not any(s in p for p in provider.prompts)]
+    assert len(provider.prompts) > 1
+    assert missing == []
@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from src.llm.fake import FakeLLMProvider
+from src.llm.gateway import LLMGateway
+from src.quiz.dto import QuestionAnswer
+from src.quiz.explanations import ExplanationCache
+from src.quiz.grading import AnswerKey
+from src.quiz.services import FEEDBACK_ERROR_DETAIL, QuizManagementService
+from src.quiz.sessions import MemorySessionStore
+
+QUESTION = QuestionAnswer(
+    id="1",
+    question="What does osmosis move across a membrane?",
+    answer="Water",
+    options=["Water", "Salt", "Light", "Heat"],
+)
+
+
+def _events(error_rate):
+    provider = FakeLLMProvider(
+        latency_seconds=0, jitter_seconds=0, tokens_per_second=0, error_rate=error_rate
+    )
+    service = QuizManagementService(
+        llm_gateway=LLMGateway(provider=provider, max_retries=0),
+        session_store=MemorySessionStore(),
+        explanation_cache=ExplanationCache(enabled=False),
+    )
+
+    async def collect():
+        stream = service.get_streaming_feedback(
+            QUESTION, AnswerKey.from_question(QUESTION), "Salt"
+        )
+        return [event async for event in stream]
+
+    return asyncio.run(collect())
+
+
+def test_explanation_streams_and_ends_with_done():
+    events = _events(error_rate=0.0)
+    assert events[-1].startswith("id: ") and "event: done" in events[-1]
+    assert not any("event: error" in event for event in events)
+
+
+def test_llm_failure_ends_with_a_generic_error_event():
+    events = _events(error_rate=1.0)
+    assert len(events) == 1
+    assert events[0].startswith("event: error\n")
+    data = json.loads(events[0].split("data: ", 1)[1])
+    assert data == {"detail": FEEDBACK_ERROR_DETAIL}
+    assert "server had an error" not in events[0]
@@ -0,0 +1,66 @@
+from src.quiz.dto import QuestionAnswer
+from src.quiz.grading import AnswerKey, normalize_answer
+
+
+def _key(answer, options=None):
+    return AnswerKey.from_question(
+        QuestionAnswer(id="1", question="Q?", answer=answer, options=options)
+    )
+
+
+def test_normalize_answer_casefolds_and_squashes_whitespace():
+    assert normalize_answer("  The   Mitochondria. ") == "the mitochondria"
+
+
+def test_normalize_answer_unifies_unicode_forms():
+    assert normalize_answer("Ｃａｆé") == normalize_answer("café")
+
+
+def test_normalize_answer_can_keep_punctuation():
+    assert normalize_answer("C++", strip_punctuation=False) == "c++"
+
+
+def test_grade_ignores_case_spacing_and_punctuation():
+    key = _key("Paris", ["Paris", "London", "Rome", "Berlin"])
+    assert key.grade("paris")
+    assert key.grade("  PARIS! ")
+    assert not key.grade("London")
+
+
+def test_grade_accepts_option_letters():
+    key = _key("London", ["Paris", "London", "Rome", "Berlin"])
+    for letter in ("b", "B", "b)", "(B)"):
+        assert key.grade(letter)
+    assert not key.grade("a")
+
+
+def test_no_letter_aliases_when_an_option_is_a_letter():
+    key = _key("A", ["B", "A", "C", "D"])
+    assert key.grade("A")
+    assert not key.grade("b")
+
+
+def test_punctuation_kept_when_it_distinguishes_options():
+    key = _key("C", ["C", "C++", "C#", "Java"])
+    assert not key.strip_punctuation
+    assert key.grade("c")
+    assert not key.grade("C++")
+
+
+def test_fuzzy_grading_only_accepts_near_misses_of_the_correct_option():
+    key = _key("Photosynthesis", ["Photosynthesis", "Respiration", "Osmosis"])
+    assert not key.grade("Photosynthesys")
+    assert key.grade("Photosynthesys", fuzzy_threshold=0.8)
+    assert not key.grade("Respiraton", fuzzy_threshold=0.8)
+
+
+def test_free_text_answer_without_options():
+    key = _key("Alan Turing")
+    assert key.grade("alan turing")
+    assert key.correct_choice == -1
+    assert not key.grade("")
+
+
+def test_json_round_trip():
+    key = _key("London", ["Paris", "London", "Rome", "Berlin"])
+    assert AnswerKey.from_json(key.to_json()) == key
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from src.quiz.json_stream import JsonArrayStream
+
+QUESTIONS = [
+    {"question": "What is 2 + 2?", "answer": "4", "options": ["3", "4", "5", "6"]},
+    {"question": 'Who wrote "Hamlet"?', "answer": "Shakespeare", "options": []},
+    {"question": "Path sep on Windows?", "answer": "\\", "options": ["/", "\\"]},
+]
+
+
+def _feed_all(text, size):
+    stream = JsonArrayStream()
+    objects = []
+    for start in range(0, len(text), size):
+        objects.extend(stream.feed(text[start : start + size]))
+    return stream, objects
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_objects_survive_any_fragment_boundary(size):
+    text = json.dumps(QUESTIONS, indent=2)
+    stream, objects = _feed_all(text, size)
+    assert objects == QUESTIONS
+    assert stream.finished
+    assert stream.malformed == 0
+
+
+def test_objects_are_returned_as_soon_as_they_close():
+    stream = JsonArrayStream()
+    first = json.dumps(QUESTIONS[0])
+    assert stream.feed("[" + first[:-1]) == []
+    assert stream.feed(first[-1] + ",") == [QUESTIONS[0]]
+
+
+@pytest.mark.parametrize("size", [1, 5, 10_000])
+def test_escaped_quotes_and_brackets_inside_strings(size):
+    tricky = [
+        {"question": 'Is "[" a {brace}? \\"no\\"', "answer": "]}", "options": None}
+    ]
+    stream, objects = _feed_all(json.dumps(tricky), size)
+    assert objects == tricky
+    assert stream.finished
+
+
+@pytest.mark.parametrize("size", [1, 4, 10_000])
+def test_markdown_code_fence_is_skipped(size):
+    text = "```json\n" + json.dumps(QUESTIONS) + "\n```"
+    _, objects = _feed_all(text, size)
+    assert objects == QUESTIONS
+
+
+@pytest.mark.parametrize("size", [1, 3, 10_000])
+def test_bracketed_preamble_is_skipped(size):
+    text = "Here [is] the quiz [as requested]: [\n  " + json.dumps(QUESTIONS)[1:]
+    stream, objects = _feed_all(text, size)
+    assert objects == QUESTIONS
+    assert stream.finished
+
+
+def test_bracket_split_from_its_first_element():
+    stream = JsonArrayStream()
+    assert stream.feed("Sure [note] [") == []
+    assert stream.feed("  \n ") == []
+    assert not stream.started
+    assert stream.feed(json.dumps(QUESTIONS)[1:]) == QUESTIONS
+    assert stream.finished
+
+
+def test_empty_array_finishes_without_objects():
+    stream, objects = _feed_all("No questions: [ ]", 1)
+    assert objects == []
+    assert stream.finished
+
+
+def test_malformed_element_is_counted_and_skipped():
+    text = '[{"question": "ok", "answer": "a"}, {"question": oops}, {"answer": "b"}]'
+    stream, objects = _feed_all(text, 5)
+    assert objects == [{"question": "ok", "answer": "a"}, {"answer": "b"}]
+    assert stream.malformed == 1
+
+
+def test_text_after_the_array_is_ignored():
+    stream = JsonArrayStream()
+    assert stream.feed(json.dumps(QUESTIONS[:1]) + " trailing [{}]") == QUESTIONS[:1]
+    assert stream.feed('[{"late": true}]') == []
@@ -0,0 +1,38 @@
+import pytest
+from fastapi import HTTPException
+
+from src.pdf.services import PdfProcessingService
+
+parse_page_ranges = PdfProcessingService.parse_page_ranges
+
+
+@pytest.mark.parametrize("pages", [None, "", "  "])
+def test_no_selection_means_every_page(pages):
+    assert parse_page_ranges(pages, 3) == [0, 1, 2]
+
+
+def test_single_pages_and_ranges_are_one_based_and_inclusive():
+    assert parse_page_ranges("1-3,5", 6) == [0, 1, 2, 4]
+
+
+def test_open_ended_ranges():
+    assert parse_page_ranges("-2", 5) == [0, 1]
+    assert parse_page_ranges("4-", 5) == [3, 4]
+
+
+def test_overlaps_are_merged_and_sorted():
+    assert parse_page_ranges(" 5, 2-4 ,3", 5) == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("pages", ["x", "1-b", "1,,2"])
+def test_malformed_selection_is_rejected(pages):
+    with pytest.raises(HTTPException) as error:
+        parse_page_ranges(pages, 5)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("pages", ["0", "6", "3-2", "4-9"])
+def test_out_of_range_selection_is_rejected(pages):
+    with pytest.raises(HTTPException) as error:
+        parse_page_ranges(pages, 5)
+    assert error.value.status_code == 400
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from src.common.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_run():
+    async def scenario():
+        flights: SingleFlight[int] = SingleFlight()
+        runs = 0
+
+        async def work():
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(flights.do("k", work) for _ in range(5)))
+        return results, runs, flights
+
+    results, runs, flights = asyncio.run(scenario())
+    assert results == [42] * 5
+    assert runs == 1
+    assert (flights.started, flights.joined) == (1, 4)
+    assert len(flights) == 0
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flights: SingleFlight[str] = SingleFlight()
+
+        async def work(key):
+            await asyncio.sleep(0)
+            return key
+
+        return await asyncio.gather(
+            flights.do("a", lambda: work("a")), flights.do("b", lambda: work("b"))
+        )
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+
+
+def test_key_is_forgotten_once_finished():
+    async def scenario():
+        flights: SingleFlight[int] = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return len(calls)
+
+        first = await flights.do("k", work)
+        second = await flights.do("k", work)
+        return first, second, "k" in flights
+
+    assert asyncio.run(scenario()) == (1, 2, False)
+
+
+def test_exception_reaches_every_caller():
+    async def scenario():
+        flights: SingleFlight[int] = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        return await asyncio.gather(
+            *(flights.do("k", work) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def scenario():
+        flights: SingleFlight[str] = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leaving = asyncio.create_task(flights.do("k", work))
+        staying = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0.01)
+        leaving.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        return await staying
+
+    assert asyncio.run(scenario()) == "done"
@@ -0,0 +1,71 @@
+from src.quiz.text import (
+    estimate_tokens,
+    fit_to_tokens,
+    fits_in_tokens,
+    split_into_sections,
+)
+
+
+def _words(text):
+    return len(text.split())
+
+
+def test_text_that_fits_is_returned_unchanged():
+    text = "First sentence.\n\nSecond sentence."
+    assert fit_to_tokens(text, 100) == text
+
+
+def test_cut_on_the_last_sentence_boundary_within_budget():
+    text = "One two three. Four five six. Seven eight nine."
+    assert fit_to_tokens(text, 6, _words) == "One two three. Four five six."
+
+
+def test_falls_back_to_a_word_boundary():
+    text = "one two three four five six seven eight nine ten"
+    assert fit_to_tokens(text, 4, _words) == "one two three four"
+
+
+def test_preserves_paragraph_breaks():
+    text = "Alpha beta.\n\nGamma delta.\n\nEpsilon zeta."
+    assert fit_to_tokens(text, 4, _words) == "Alpha beta.\n\nGamma delta."
+
+
+def test_zero_budget_or_unsplittable_text_gives_empty_prefix():
+    assert fit_to_tokens("Anything at all.", 0) == ""
+    assert fit_to_tokens("x" * 1000, 2) == ""
+
+
+def test_result_never_exceeds_the_budget():
+    text = " ".join(f"Sentence number {i} has a few words." for i in range(200))
+    for budget in (1, 7, 50, 333):
+        assert estimate_tokens(fit_to_tokens(text, budget)) <= budget
+
+
+def test_fits_in_tokens_rejects_huge_texts_without_counting():
+    def never(text):
+        raise AssertionError("counted")
+
+    assert not fits_in_tokens("x" * 10_000, 10, never)
+
+
+def test_sections_stay_within_budget_and_keep_all_text():
+    text = " ".join(f"Sentence {i} of the document." for i in range(100))
+    sections = split_into_sections(text, 50)
+    assert len(sections) > 1
+    assert all(estimate_tokens(section) <= 50 for section in sections)
+    assert " ".join(sections) == text
+
+
+def test_sections_are_measured_with_the_given_counter():
+    text = " ".join(f"Sentence {i} of the document." for i in range(100))
+    sections = split_into_sections(text, 50, _words)
+    assert len(sections) > 1
+    assert all(_words(section) <= 50 for section in sections)
+    assert " ".join(sections) == text
+
+
+def test_long_sentences_are_split_on_words():
+    text = " ".join(f"word{i}" for i in range(30)) + "."
+    sections = split_into_sections(text, 8, _words)
+    assert all(_words(section) <= 8 for section in sections)
+    assert " ".join(sections) == text
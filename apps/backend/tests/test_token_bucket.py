@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+from src.llm.gateway import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_starts_full_and_spends_without_waiting():
+    async def scenario():
+        bucket = TokenBucket(per_minute=600, clock=FakeClock())
+        await asyncio.wait_for(bucket.acquire(600), timeout=1)
+        return bucket._tokens
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_refills_at_the_per_minute_rate_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(per_minute=600, clock=clock)
+    bucket.adjust(600)
+    clock.now += 30
+    bucket._refill()
+    assert bucket._tokens == 300
+    clock.now += 600
+    bucket._refill()
+    assert bucket._tokens == 600
+
+
+def test_adjust_charges_and_refunds_within_capacity():
+    bucket = TokenBucket(per_minute=100, clock=FakeClock())
+    bucket.adjust(150)
+    assert bucket._tokens == -50
+    bucket.adjust(-500)
+    assert bucket._tokens == 100
+
+
+def test_acquire_waits_for_the_missing_tokens():
+    async def scenario():
+        # 100 tokens per second
+        bucket = TokenBucket(per_minute=6000)
+        bucket.adjust(6000)
+        started = time.monotonic()
+        await bucket.acquire(10)
+        return time.monotonic() - started
+
+    assert 0.08 <= asyncio.run(scenario()) < 1
+
+
+def test_request_larger_than_capacity_drains_the_bucket():
+    async def scenario():
+        bucket = TokenBucket(per_minute=60, clock=FakeClock())
+        await asyncio.wait_for(bucket.acquire(1000), timeout=1)
+        return bucket._tokens
+
+    assert asyncio.run(scenario()) == 0
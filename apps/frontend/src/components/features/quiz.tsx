@@ -5,6 +5,7 @@ import { ArrowLeft, ArrowRight } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { useQuizAnswer } from '@/hooks/useQuizMutations'
 import { useStreamingFeedback } from '@/hooks/useStreamingFeedback'
+import { useSessionId } from '@/hooks/useSessionId'
 import { useQuizStore } from '@/stores/quiz-store'
 import { PageHeader } from './page-header'
 import { QuestionCard } from './question-card'
@@ -31,6 +32,7 @@ export function Quiz() {
   } = useQuizStore()
   
   const router = useRouter()
+  const sessionId = useSessionId()
 
   const currentQuestion = getCurrentQuestion()
   const { checkAnswer, isLoading, reset } = useQuizAnswer()
@@ -58,7 +60,8 @@ export function Quiz() {
           startStreaming({
             questionId: currentQuestion.id,
             userAnswer: selectedAnswer,
-            questions: questions,
+            sessionId,
+            questions,
           })
         }
       } catch (error) {
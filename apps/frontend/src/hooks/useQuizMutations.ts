@@ -1,6 +1,6 @@
 import { useMutation } from '@tanstack/react-query'
 import { toast } from 'sonner'
-import { api, type AnswerRequest, type AnswerResponse, type QuizResponse, ApiError } from '@/lib/api'
+import { api, type AnswerRequest, type AnswerResponse, type QuestionAnswer, type QuizResponse, ApiError } from '@/lib/api'
 import { useQuizStore } from '@/stores/quiz-store'
 import { useSessionId } from './useSessionId'
 
@@ -42,12 +42,33 @@ export function useUploadPdfMutation() {
   })
 }
 
+interface CheckAnswerVariables {
+  answerRequest: AnswerRequest
+  // The server checks against the quiz stored for this session
+  sessionId?: string
+  // Only sent without a session, or when the stored quiz has expired
+  questions?: QuestionAnswer[]
+}
+
 /**
  * Hook for checking quiz answers
  */
 export function useCheckAnswerMutation() {
-  return useMutation<AnswerResponse, ApiError, AnswerRequest>({
-    mutationFn: (answerRequest: AnswerRequest) => api.checkAnswer(answerRequest),
+  return useMutation<AnswerResponse, ApiError, CheckAnswerVariables>({
+    mutationFn: async ({ answerRequest, sessionId, questions }: CheckAnswerVariables) => {
+      if (!sessionId) {
+        return api.checkAnswer({ ...answerRequest, questions })
+      }
+      try {
+        return await api.checkAnswer(answerRequest, sessionId)
+      } catch (error) {
+        if (error instanceof ApiError && error.status === 404 && questions) {
+          // The stored quiz expired: send the local copy instead
+          return api.checkAnswer({ ...answerRequest, questions }, sessionId)
+        }
+        throw error
+      }
+    },
     onError: (error: ApiError) => {
       console.error('Answer check failed:', error)
       
@@ -68,16 +89,16 @@ export function useCheckAnswerMutation() {
  */
 export function useQuizAnswer() {
   const { questions, submitAnswer } = useQuizStore()
+  const sessionId = useSessionId()
   const checkAnswerMutation = useCheckAnswerMutation()
 
   const checkAnswer = async (questionId: string, userAnswer: string) => {
     const answerRequest: AnswerRequest = {
       question_id: questionId,
       user_answer: userAnswer,
-      questions,
     }
     
-    const result = await checkAnswerMutation.mutateAsync(answerRequest)
+    const result = await checkAnswerMutation.mutateAsync({ answerRequest, sessionId, questions })
     submitAnswer(questionId, userAnswer, result)
     return result
   }
@@ -5,7 +5,10 @@ import { type QuestionAnswer } from '@/lib/api'
 interface StreamingFeedbackRequest {
   questionId: string
   userAnswer: string
-  questions: QuestionAnswer[]
+  // The server looks the question up in the quiz stored for this session
+  sessionId?: string
+  // Only for stateless clients, or when the stored quiz has expired
+  questions?: QuestionAnswer[]
 }
 
 interface StreamingFeedbackState {
@@ -22,24 +25,38 @@ export function useStreamingFeedback() {
   })
 
   const streamingMutation = useMutation({
-    mutationFn: async ({ questionId, userAnswer, questions }: StreamingFeedbackRequest) => {
+    mutationFn: async ({ questionId, userAnswer, sessionId, questions }: StreamingFeedbackRequest) => {
       setState(prev => ({ ...prev, isStreaming: true, feedback: '', error: null }))
 
-      try {
-        const response = await fetch(
+      const requestFeedback = (withQuestions: boolean) => {
+        const headers: Record<string, string> = {
+          'Content-Type': 'application/json',
+          'Accept': 'text/event-stream',
+        }
+        if (sessionId) {
+          headers['X-Session-Id'] = sessionId
+        }
+
+        return fetch(
           `${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/quiz/check-answer-stream`,
           {
             method: 'POST',
-            headers: {
-              'Content-Type': 'application/json',
-            },
+            headers,
             body: JSON.stringify({
               question_id: questionId,
               user_answer: userAnswer,
-              questions: questions,
+              ...(withQuestions ? { questions } : {}),
             }),
           }
         )
+      }
+
+      try {
+        let response = await requestFeedback(!sessionId)
+        if (response.status === 404 && sessionId && questions) {
+          // The stored quiz expired: send the local copy instead
+          response = await requestFeedback(true)
+        }
 
         if (!response.ok) {
           throw new Error('Failed to get streaming feedback')
@@ -81,30 +98,47 @@ export function useStreamingFeedback() {
           if (done) break
 
           buffer += decoder.decode(value, { stream: true })
-          const lines = buffer.split('\n')
-          buffer = lines.pop() || '' // Keep incomplete line in buffer
-
-          for (const line of lines) {
-            if (line.startsWith('data: ')) {
-              const data = line.slice(6).trim()
-              if (data === '[DONE]') {
-                setState(prev => ({ ...prev, isStreaming: false, feedback: accumulatedFeedback.replace(/\s+/g, ' ').trim() }))
-                if (updateTimeoutId) clearTimeout(updateTimeoutId)
-                return
-              }
-              if (data) {
-                // Smart spacing: only add space if needed
-                if (accumulatedFeedback && 
-                    !accumulatedFeedback.endsWith(' ') && 
-                    !accumulatedFeedback.endsWith('\n') &&
-                    !data.startsWith(' ') &&
-                    !data.match(/^[,.!?;:]/) && // Don't add space before punctuation
-                    !accumulatedFeedback.match(/[-"'(]$/)) { // Don't add space after certain chars
-                  accumulatedFeedback += ' '
-                }
-                accumulatedFeedback += data
-                debouncedUpdate()
+          // Server-Sent Events are separated by a blank line
+          const events = buffer.split('\n\n')
+          buffer = events.pop() || '' // Keep incomplete event in buffer
+
+          for (const rawEvent of events) {
+            let eventType = 'message'
+            const dataLines: string[] = []
+
+            for (const line of rawEvent.split('\n')) {
+              if (!line || line.startsWith(':')) continue // Heartbeat comments
+              const separator = line.indexOf(':')
+              const field = separator === -1 ? line : line.slice(0, separator)
+              let value = separator === -1 ? '' : line.slice(separator + 1)
+              if (value.startsWith(' ')) value = value.slice(1)
+
+              if (field === 'event') eventType = value
+              else if (field === 'data') dataLines.push(value)
+            }
+
+            const data = dataLines.join('\n')
+            if (eventType === 'done' || data === '[DONE]') {
+              setState(prev => ({ ...prev, isStreaming: false, feedback: accumulatedFeedback.replace(/\s+/g, ' ').trim() }))
+              if (updateTimeoutId) clearTimeout(updateTimeoutId)
+              return
+            }
+            if (eventType === 'error') {
+              // The explanation failed; the UI falls back to the answer key
+              if (updateTimeoutId) clearTimeout(updateTimeoutId)
+              let detail = 'Failed to get streaming feedback'
+              try {
+                detail = JSON.parse(data).detail || detail
+              } catch {
+                // Keep the generic message
               }
+              setState(prev => ({ ...prev, isStreaming: false, error: detail }))
+              return
+            }
+            if (dataLines.length) {
+              // Events carry the text verbatim, spaces included
+              accumulatedFeedback += data
+              debouncedUpdate()
             }
           }
         }
@@ -21,7 +21,8 @@ export const QuizResponseSchema = z.object({
 export const AnswerRequestSchema = z.object({
   question_id: z.string(),
   user_answer: z.string(),
-  questions: z.array(QuestionAnswerSchema),
+  // Omit to check against the quiz stored for the X-Session-Id session
+  questions: z.array(QuestionAnswerSchema).optional(),
 })
 
 export const AnswerResponseSchema = z.object({
@@ -30,6 +31,23 @@ export const AnswerResponseSchema = z.object({
   explanation: z.string().optional(),
 })
 
+export const GradeQuizRequestSchema = z.object({
+  answers: z.array(z.object({
+    question_id: z.string(),
+    user_answer: z.string(),
+  })),
+  // Omit to grade against the quiz stored for the X-Session-Id session
+  questions: z.array(QuestionAnswerSchema).optional(),
+})
+
+export const GradeQuizResponseSchema = z.object({
+  results: z.array(AnswerResponseSchema.extend({ question_id: z.string() })),
+  correct_count: z.number(),
+  answered_count: z.number(),
+  total_questions: z.number(),
+  score: z.number(),
+})
+
 export const QuestionUpdateRequestSchema = z.object({
   id: z.string(),
   question: z.string(),
@@ -64,6 +82,8 @@ export type QuestionAnswer = z.infer<typeof QuestionAnswerSchema>
 export type QuizResponse = z.infer<typeof QuizResponseSchema>
 export type AnswerRequest = z.infer<typeof AnswerRequestSchema>
 export type AnswerResponse = z.infer<typeof AnswerResponseSchema>
+export type GradeQuizRequest = z.infer<typeof GradeQuizRequestSchema>
+export type GradeQuizResponse = z.infer<typeof GradeQuizResponseSchema>
 export type QuestionUpdateRequest = z.infer<typeof QuestionUpdateRequestSchema>
 export type PdfUploadResponse = z.infer<typeof PdfUploadResponseSchema>
 export type ErrorResponse = z.infer<typeof ErrorResponseSchema>
@@ -181,10 +201,13 @@ export const api = {
     return handleApiResponse(response, QuestionAnswerSchema)
   },
 
-  async checkAnswer(answerRequest: AnswerRequest): Promise<AnswerResponse> {
+  async checkAnswer(answerRequest: AnswerRequest, sessionId?: string): Promise<AnswerResponse> {
     const headers: Record<string, string> = {
       'Content-Type': 'application/json',
     }
+    if (sessionId) {
+      headers['X-Session-Id'] = sessionId
+    }
 
     const response = await fetch(`${API_BASE_URL}/quiz/check-answer`, {
       method: 'POST',
@@ -195,6 +218,23 @@ export const api = {
     return handleApiResponse(response, AnswerResponseSchema)
   },
 
+  async gradeQuiz(gradeRequest: GradeQuizRequest, sessionId?: string): Promise<GradeQuizResponse> {
+    const headers: Record<string, string> = {
+      'Content-Type': 'application/json',
+    }
+    if (sessionId) {
+      headers['X-Session-Id'] = sessionId
+    }
+
+    const response = await fetch(`${API_BASE_URL}/quiz/grade`, {
+      method: 'POST',
+      headers,
+      body: JSON.stringify(gradeRequest),
+    })
+
+    return handleApiResponse(response, GradeQuizResponseSchema)
+  },
+
   async checkAnswerStream(answerRequest: AnswerRequest): Promise<ReadableStream<Uint8Array>> {
     const response = await fetch(`${API_BASE_URL}/quiz/check-answer-stream`, {
       method: 'POST',